@@ -37,10 +37,19 @@ if config.config_file_name is not None:
 # my_important_option = config.get_main_option("my_important_option")
 # ... etc.
 
+# Sadece migration/trigger'larla yönetilen kolonlar ve indeksler (ORM modelinde yok)
+SQL_ONLY_COLUMNS = {("cultural_sites", "change_xid")}
+SQL_ONLY_INDEXES = {"idx_cultural_sites_change_xid", "idx_cultural_sites_geog"}
+
+
 def include_object(object_, name, type_, reflected, compare_to):
     # DB'den yansıyan (reflected) ama bizim metadata'da olmayan tabloları IGNORE et
     if type_ == "table" and reflected and name not in target_metadata.tables:
         return False
+    if type_ == "column" and reflected and (object_.table.name, name) in SQL_ONLY_COLUMNS:
+        return False
+    if type_ == "index" and reflected and name in SQL_ONLY_INDEXES:
+        return False
     return True
 
 
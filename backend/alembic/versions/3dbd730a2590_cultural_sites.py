@@ -58,6 +58,6 @@ def upgrade() -> None:
 def downgrade() -> None:
     """Downgrade schema."""
     # ### commands auto generated by Alembic - please adjust! ###
-    op.drop_index('idx_cultural_sites_geom', table_name='cultural_sites', postgresql_using='gist')
+    op.execute("DROP INDEX IF EXISTS idx_cultural_sites_geom")
     op.drop_table('cultural_sites')
     # ### end Alembic commands ###
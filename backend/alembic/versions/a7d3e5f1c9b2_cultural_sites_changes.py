@@ -0,0 +1,129 @@
+"""cultural sites change feed
+
+Revision ID: a7d3e5f1c9b2
+Revises: f2c6d9a4b8e1
+Create Date: 2026-02-12 10:41:07.385214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3e5f1c9b2'
+down_revision: Union[str, Sequence[str], None] = 'f2c6d9a4b8e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # /api/sites/changes imleci: satırı son yazan transaction'ın id'si (xid8).
+    # updated_at (now()) transaction başlangıç zamanıdır; uzun bir import
+    # kendinden sonra başlayıp önce commit eden yazılardan daha eski zaman
+    # damgasıyla görünür olur ve zaman imleci bu satırları kaçırır. xid ile
+    # "en eski açık transaction'dan küçük" sınırı kesin bir ufuk verir.
+    # ORM modelinde yok (bkz. alembic/env.py SQL_ONLY_COLUMNS).
+    op.execute("""
+        ALTER TABLE cultural_sites
+        ADD COLUMN change_xid xid8 NOT NULL DEFAULT pg_current_xact_id()
+    """)
+    op.execute("CREATE INDEX idx_cultural_sites_change_xid ON cultural_sites (change_xid, id)")
+
+    # Ham SQL ile yapılan güncellemeler (importer, elle düzeltmeler) ORM'in
+    # onupdate'ini tetiklemez: updated_at ve change_xid burada tutulur.
+    # WHEN (OLD.* IS DISTINCT FROM NEW.*) kullanılamaz: tabloda generated
+    # kolonlar var; importer zaten sadece içeriği değişen satırları günceller.
+    op.execute("""
+        CREATE FUNCTION cultural_sites_touch() RETURNS trigger AS $$
+        BEGIN
+          NEW.updated_at := now();
+          NEW.change_xid := pg_current_xact_id();
+          RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER cultural_sites_touch
+        BEFORE UPDATE ON cultural_sites
+        FOR EACH ROW EXECUTE FUNCTION cultural_sites_touch()
+    """)
+
+    # Silinen id'ler (tombstone). Aynı id yeniden eklenirse kaydı düşer.
+    op.execute("""
+        CREATE TABLE cultural_sites_deleted (
+          id uuid PRIMARY KEY,
+          change_xid xid8 NOT NULL DEFAULT pg_current_xact_id(),
+          deleted_at timestamp NOT NULL DEFAULT now()
+        )
+    """)
+    op.execute("CREATE INDEX idx_cultural_sites_deleted_change_xid ON cultural_sites_deleted (change_xid, id)")
+
+    # Statement seviyesinde (transition table): toplu import/prune'da satır
+    # başına trigger maliyeti yok.
+    op.execute("""
+        CREATE FUNCTION cultural_sites_record_deletes() RETURNS trigger AS $$
+        BEGIN
+          INSERT INTO cultural_sites_deleted (id)
+          SELECT id FROM old_rows
+          ON CONFLICT (id) DO UPDATE
+            SET change_xid = EXCLUDED.change_xid, deleted_at = EXCLUDED.deleted_at;
+          RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER cultural_sites_record_deletes
+        AFTER DELETE ON cultural_sites
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION cultural_sites_record_deletes()
+    """)
+    op.execute("""
+        CREATE FUNCTION cultural_sites_clear_tombstones() RETURNS trigger AS $$
+        BEGIN
+          DELETE FROM cultural_sites_deleted d USING new_rows n WHERE d.id = n.id;
+          RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER cultural_sites_clear_tombstones
+        AFTER INSERT ON cultural_sites
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION cultural_sites_clear_tombstones()
+    """)
+
+    # TRUNCATE delete trigger'larını çalıştırmaz: imleç tabanı ileri alınır,
+    # daha eski imleçli istemciler tam senkrona (reset) yönlendirilir.
+    op.execute("ALTER TABLE dataset_version ADD COLUMN changes_floor xid8 NOT NULL DEFAULT '0'")
+    op.execute("""
+        CREATE FUNCTION cultural_sites_truncated() RETURNS trigger AS $$
+        BEGIN
+          UPDATE dataset_version SET changes_floor = pg_current_xact_id() WHERE id = 1;
+          TRUNCATE cultural_sites_deleted;
+          RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER cultural_sites_truncated
+        AFTER TRUNCATE ON cultural_sites
+        FOR EACH STATEMENT EXECUTE FUNCTION cultural_sites_truncated()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS cultural_sites_truncated ON cultural_sites")
+    op.execute("DROP FUNCTION IF EXISTS cultural_sites_truncated()")
+    op.execute("ALTER TABLE dataset_version DROP COLUMN IF EXISTS changes_floor")
+    op.execute("DROP TRIGGER IF EXISTS cultural_sites_clear_tombstones ON cultural_sites")
+    op.execute("DROP FUNCTION IF EXISTS cultural_sites_clear_tombstones()")
+    op.execute("DROP TRIGGER IF EXISTS cultural_sites_record_deletes ON cultural_sites")
+    op.execute("DROP FUNCTION IF EXISTS cultural_sites_record_deletes()")
+    op.execute("DROP TABLE IF EXISTS cultural_sites_deleted")
+    op.execute("DROP TRIGGER IF EXISTS cultural_sites_touch ON cultural_sites")
+    op.execute("DROP FUNCTION IF EXISTS cultural_sites_touch()")
+    op.execute("DROP INDEX IF EXISTS idx_cultural_sites_change_xid")
+    op.execute("ALTER TABLE cultural_sites DROP COLUMN IF EXISTS change_xid")
@@ -0,0 +1,60 @@
+"""cultural_sites indexes
+
+Revision ID: b7e2c91d4a6f
+Revises: 3dbd730a2590
+Create Date: 2026-01-12 10:14:03.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2c91d4a6f'
+down_revision: Union[str, Sequence[str], None] = '3dbd730a2590'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # bbox (&&) filtresi için GIST. GeoAlchemy2 create_table sırasında
+    # oluşturmuş olabilir, o yüzden IF NOT EXISTS.
+    op.execute("CREATE INDEX IF NOT EXISTS idx_cultural_sites_geom ON cultural_sites USING gist (geom)")
+
+    # list_sites filtre kombinasyonları:
+    #   city / city+district / city+district+category -> (city, district, category)
+    #   district tek başına                            -> (district)
+    #   category / category+is_unesco                  -> (category, is_unesco)
+    #   is_unesco = true (azınlık)                     -> kısmi indeks
+    op.create_index('idx_cultural_sites_city_district_category', 'cultural_sites', ['city', 'district', 'category'])
+    op.create_index('idx_cultural_sites_district', 'cultural_sites', ['district'])
+    op.create_index('idx_cultural_sites_category_unesco', 'cultural_sites', ['category', 'is_unesco'])
+    op.create_index(
+        'idx_cultural_sites_unesco', 'cultural_sites', ['is_unesco'],
+        postgresql_where=sa.text('is_unesco'),
+    )
+
+    # name_tr/name_en ILIKE '%x%' aramaları için trigram GIN
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'idx_cultural_sites_name_tr_trgm', 'cultural_sites', ['name_tr'],
+        postgresql_using='gin', postgresql_ops={'name_tr': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'idx_cultural_sites_name_en_trgm', 'cultural_sites', ['name_en'],
+        postgresql_using='gin', postgresql_ops={'name_en': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_cultural_sites_name_en_trgm', table_name='cultural_sites')
+    op.drop_index('idx_cultural_sites_name_tr_trgm', table_name='cultural_sites')
+    op.drop_index('idx_cultural_sites_unesco', table_name='cultural_sites')
+    op.drop_index('idx_cultural_sites_category_unesco', table_name='cultural_sites')
+    op.drop_index('idx_cultural_sites_district', table_name='cultural_sites')
+    op.drop_index('idx_cultural_sites_city_district_category', table_name='cultural_sites')
+    # GIST indeksi 3dbd730a2590 downgrade'i kaldırır (tablo ile birlikte)
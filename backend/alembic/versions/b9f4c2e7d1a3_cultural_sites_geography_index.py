@@ -0,0 +1,32 @@
+"""cultural sites geography index
+
+Revision ID: b9f4c2e7d1a3
+Revises: a7d3e5f1c9b2
+Create Date: 2026-02-16 09:27:41.118503
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9f4c2e7d1a3'
+down_revision: Union[str, Sequence[str], None] = 'a7d3e5f1c9b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # /nearby KNN'i metre cinsinden sıralar (geom::geography <-> nokta).
+    # geom indeksi derece cinsinden sıralar; Türkiye enlemlerinde boylam
+    # derecesi enlem derecesinin ~0.75-0.8'i olduğundan o sıralama doğu/batıdaki
+    # en yakın siteleri aday kümesinin dışında bırakabiliyordu.
+    # ORM modelinde yok (ifade indeksi; bkz. alembic/env.py SQL_ONLY_INDEXES).
+    op.execute("CREATE INDEX idx_cultural_sites_geog ON cultural_sites USING gist ((geom::geography))")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS idx_cultural_sites_geog")
@@ -0,0 +1,73 @@
+"""cultural_sites search
+
+Revision ID: c3f8a2d19e47
+Revises: b7e2c91d4a6f
+Create Date: 2026-01-19 16:42:27.503911
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f8a2d19e47'
+down_revision: Union[str, Sequence[str], None] = 'b7e2c91d4a6f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # tr_fold: Türkçe harf/şapka katlama + küçük harf (İ/I/ı/i -> i, ş -> s ...).
+    # lower() tek başına veritabanı locale'ine göre İ/I'yı yanlış çevirir.
+    op.execute("""
+        CREATE FUNCTION tr_fold(text) RETURNS text
+        LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE
+        AS $$ SELECT lower(translate($1, 'İIıÇçĞğÖöŞşÜüÂâÎîÛû', 'iiiccggoossuuaaiiuu')) $$
+    """)
+    # tr_lower: Türkçe kurallarla küçük harf (I -> ı, İ -> i); stemmer için
+    op.execute("""
+        CREATE FUNCTION tr_lower(text) RETURNS text
+        LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE
+        AS $$ SELECT lower(translate($1, 'İI', 'iı')) $$
+    """)
+
+    # Normalize isimler: C collation -> aynı btree hem LIKE 'x%' hem ORDER BY için
+    op.execute("""
+        ALTER TABLE cultural_sites
+          ADD COLUMN name_tr_norm text COLLATE "C"
+            GENERATED ALWAYS AS (tr_fold(name_tr)) STORED,
+          ADD COLUMN name_en_norm text COLLATE "C"
+            GENERATED ALWAYS AS (tr_fold(name_en)) STORED,
+          ADD COLUMN search_tr tsvector
+            GENERATED ALWAYS AS (
+              setweight(to_tsvector('simple', coalesce(tr_fold(name_tr), '')), 'A') ||
+              setweight(to_tsvector('turkish', coalesce(tr_lower(name_tr), '')), 'A') ||
+              setweight(to_tsvector('turkish', coalesce(tr_lower(summary_tr), '')), 'B')
+            ) STORED,
+          ADD COLUMN search_en tsvector
+            GENERATED ALWAYS AS (
+              setweight(to_tsvector('english', coalesce(name_en, '')), 'A') ||
+              setweight(to_tsvector('english', coalesce(summary_en, '')), 'B')
+            ) STORED
+    """)
+
+    op.create_index('idx_cultural_sites_search_tr', 'cultural_sites', ['search_tr'], postgresql_using='gin')
+    op.create_index('idx_cultural_sites_search_en', 'cultural_sites', ['search_en'], postgresql_using='gin')
+    op.create_index('idx_cultural_sites_name_tr_norm', 'cultural_sites', ['name_tr_norm'])
+    op.create_index('idx_cultural_sites_name_en_norm', 'cultural_sites', ['name_en_norm'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_cultural_sites_name_en_norm', table_name='cultural_sites')
+    op.drop_index('idx_cultural_sites_name_tr_norm', table_name='cultural_sites')
+    op.drop_index('idx_cultural_sites_search_en', table_name='cultural_sites')
+    op.drop_index('idx_cultural_sites_search_tr', table_name='cultural_sites')
+    op.drop_column('cultural_sites', 'search_en')
+    op.drop_column('cultural_sites', 'search_tr')
+    op.drop_column('cultural_sites', 'name_en_norm')
+    op.drop_column('cultural_sites', 'name_tr_norm')
+    op.execute("DROP FUNCTION tr_lower(text)")
+    op.execute("DROP FUNCTION tr_fold(text)")
@@ -0,0 +1,37 @@
+"""dataset version
+
+Revision ID: d5a1e8c3b294
+Revises: c3f8a2d19e47
+Create Date: 2026-02-03 11:05:48.217730
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a1e8c3b294'
+down_revision: Union[str, Sequence[str], None] = 'c3f8a2d19e47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Tek satırlık tablo: importer her yazışta version'ı artırır,
+    # API önbellekleri ve ETag'ler bu değere bağlıdır.
+    op.create_table('dataset_version',
+    sa.Column('id', sa.SmallInteger(), server_default=sa.text('1'), nullable=False),
+    sa.Column('version', sa.BigInteger(), server_default=sa.text('1'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.CheckConstraint('id = 1', name='dataset_version_single_row'),
+    )
+    op.execute("INSERT INTO dataset_version (id, version) VALUES (1, 1)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('dataset_version')
@@ -0,0 +1,34 @@
+"""cultural sites import tracking
+
+Revision ID: e8b4f1c7a2d6
+Revises: d5a1e8c3b294
+Create Date: 2026-02-05 09:42:13.508114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b4f1c7a2d6'
+down_revision: Union[str, Sequence[str], None] = 'd5a1e8c3b294'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Artımlı import: satırın içerik hash'i (md5) ve geldiği kaynak dosya.
+    # Hash değişmediyse upsert satıra dokunmaz; tombstone import_source'a göre yapılır.
+    op.add_column('cultural_sites', sa.Column('content_hash', sa.String(length=32), nullable=True))
+    op.add_column('cultural_sites', sa.Column('import_source', sa.String(length=255), nullable=True))
+    op.create_index('idx_cultural_sites_import_source', 'cultural_sites', ['import_source'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_cultural_sites_import_source', table_name='cultural_sites')
+    op.drop_column('cultural_sites', 'import_source')
+    op.drop_column('cultural_sites', 'content_hash')
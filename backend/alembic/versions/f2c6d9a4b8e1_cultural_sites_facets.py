@@ -0,0 +1,46 @@
+"""cultural sites facets
+
+Revision ID: f2c6d9a4b8e1
+Revises: e8b4f1c7a2d6
+Create Date: 2026-02-09 14:18:52.661042
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c6d9a4b8e1'
+down_revision: Union[str, Sequence[str], None] = 'e8b4f1c7a2d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # /facets için ön-hesaplanmış sayımlar: (city, district, category, is_unesco)
+    # kombinasyonu başına satır sayısı. Importer her yazıştan sonra
+    # REFRESH ... CONCURRENTLY ile tazeler (bkz. mark_dataset_changed).
+    # NULL'lar '' olarak saklanır: CONCURRENTLY için benzersiz indeks şart ve
+    # NULL'lı satırlar bu indekste birbirine eşit sayılmaz.
+    op.execute("""
+        CREATE MATERIALIZED VIEW cultural_sites_facets AS
+        SELECT
+          coalesce(city, '') AS city,
+          coalesce(district, '') AS district,
+          category,
+          is_unesco,
+          count(*) AS n
+        FROM cultural_sites
+        GROUP BY 1, 2, 3, 4
+    """)
+    op.execute("""
+        CREATE UNIQUE INDEX idx_cultural_sites_facets_key
+        ON cultural_sites_facets (city, district, category, is_unesco)
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS cultural_sites_facets")
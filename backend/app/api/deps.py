@@ -1,9 +1,24 @@
-from typing import Generator
-from app.db.session import SessionLocal
+from typing import AsyncGenerator
 
-def get_db() -> Generator:
-    db = SessionLocal()
-    try:
+from fastapi import Request
+
+from app.db.session import DbSession, open_db
+
+# İstemci az önce yazdıysa (read-your-writes) okumayı primary'ye zorlar:
+#   X-Consistency: primary
+CONSISTENCY_HEADER = "x-consistency"
+
+
+async def get_db() -> AsyncGenerator[DbSession, None]:
+    async with open_db() as db:
+        yield db
+
+
+def wants_primary(request: Request) -> bool:
+    return request.headers.get(CONSISTENCY_HEADER, "").strip().lower() == "primary"
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[DbSession, None]:
+    """Salt okunur endpoint'ler: replikalar arasında dağıtılır, yoksa primary."""
+    async with open_db(read_only=not wants_primary(request)) as db:
         yield db
-    finally:
-        db.close()
@@ -0,0 +1,87 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+# Filtrelerin SQL'deki sabit sırası; aynı kombinasyon hep aynı metni üretir
+FILTER_NAMES = ("search", "bbox", "city", "district", "category", "is_unesco")
+
+
+@dataclass
+class SiteFilters:
+    """
+    list_sites ve türevi endpoint'lerin ortak filtre seti.
+    FastAPI'de Depends() ile query parametresi olarak okunur.
+    """
+    search: Optional[str] = None
+    min_lon: Optional[float] = None
+    min_lat: Optional[float] = None
+    max_lon: Optional[float] = None
+    max_lat: Optional[float] = None
+    city: Optional[str] = None
+    district: Optional[str] = None
+    category: Optional[str] = None
+    is_unesco: Optional[bool] = None
+
+    @property
+    def has_bbox(self) -> bool:
+        return None not in (self.min_lon, self.min_lat, self.max_lon, self.max_lat)
+
+    def shape(self, use_bbox: bool = True) -> tuple[str, ...]:
+        """
+        Etkin filtrelerin adları (FILTER_NAMES sırasıyla). Sorgu metni sadece
+        buna bağlıdır; değerler bind parametresi olarak gider. Statement
+        önbellekleri (bkz. routes/sites.py) bu tuple ile anahtarlanır.
+        """
+        active = {
+            "search": bool(self.search),
+            "bbox": use_bbox and self.has_bbox,
+            "city": bool(self.city),
+            "district": bool(self.district),
+            "category": bool(self.category),
+            "is_unesco": self.is_unesco is not None,
+        }
+        return tuple(name for name in FILTER_NAMES if active[name])
+
+    def params(self, use_bbox: bool = True) -> dict:
+        params = {}
+        shape = self.shape(use_bbox)
+        if "search" in shape:
+            params["search"] = f"%{self.search}%"
+        if "bbox" in shape:
+            params.update({
+                "min_lon": self.min_lon, "min_lat": self.min_lat,
+                "max_lon": self.max_lon, "max_lat": self.max_lat,
+            })
+        for name in ("city", "district", "category", "is_unesco"):
+            if name in shape:
+                params[name] = getattr(self, name)
+        return params
+
+    def where(self, alias: str = "", use_bbox: bool = True) -> tuple[list[str], dict]:
+        """
+        WHERE parçalarını ve bind parametrelerini döner.
+        alias verilirse kolonlar "alias." ile nitelenir (JOIN'li sorgular için).
+        """
+        return list(where_clauses(self.shape(use_bbox), alias)), self.params(use_bbox)
+
+
+@lru_cache(maxsize=None)
+def where_clauses(shape: tuple[str, ...], alias: str = "") -> tuple[str, ...]:
+    p = f"{alias}." if alias else ""
+    clauses = {
+        # 1. Arama Filtresi (İsim içinde)
+        "search": f"({p}name_tr ILIKE :search OR {p}name_en ILIKE :search)",
+        # 2. BBOX Filtresi (Harita sınırları)
+        # PostGIS: && operatörü bounding box kesişimini kontrol eder (çok hızlıdır)
+        "bbox": f"{p}geom && ST_MakeEnvelope(:min_lon, :min_lat, :max_lon, :max_lat, 4326)",
+        # Diğer Filtreler
+        "city": f"{p}city = :city",
+        "district": f"{p}district = :district",
+        "category": f"{p}category = :category",
+        "is_unesco": f"{p}is_unesco = :is_unesco",
+    }
+    return tuple(clauses[name] for name in shape)
+
+
+def where_sql(where: list[str] | tuple[str, ...]) -> str:
+    return ("WHERE " + " AND ".join(where)) if where else ""
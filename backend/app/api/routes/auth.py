@@ -1,34 +1,50 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import text
-from sqlalchemy.orm import Session
 
-
-from sqlalchemy.orm import Session
 from app.api.deps import get_db
-
-
-from app.core.security import hash_password, verify_password, create_access_token
-from app.schemas.auth import RegisterIn, TokenOut
-from fastapi import Depends
 from app.core.auth import get_current_user
+from app.core.config import settings
+from app.core.security import (
+    HashingBusy,
+    create_access_token,
+    hash_executor,
+    hash_password,
+    verify_and_update_password,
+)
+from app.db.session import DbSession
+from app.schemas.auth import RegisterIn, TokenOut
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 
+
+async def _hash_job(fn, *args):
+    """argon2 işini ayrı havuzda çalıştırır; havuz doluysa 503 + Retry-After."""
+    try:
+        return await hash_executor.run(fn, *args)
+    except HashingBusy:
+        raise HTTPException(
+            status_code=503,
+            detail="Authentication is busy, try again",
+            headers={"Retry-After": str(settings.HASH_RETRY_AFTER)},
+        )
+
+
 @router.post("/register", response_model=TokenOut)
-def register(payload: RegisterIn, db: Session = Depends(get_db)):
+async def register(payload: RegisterIn, db: DbSession = Depends(get_db)):
     # email var mı?
-    exists = db.execute(
+    exists = (await db.execute(
         text("SELECT id FROM users WHERE email = :email LIMIT 1"),
         {"email": payload.email}
-    ).mappings().first()
+    )).mappings().first()
 
     if exists:
         raise HTTPException(status_code=409, detail="Email already registered")
 
-    pw_hash = hash_password(payload.password)
+    # argon2 CPU'ya bağlı: event loop'u ve request threadpool'unu bloklamasın
+    pw_hash = await _hash_job(hash_password, payload.password)
 
     # Insert + id döndür
-    row = db.execute(
+    row = (await db.execute(
         text("""
             INSERT INTO users (email, password_hash, display_name, role)
             VALUES (:email, :password_hash, :display_name, 'user')
@@ -39,22 +55,34 @@ def register(payload: RegisterIn, db: Session = Depends(get_db)):
             "password_hash": pw_hash,
             "display_name": payload.display_name,
         }
-    ).mappings().first()
-    db.commit()
+    )).mappings().first()
+    await db.commit()
 
     token = create_access_token(user_id=str(row["id"]), role=row["role"])
     return TokenOut(access_token=token)
 
 @router.post("/login", response_model=TokenOut)
-def login(email: str, password: str, db: Session = Depends(get_db)):
-    user = db.execute(
+async def login(email: str, password: str, db: DbSession = Depends(get_db)):
+    user = (await db.execute(
         text("SELECT id, role, password_hash FROM users WHERE email = :email LIMIT 1"),
         {"email": email}
-    ).mappings().first()
+    )).mappings().first()
 
-    if not user or not verify_password(password, user["password_hash"]):
+    if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
+    ok, new_hash = await _hash_job(verify_and_update_password, password, user["password_hash"])
+    if not ok:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    # argon2 ayarları değiştiyse: hash yeni parametrelerle yenilenir
+    if new_hash:
+        await db.execute(
+            text("UPDATE users SET password_hash = :password_hash WHERE id = :id"),
+            {"password_hash": new_hash, "id": user["id"]},
+        )
+        await db.commit()
+
     token = create_access_token(user_id=str(user["id"]), role=user["role"])
     return TokenOut(access_token=token)
 
@@ -1,121 +1,1178 @@
 import json
+import math
+import uuid
+from functools import lru_cache
 from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import TextClause, text
+from starlette.concurrency import run_in_threadpool
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import text
-from sqlalchemy.orm import Session
-
-from app.api.deps import get_db
+from app.api.deps import get_read_db, wants_primary
+from app.api.filters import SiteFilters, where_clauses, where_sql
+from app.core.cache import ResultCache, etag_matches, make_etag, snap_bbox
+from app.core.columnar import COLUMNAR_MEDIA_TYPE, encode_columnar
+from app.core.config import settings
+from app.core.dataset import FACETS_VIEW, DatasetVersion
+from app.core.memory_index import COLUMNS as MEMORY_COLUMNS, EQUALS_FILTERS, SiteSnapshot, memory_index
+from app.core.tile_cache import TileCache
+from app.db.session import DbSession, open_db
+from app.schemas.schemas import SiteAlongRouteIn, SiteBatchIn
 
 router = APIRouter()
 
-from typing import Optional
-from fastapi import APIRouter, Depends, Query # Query eklendi
-from sqlalchemy import text
-from sqlalchemy.orm import Session
-import json
-from app.api.deps import get_db
-from app import schemas
+# format=geojson için varsayılan üst sınır (sayfalama next_cursor ile)
+DEFAULT_LIMIT = 2000
+# Akış modunda sunucu tarafı cursor'dan tek seferde çekilen satır sayısı
+STREAM_CHUNK_SIZE = 500
+
+# Liste (harita) ve detay yanıtlarındaki properties alanları
+LIST_COLUMNS = (
+    "id", "name_tr", "name_en", "category", "sub_category",
+    "city", "district", "main_image_url", "summary_tr",
+)
+DETAIL_COLUMNS = (
+    "id", "name_tr", "name_en", "category", "sub_category",
+    "city", "district", "neighbourhood", "address", "region_id",
+    "summary_tr", "summary_en",
+    "opening_hours", "ticket_required", "website", "main_image_url",
+    "is_unesco", "protection_status",
+    "source_name", "source_url", "last_update",
+)
+
+tile_cache = TileCache(settings.TILE_CACHE_DIR, settings.TILE_CACHE_MAX_BYTES)
+
+result_cache = ResultCache(
+    max_entries=settings.RESULT_CACHE_MAX_ENTRIES,
+    max_bytes=settings.RESULT_CACHE_MAX_BYTES,
+    ttl=settings.RESULT_CACHE_TTL,
+)
+dataset_version = DatasetVersion(ttl=settings.DATASET_VERSION_TTL)
+# Import sonrası eski sürüme ait kayıtlar bir daha okunmaz; belleği boşalt
+dataset_version.on_change(lambda _version: result_cache.clear())
+# Bellek indeksi yeni sürümü bir sonraki kontrolü beklemeden yüklesin
+dataset_version.on_change(memory_index.wake)
+
+# Kümeleme: ekranda bir kümenin kapladığı yaklaşık piksel yarıçapı
+CLUSTER_RADIUS_PX = 60
+# Tek istekte dönebilecek en fazla hücre sayısı (payload üst sınırı)
+MAX_CLUSTER_CELLS = 500
+# Hücre sayısı sınırı aşarsa ızgara en fazla bu kadar kez kabalaştırılır
+MAX_CLUSTER_COARSEN_STEPS = 3
+
+# Yoğunluk (hexbin): altıgen kenarının ekrandaki yaklaşık piksel boyu,
+# bbox'sız istekte izin verilen en yüksek zoom ve tek istekteki ızgara sınırı
+DENSITY_HEX_PX = 32
+DENSITY_MAX_ZOOM = 14
+DENSITY_NO_BBOX_MAX_ZOOM = 8
+DENSITY_MAX_GRID_CELLS = 20000
+DENSITY_PRECISION = 5
+# Web Mercator (EPSG:3857) ekvator çevresi, metre
+MERCATOR_WORLD_M = 2 * math.pi * 6378137
+MERCATOR_MAX_LAT = 85.05112878
+
+# KNN: metre <-> derece dönüşümü ve kesin sıralama için aday çarpanı
+METERS_PER_DEGREE = 111_320
+KNN_OVERFETCH = 4
+
+# MVT: karo çözünürlüğü ve kenar tamponu (sınırda kesilen ikonlar için)
+MVT_EXTENT = 4096
+MVT_BUFFER = 64
+MVT_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+
+# /facets: GROUPING(city, district, category, is_unesco) bit maskesi -> facet adı
+# (15 = boş grouping set, yani toplam)
+FACET_GROUPS = {7: "city", 11: "district", 13: "category", 14: "is_unesco"}
+
+# ST_AsGeoJSON'un varsayılan ondalık basamağı (precision verilmezse)
+GEOJSON_MAX_DECIMALS = 9
+
+# /along-route: sadeleştirme toleransı (buffer_m'nin oranı) ve indeks
+# ön filtresi için rotanın bölündüğü parçaların en fazla köşe sayısı
+ROUTE_SIMPLIFY_RATIO = 0.25
+ROUTE_SUBDIVIDE_VERTICES = 16
+
+# /changes: yanıt başına değişiklik sayısı (upsert + silme)
+CHANGES_DEFAULT_LIMIT = 5000
+CHANGES_MAX_LIMIT = 20000
+NIL_UUID = "00000000-0000-0000-0000-000000000000"
+
+# format=columnar için gereken kolonlar (bkz. app/core/columnar.py)
+COLUMNAR_SELECT = "id, ST_X(geom) AS lon, ST_Y(geom) AS lat, name_tr, category, city, district, is_unesco"
+
+# Sorgu metinleri filtre kombinasyonuna (SiteFilters.shape) ve birkaç bayrağa
+# göre bir kez kurulup saklanır; değerler her zaman bind parametresidir.
+# Aynı metin tekrar geldiği için SQLAlchemy derleme önbelleği ve psycopg'nin
+# sunucu tarafı prepared statement'ları (DB_PREPARE_THRESHOLD) işe yarar.
+# Olası kombinasyon sayısı sınırlı (6 filtre x birkaç bayrak).
+STATEMENT_CACHE_SIZE = 512
 
-router = APIRouter()
 
 @router.get("")
-def list_sites(
-    # --- Yeni Parametreler ---
-    search: Optional[str] = None,
-    min_lon: Optional[float] = None,
-    min_lat: Optional[float] = None,
-    max_lon: Optional[float] = None,
-    max_lat: Optional[float] = None,
-    # -------------------------
-    city: Optional[str] = None,
-    district: Optional[str] = None,
-    category: Optional[str] = None,
-    is_unesco: Optional[bool] = None,
-    limit: int = 2000,
-    db: Session = Depends(get_db),
+async def list_sites(
+    request: Request,
+    filters: SiteFilters = Depends(),
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    format: Optional[str] = Query(None, pattern="^(geojson|geojson-stream|ndjson|columnar)$"),
+    precision: Optional[int] = Query(None, ge=0, le=7),
+    zoom: Optional[int] = Query(None, ge=0, le=22),
+    fields: Optional[str] = Query(None, max_length=500),
+    db: DbSession = Depends(get_read_db),
 ):
-    where = []
-    params = {}
-
-    # 1. Arama Filtresi (İsim veya Özet içinde)
-    if search:
-        where.append("(name_tr ILIKE :search OR name_en ILIKE :search)")
-        params["search"] = f"%{search}%"
-
-    # 2. BBOX Filtresi (Harita sınırları)
-    # PostGIS: && operatörü bounding box kesişimini kontrol eder (çok hızlıdır)
-    if min_lon is not None and min_lat is not None and max_lon is not None and max_lat is not None:
-        where.append("geom && ST_MakeEnvelope(:min_lon, :min_lat, :max_lon, :max_lat, 4326)")
-        params.update({
-            "min_lon": min_lon, "min_lat": min_lat, 
-            "max_lon": max_lon, "max_lat": max_lat
-        })
+    """
+    Siteleri GeoJSON FeatureCollection olarak döner.
+
+    - cursor: önceki sayfanın next_cursor değeri (id üzerinde keyset sayfalama)
+    - format=geojson-stream / ndjson: sonuç server-side cursor ile parça parça
+      yazılır, limit verilmezse tüm eşleşen kayıtlar akıtılır
+    - format=columnar (ya da Accept: application/vnd.heritage.columnar):
+      sütun bazlı ikili biçim, bkz. app/core/columnar.py
+    - fields: virgülle ayrılmış properties alanları (ör. "name_tr,category");
+      id her zaman döner, izinli alanlar DETAIL_COLUMNS. Columnar biçimin
+      kolonları sabittir, orada yok sayılır
+    - precision: koordinatların ondalık basamağı (5 ≈ 1 m)
+    - zoom: bbox'ın önbellek ızgarasına yuvarlanma hassasiyeti (verilmezse
+      bbox genişliğinden tahmin edilir)
+
+    MEMORY_INDEX_ENDPOINTS'te list_sites varsa geojson / columnar sayfaları
+    (arama hariç) bellek içi indeksten cevaplanır; bkz. app/core/memory_index.py.
+    """
+    if format is None:
+        format = "columnar" if COLUMNAR_MEDIA_TYPE in request.headers.get("accept", "") else "geojson"
+
+    streaming = format in ("geojson-stream", "ndjson")
+    if not streaming and limit is None:
+        limit = DEFAULT_LIMIT
+
+    if filters.has_bbox:
+        # Küçük kaydırmalar aynı önbellek kaydını paylaşsın: bbox dışa doğru yuvarlanır
+        filters.min_lon, filters.min_lat, filters.max_lon, filters.max_lat = snap_bbox(
+            filters.min_lon, filters.min_lat, filters.max_lon, filters.max_lat, zoom
+        )
+    if filters.search:
+        filters.search = filters.search.strip() or None
+
+    after_id = _parse_cursor(cursor)
+    columns = _parse_fields(fields, LIST_COLUMNS)
+
+    shape = filters.shape()
+    params = _page_params(filters, limit, after_id)
+    # Arama (ILIKE) ve read-your-writes istekleri her zaman Postgres'ten
+    in_memory = "search" not in shape and not wants_primary(request) and set(columns) <= set(MEMORY_COLUMNS)
+
+    if format == "columnar":
+        sql = _page_statement("columnar", shape, after_id is not None, True)
+        key = ("list_sites", "columnar", precision, sorted(params.items()))
+
+        async def produce_columnar():
+            snapshot = memory_index.snapshot_for("list_sites", dataset_version.current) if in_memory else None
+            if snapshot is not None:
+                return await run_in_threadpool(_memory_columnar, snapshot, filters, after_id, limit, precision)
+            rows = (await db.execute(sql, params)).all()
+            next_cursor = str(rows[-1].id) if len(rows) == limit else None
+            return await run_in_threadpool(encode_columnar, rows, precision, next_cursor)
+
+        return await _cached_response(request, db, key, produce_columnar, media_type=COLUMNAR_MEDIA_TYPE)
+
+    params["precision"] = GEOJSON_MAX_DECIMALS if precision is None else precision
+
+    if streaming:
+        sql = _page_statement("stream", shape, after_id is not None, limit is not None, columns)
+        return StreamingResponse(
+            _stream_features(
+                sql, params, limit, ndjson=(format == "ndjson"), read_only=not wants_primary(request),
+            ),
+            media_type="application/x-ndjson" if format == "ndjson" else "application/geo+json",
+        )
+
+    sql = _page_statement("geojson", shape, after_id is not None, True, columns)
+    key = ("list_sites", columns, sorted(params.items()))
+
+    async def produce():
+        snapshot = memory_index.snapshot_for("list_sites", dataset_version.current) if in_memory else None
+        if snapshot is not None:
+            return await run_in_threadpool(
+                _memory_page, snapshot, filters, after_id, limit, columns, params["precision"],
+            )
+        return (await db.execute(sql, params)).scalar()
+
+    return await _cached_response(request, db, key, produce)
+
+
+def _memory_rows(snapshot: SiteSnapshot, filters: SiteFilters, after_id: Optional[str], limit: Optional[int]):
+    """_page_statement'ın bellek indeksindeki karşılığı: satır numaraları ve next_cursor."""
+    bbox = (filters.min_lon, filters.min_lat, filters.max_lon, filters.max_lat) if filters.has_bbox else None
+    equals = {name: getattr(filters, name) for name in filters.shape() if name in EQUALS_FILTERS}
+    rows = snapshot.page(bbox, equals, after_id, limit)
+    next_cursor = str(snapshot.ids[rows[-1]]) if limit is not None and len(rows) == limit else None
+    return rows, next_cursor
+
+
+def _memory_page(snapshot: SiteSnapshot, filters: SiteFilters, after_id, limit, columns, precision) -> str:
+    rows, next_cursor = _memory_rows(snapshot, filters, after_id, limit)
+    return (
+        '{"type":"FeatureCollection","features":[' + snapshot.features_json(rows, columns, precision)
+        + '],"next_cursor":' + json.dumps(next_cursor) + "}"
+    )
+
+
+def _memory_columnar(snapshot: SiteSnapshot, filters: SiteFilters, after_id, limit, precision) -> bytes:
+    rows, next_cursor = _memory_rows(snapshot, filters, after_id, limit)
+    return encode_columnar(snapshot.columnar_rows(rows), precision, next_cursor)
+
+
+async def _cached_response(
+    request: Request, db: DbSession, key, produce, media_type: str = "application/json",
+) -> Response:
+    """
+    Önbellekli JSON yanıtı + koşullu GET.
+
+    ETag dataset sürümü ve normalize edilmiş anahtardan türetilir; bu yüzden
+    If-None-Match eşleşirse ne sorgu ne payload gerekir (304).
+    produce() None dönerse kayıt yok demektir: 404.
+    """
+    version = await dataset_version.get(db, fresh=wants_primary(request))
+    etag = make_etag(version, key)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.HTTP_CACHE_MAX_AGE}",
+        # Biçim Accept başlığına göre seçilebildiği için
+        "Vary": "Accept",
+    }
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    cache_key = (version, json.dumps(key, default=str))
+    body = result_cache.get(cache_key)
+    if body is None:
+        body = await produce()
+        if body is None:
+            raise HTTPException(404, detail="Site not found")
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        result_cache.put(cache_key, body)
 
-    # Diğer Filtreler
-    if city:
-        where.append("city = :city")
-        params["city"] = city
-    if district: # YENİ
-        where.append("district = :district")
-        params["district"] = district
-    if category:
-        where.append("category = :category")
-        params["category"] = category
-    if is_unesco is not None:
-        where.append("is_unesco = :is_unesco")
-        params["is_unesco"] = is_unesco
-
-    where_sql = ("WHERE " + " AND ".join(where)) if where else ""
-    
-    # SQL Sorgusu (Aynı yapı, sadece where_sql değişti)
-    sql = text(f"""
-        SELECT 
-          id, 
-          ST_AsGeoJSON(geom) AS geom_json,
-          name_tr, name_en, category, sub_category,
-          city, district, main_image_url, summary_tr
+    return Response(body, media_type=media_type, headers=headers)
+
+
+def _parse_cursor(cursor: Optional[str]) -> Optional[str]:
+    if cursor is None:
+        return None
+    try:
+        return str(uuid.UUID(cursor))
+    except ValueError:
+        raise HTTPException(400, detail="Invalid cursor")
+
+
+def _feature_sql(columns: tuple[str, ...], precision: bool = False) -> str:
+    """
+    Satırı GeoJSON Feature'a çeviren SQL ifadesi (json_build_object).
+    precision=True: koordinat basamağı :precision parametresinden okunur.
+    """
+    props = ", ".join(f"'{c}', {c}" for c in columns)
+    geometry = "ST_AsGeoJSON(geom, :precision)" if precision else "ST_AsGeoJSON(geom)"
+    return f"""json_build_object(
+          'type', 'Feature',
+          'geometry', {geometry}::json,
+          'properties', json_build_object({props})
+        )"""
+
+
+def _parse_fields(fields: Optional[str | list[str]], default: tuple[str, ...]) -> tuple[str, ...]:
+    """fields parametresi -> DETAIL_COLUMNS sırasında kolonlar (id her zaman dahil)."""
+    if fields is None:
+        return default
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    requested = {f.strip() for f in fields if f.strip()}
+    unknown = requested - set(DETAIL_COLUMNS)
+    if unknown:
+        raise HTTPException(400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(c for c in DETAIL_COLUMNS if c in requested or c == "id")
+
+
+def _page_params(filters: SiteFilters, limit: Optional[int], after_id: Optional[str]) -> dict:
+    params = filters.params()
+    if after_id is not None:
+        params["after_id"] = after_id
+    if limit is not None:
+        params["limit"] = limit
+    return params
+
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _page_statement(
+    kind: str, shape: tuple[str, ...], paged: bool, limited: bool, columns: tuple[str, ...] = LIST_COLUMNS,
+) -> TextClause:
+    """
+    Sayfa sorgusu (parametreler _page_params ile).
+    kind: "geojson" (tek satır FeatureCollection metni), "stream" ((id, feature)
+    satırları) ya da "columnar" (COLUMNAR_SELECT kolonları). columns:
+    properties alanları; geojson/stream ayrıca :precision bekler.
+    """
+    where = list(where_clauses(shape))
+    # Keyset sayfalama: OFFSET yerine "id > son id" (PK indeksi üzerinden)
+    if paged:
+        where.append("id > :after_id")
+
+    select_sql = COLUMNAR_SELECT if kind == "columnar" else f"id, {_feature_sql(columns, precision=True)} AS feature"
+    page_sql = f"""
+        SELECT {select_sql}
         FROM cultural_sites
-        {where_sql}
-        LIMIT :limit
+        {where_sql(where)}
+        ORDER BY id
+        {"LIMIT :limit" if limited else ""}
+    """
+    if kind == "columnar":
+        return text(page_sql)
+    if kind == "stream":
+        return text(f"SELECT id, feature::text AS feature FROM ({page_sql}) AS page")
+
+    # FeatureCollection tamamen Postgres'te kurulur; Python tarafında satır
+    # başına dict/json.loads/jsonable_encoder maliyeti yoktur.
+    # Sayfa doluysa devamı olabilir: son id bir sonraki sayfanın başlangıcı
+    return text(f"""
+        WITH page AS ({page_sql})
+        SELECT json_build_object(
+          'type', 'FeatureCollection',
+          'features', coalesce(json_agg(feature ORDER BY id), '[]'::json),
+          'next_cursor', CASE WHEN count(*) = :limit THEN max(id::text) END
+        )::text
+        FROM page
     """)
-    params["limit"] = limit
 
-    rows = db.execute(sql, params).mappings().all()
+
+async def _stream_features(sql: TextClause, params: dict, limit: Optional[int], ndjson: bool, read_only: bool = True):
+    """
+    Server-side cursor ile STREAM_CHUNK_SIZE satırlık parçalar halinde yazar;
+    worker belleği sonuç boyutundan bağımsız kalır.
+    Yanıt gövdesi istek bittikten sonra üretildiği için kendi session'ını açar.
+    """
+    async with open_db(read_only=read_only) as db:
+        if not ndjson:
+            yield '{"type":"FeatureCollection","features":['
+
+        count = 0
+        last_id = None
+        async for chunk in db.stream(sql, params, chunk_size=STREAM_CHUNK_SIZE):
+            parts = [r.feature for r in chunk]
+            if ndjson:
+                yield "\n".join(parts) + "\n"
+            else:
+                yield ("," if count else "") + ",".join(parts)
+            count += len(chunk)
+            last_id = chunk[-1].id
+
+        if not ndjson:
+            next_cursor = json.dumps(str(last_id)) if limit is not None and count == limit else "null"
+            yield f'],"next_cursor":{next_cursor}}}'
+
+
+@router.get("/clusters")
+async def list_clusters(
+    zoom: int = Query(..., ge=0, le=22),
+    filters: SiteFilters = Depends(),
+    min_cluster_size: int = Query(3, ge=2, le=50),
+    db: DbSession = Depends(get_read_db),
+):
+    """
+    Zoom seviyesine göre sunucu tarafında grid kümeleme.
+    Her hücre için merkez, adet ve temsilci site id'si döner; hücredeki
+    site sayısı min_cluster_size altındaysa siteler tek tek döner.
+    Hücre sayısı MAX_CLUSTER_CELLS'i aşarsa (bbox'sız ya da geniş bbox'lı
+    yüksek zoom) hücre boyu büyütülüp sorgu tekrarlanır; cell_scale hücrenin
+    zoom'un normal boyuna oranıdır. MAX_CLUSTER_COARSEN_STEPS denemeden sonra
+    da sığmazsa en kalabalık hücreler döner ve truncated=true olur: istemci
+    zoom'u ya da bbox'ı daraltmalıdır. site_count filtreye uyan toplam sitedir.
+    """
+    # Web Mercator: 256px'lik karo, zoom başına 2 kat
+    cell_x = CLUSTER_RADIUS_PX * 360.0 / (256 * 2 ** zoom)
+    # Enlem ekseninde pikseller daha kısa; bbox ortasına göre düzelt (yoksa Türkiye ortası)
+    center_lat = (filters.min_lat + filters.max_lat) / 2 if filters.has_bbox else 39.0
+    cell_y = cell_x * max(math.cos(math.radians(center_lat)), 0.1)
+
+    params = filters.params()
+    params.update({"min_points": min_cluster_size, "max_cells": MAX_CLUSTER_CELLS})
+
+    scale = 1
+    for step in range(MAX_CLUSTER_COARSEN_STEPS + 1):
+        params.update({"cell_x": cell_x * scale, "cell_y": cell_y * scale})
+        rows = (await db.execute(_clusters_statement(filters.shape()), params)).mappings().all()
+        total_cells = rows[0]["total_cells"] if rows else 0
+        if total_cells <= MAX_CLUSTER_CELLS or step == MAX_CLUSTER_COARSEN_STEPS:
+            break
+        # Kenarı f kat büyütmek hücre sayısını en fazla f² kat azaltır
+        scale *= 2 ** max(1, math.ceil(math.log2(math.sqrt(total_cells / MAX_CLUSTER_CELLS))))
 
     features = []
     for r in rows:
-        geom = json.loads(r["geom_json"]) if r["geom_json"] else None
-        props = {k: r[k] for k in r.keys() if k != "geom_json"}
-        features.append({"type": "Feature", "geometry": geom, "properties": props})
+        if r["cluster"]:
+            props = {"cluster": True, "point_count": r["point_count"], "site_id": r["id"]}
+        else:
+            props = {
+                "cluster": False, "id": r["id"], "name_tr": r["name_tr"],
+                "category": r["category"], "is_unesco": r["is_unesco"],
+            }
+        features.append({
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [r["lon"], r["lat"]]},
+            "properties": props,
+        })
 
-    return {"type": "FeatureCollection", "features": features}
+    return {
+        "type": "FeatureCollection",
+        "zoom": zoom,
+        "cell_scale": scale,
+        "truncated": total_cells > MAX_CLUSTER_CELLS,
+        "site_count": int(rows[0]["total_sites"]) if rows else 0,
+        "features": features,
+    }
 
 
-@router.get("/{site_id}")
-def get_site(site_id: str, db: Session = Depends(get_db)):
-    sql = text("""
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _clusters_statement(shape: tuple[str, ...]) -> TextClause:
+    return text(f"""
+        WITH pts AS (
+          SELECT
+            id, geom, name_tr, category, is_unesco,
+            floor(ST_X(geom) / :cell_x)::bigint AS cx,
+            floor(ST_Y(geom) / :cell_y)::bigint AS cy
+          FROM cultural_sites
+          {where_sql(where_clauses(shape))}
+        ),
+        cells AS (
+          SELECT
+            cx, cy,
+            count(*) AS n,
+            avg(ST_X(geom)) AS lon,
+            avg(ST_Y(geom)) AS lat,
+            (array_agg(id ORDER BY is_unesco DESC, name_tr))[1] AS site_id,
+            -- Pencere LIMIT'ten önce hesaplanır: kesilmeden önceki toplamlar
+            count(*) OVER () AS total_cells,
+            sum(count(*)) OVER () AS total_sites
+          FROM pts
+          GROUP BY cx, cy
+          ORDER BY n DESC
+          LIMIT :max_cells
+        )
+        SELECT
+          TRUE AS cluster, c.site_id AS id, c.n AS point_count, c.lon, c.lat,
+          NULL AS name_tr, NULL AS category, NULL::boolean AS is_unesco,
+          c.total_cells, c.total_sites
+        FROM cells c
+        WHERE c.n >= :min_points
+        UNION ALL
+        SELECT
+          FALSE, p.id, 1, ST_X(p.geom), ST_Y(p.geom),
+          p.name_tr, p.category, p.is_unesco,
+          c.total_cells, c.total_sites
+        FROM pts p
+        JOIN cells c ON c.cx = p.cx AND c.cy = p.cy
+        WHERE c.n < :min_points
+    """)
+
+
+@router.get("/density")
+async def site_density(
+    request: Request,
+    zoom: int = Query(..., ge=0, le=DENSITY_MAX_ZOOM),
+    filters: SiteFilters = Depends(),
+    db: DbSession = Depends(get_read_db),
+):
+    """
+    Düşük zoom'lu ısı haritası için altıgen ızgara (ST_HexagonGrid) yoğunluğu.
+
+    Izgara EPSG:3857'de, kenar boyu zoom'a göre (~DENSITY_HEX_PX piksel) ve
+    orijine sabitlenmiştir; aynı zoom'da hücreler her istekte aynıdır. Her hücre
+    için altıgen poligon, toplam adet ve kategori kırılımı döner. Bbox sadece
+    ızgaranın kapsamını belirler: kenardaki hücreler de tam sayılır. Bbox
+    yoksa tablonun kapsamı kullanılır (DENSITY_NO_BBOX_MAX_ZOOM'a kadar).
+    Sonuç zoom + filtre başına dataset sürümüyle önbelleklenir; import
+    sonrası sürüm değiştiği için kendiliğinden geçersiz olur.
+    """
+    cell_size = DENSITY_HEX_PX * MERCATOR_WORLD_M / (256 * 2 ** zoom)
+
+    if filters.has_bbox:
+        filters.min_lon, filters.min_lat, filters.max_lon, filters.max_lat = snap_bbox(
+            max(filters.min_lon, -180.0), max(filters.min_lat, -MERCATOR_MAX_LAT),
+            min(filters.max_lon, 180.0), min(filters.max_lat, MERCATOR_MAX_LAT), zoom,
+        )
+        width = (filters.max_lon - filters.min_lon) / 360.0 * MERCATOR_WORLD_M
+        height = abs(_mercator_y(filters.max_lat) - _mercator_y(filters.min_lat))
+        # Düz kenarlı altıgen: sütun aralığı 1.5 * kenar, satır aralığı sqrt(3) * kenar
+        if (width / (1.5 * cell_size) + 1) * (height / (math.sqrt(3) * cell_size) + 1) > DENSITY_MAX_GRID_CELLS:
+            raise HTTPException(400, detail="Bbox too large for this zoom")
+    elif zoom > DENSITY_NO_BBOX_MAX_ZOOM:
+        raise HTTPException(400, detail=f"Bbox is required above zoom {DENSITY_NO_BBOX_MAX_ZOOM}")
+    if filters.search:
+        filters.search = filters.search.strip() or None
+
+    params = filters.params(use_bbox=False)
+    if filters.has_bbox:
+        params.update({
+            "min_lon": filters.min_lon, "min_lat": filters.min_lat,
+            "max_lon": filters.max_lon, "max_lat": filters.max_lat,
+        })
+    key = ("density", zoom, sorted(params.items()))
+    params.update({"cell_size": cell_size, "precision": DENSITY_PRECISION})
+    sql = _density_statement(filters.shape(use_bbox=False), filters.has_bbox)
+
+    async def produce():
+        return (await db.execute(sql, params)).scalar()
+
+    return await _cached_response(request, db, key, produce)
+
+
+def _mercator_y(lat: float) -> float:
+    return MERCATOR_WORLD_M / (2 * math.pi) * math.log(math.tan(math.pi / 4 + math.radians(lat) / 2))
+
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _density_statement(shape: tuple[str, ...], with_bbox: bool) -> TextClause:
+    if with_bbox:
+        bounds = "ST_MakeEnvelope(:min_lon, :min_lat, :max_lon, :max_lat, 4326)"
+    else:
+        # İstatistiklerden (ANALYZE) gelen kapsam; yoksa tablo taranır
+        bounds = """ST_SetSRID(coalesce(
+              ST_EstimatedExtent('cultural_sites', 'geom'),
+              (SELECT ST_Extent(geom) FROM cultural_sites)
+            )::geometry, 4326)"""
+    return text(f"""
+        WITH hex AS (
+          SELECT h.i, h.j, h.geom, ST_Transform(h.geom, 4326) AS geom_4326
+          FROM ST_HexagonGrid(:cell_size, ST_Transform({bounds}, 3857)) AS h
+        ),
+        counts AS (
+          SELECT h.i, h.j, s.category, count(*) AS n
+          FROM hex h
+          -- Önce 4326'da kutu kesişimi (GiST indeksi), sonra 3857'de kesin altıgen testi
+          JOIN cultural_sites s
+            ON s.geom && h.geom_4326 AND ST_Intersects(h.geom, ST_Transform(s.geom, 3857))
+          {where_sql(where_clauses(shape, "s"))}
+          GROUP BY h.i, h.j, s.category
+        ),
+        cells AS (
+          SELECT
+            i, j, sum(n)::bigint AS n,
+            json_object_agg(coalesce(category, ''), n ORDER BY n DESC) AS categories
+          FROM counts
+          GROUP BY i, j
+        )
+        SELECT json_build_object(
+          'type', 'FeatureCollection',
+          'cell_size_m', CAST(:cell_size AS float8),
+          'total', coalesce(sum(c.n), 0),
+          'max_count', coalesce(max(c.n), 0),
+          'features', coalesce(
+            json_agg(json_build_object(
+              'type', 'Feature',
+              'geometry', ST_AsGeoJSON(h.geom_4326, :precision)::json,
+              'properties', json_build_object(
+                'i', c.i, 'j', c.j, 'count', c.n, 'categories', c.categories
+              )
+            ) ORDER BY c.n DESC),
+            '[]'::json
+          )
+        )::text
+        FROM cells c
+        JOIN hex h ON h.i = c.i AND h.j = c.j
+    """)
+
+
+@router.get("/tiles/{z}/{x}/{y}.mvt")
+async def get_tile(
+    z: int = Path(..., ge=0, le=22),
+    x: int = Path(..., ge=0),
+    y: int = Path(..., ge=0),
+    filters: SiteFilters = Depends(),
+    db: DbSession = Depends(get_read_db),
+):
+    """
+    Mapbox Vector Tile (ST_AsMVT). list_sites filtreleri geçerlidir;
+    bbox parametreleri yok sayılır, karonun kendisi bbox'tır.
+    """
+    if x >= 2 ** z or y >= 2 ** z:
+        raise HTTPException(404, detail="Tile out of range")
+
+    shape = filters.shape(use_bbox=False)
+    params = filters.params(use_bbox=False)
+
+    key = None
+    if tile_cache.enabled:
+        # Nesil, sorgudan ÖNCE okunur: import sırasında üretilen karo eski nesle yazılır
+        key = tile_cache.key(z, x, y, params, tile_cache.generation())
+        cached = await run_in_threadpool(tile_cache.get, key)
+        if cached is not None:
+            return Response(cached, media_type=MVT_MEDIA_TYPE, headers={"X-Tile-Cache": "HIT"})
+
+    params.update({
+        "z": z, "x": x, "y": y,
+        "extent": MVT_EXTENT,
+        "buffer": MVT_BUFFER,
+        "margin": MVT_BUFFER / MVT_EXTENT,
+    })
+
+    tile = (await db.execute(_tile_statement(shape), params)).scalar()
+    data = bytes(tile) if tile is not None else b""
+
+    if key is not None:
+        await run_in_threadpool(tile_cache.put, key, data)
+
+    return Response(data, media_type=MVT_MEDIA_TYPE, headers={"X-Tile-Cache": "MISS"})
+
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _tile_statement(shape: tuple[str, ...]) -> TextClause:
+    where = where_clauses(shape, "s") + ("s.geom && b.env_4326",)
+    return text(f"""
+        WITH b AS (
+          SELECT
+            ST_TileEnvelope(:z, :x, :y) AS env,
+            ST_Transform(ST_TileEnvelope(:z, :x, :y, margin => :margin), 4326) AS env_4326
+        ),
+        mvt AS (
+          SELECT
+            ST_AsMVTGeom(ST_Transform(s.geom, 3857), b.env, :extent, :buffer, true) AS geom,
+            s.id::text AS id, s.name_tr, s.category, s.city, s.district, s.is_unesco
+          FROM cultural_sites s, b
+          {where_sql(where)}
+        )
+        SELECT ST_AsMVT(mvt.*, 'sites', :extent, 'geom') FROM mvt
+    """)
+
+
+@router.get("/search")
+async def search_sites(
+    q: str = Query(..., min_length=1, max_length=200),
+    filters: SiteFilters = Depends(),
+    limit: int = Query(20, ge=1, le=100),
+    db: DbSession = Depends(get_read_db),
+):
+    """
+    Sıralı tam metin arama (isim + özet, TR ve EN).
+    TR tarafında hem katlanmış (aksansız) hem Türkçe stem'li eşleşme aranır;
+    isim başı eşleşmeleri ek puan alır. properties.rank ile döner.
+    """
+    params = filters.params()
+    params.update({"q": q, "q_like": _escape_like(q), "limit": limit})
+    body = (await db.execute(_search_statement(filters.shape()), params)).scalar()
+
+    return Response(body, media_type="application/json")
+
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _search_statement(shape: tuple[str, ...]) -> TextClause:
+    where = where_clauses(shape, "s") + ("""(
+        s.search_tr @@ q.tq_tr
+        OR s.search_en @@ q.tq_en
+        OR s.name_tr_norm LIKE q.prefix
+        OR s.name_en_norm LIKE q.prefix
+    )""",)
+    return text(f"""
+        WITH q AS (
+          SELECT
+            websearch_to_tsquery('simple', tr_fold(:q)) ||
+              websearch_to_tsquery('turkish', tr_lower(:q)) AS tq_tr,
+            websearch_to_tsquery('english', :q) AS tq_en,
+            tr_fold(:q_like) || '%' AS prefix
+        ),
+        hits AS (
+          SELECT
+            s.id, s.geom, {", ".join(f"s.{c}" for c in LIST_COLUMNS if c != "id")},
+            ts_rank_cd(s.search_tr, q.tq_tr)
+              + ts_rank_cd(s.search_en, q.tq_en)
+              + CASE WHEN s.name_tr_norm LIKE q.prefix OR s.name_en_norm LIKE q.prefix
+                     THEN 1.0 ELSE 0 END AS rank
+          FROM cultural_sites s, q
+          {where_sql(where)}
+          ORDER BY rank DESC, s.name_tr
+          LIMIT :limit
+        )
+        SELECT json_build_object(
+          'type', 'FeatureCollection',
+          'features', coalesce(
+            json_agg({_feature_sql(LIST_COLUMNS + ("rank",))} ORDER BY rank DESC, name_tr),
+            '[]'::json
+          )
+        )::text
+        FROM hits
+    """)
+
+
+# Önek aralığı her dalın WHERE'inde açıkça yazılır: [tr_fold(q), tr_fold(q) || U+10FFFF).
+# Sınırlar sadece parametreye bağlı (tr_fold IMMUTABLE) olduğu için C collation'lı
+# btree'de Index Cond olur; generic (prepared) planda da geçerlidir. CTE ya da
+# LIKE parametresi kullanılmaz: ikisi de sınırı indekse taşımaz.
+SUGGEST_SQL = text("""
+    SELECT id, name_tr, name_en, city, category
+    FROM (
+      (SELECT s.id, s.name_tr, s.name_en, s.city, s.category, s.name_tr_norm AS k
+       FROM cultural_sites s
+       WHERE s.name_tr_norm >= tr_fold(:q) AND s.name_tr_norm < tr_fold(:q) || chr(1114111)
+       ORDER BY s.name_tr_norm
+       LIMIT :limit)
+      UNION
+      (SELECT s.id, s.name_tr, s.name_en, s.city, s.category, s.name_en_norm AS k
+       FROM cultural_sites s
+       WHERE s.name_en_norm >= tr_fold(:q) AND s.name_en_norm < tr_fold(:q) || chr(1114111)
+       ORDER BY s.name_en_norm
+       LIMIT :limit)
+    ) AS hits
+    ORDER BY k, name_tr
+    LIMIT :limit
+""")
+
+
+@router.get("/suggest")
+async def suggest_sites(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=25),
+    db: DbSession = Depends(get_read_db),
+):
+    """
+    Yazarken otomatik tamamlama: isim başı eşleşmesi (Türkçe katlamalı).
+    name_*_norm kolonları C collation'lı btree indekslidir; her dal sadece
+    önek aralığını (Index Cond) okuyup limit'te durur.
+    """
+    rows = (await db.execute(SUGGEST_SQL, {"q": q, "limit": limit})).mappings().all()
+
+    # Aynı site iki daldan da gelebilir (TR ve EN isim)
+    seen = set()
+    suggestions = []
+    for r in rows:
+        if r["id"] in seen:
+            continue
+        seen.add(r["id"])
+        suggestions.append(dict(r))
+    return suggestions
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+@router.get("/nearby")
+async def nearby_sites(
+    request: Request,
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_m: Optional[float] = Query(None, gt=0, le=500_000),
+    k: int = Query(20, ge=1, le=200),
+    filters: SiteFilters = Depends(),
+    db: DbSession = Depends(get_read_db),
+):
+    """
+    En yakın k site (PostGIS KNN, geom::geography GIST indeksi üzerinden).
+    properties.distance_m: geography ile metre cinsinden kesin mesafe.
+    Filtreler list_sites ile aynıdır (arama, bbox, şehir, ilçe, kategori, UNESCO).
+
+    MEMORY_INDEX_ENDPOINTS'te nearby varsa bellek içi indeksten cevaplanır
+    (arama ve bbox filtreleri hariç); orada mesafe küresel (haversine),
+    sferoide göre fark binde birkaç.
+    """
+    params = filters.params()
+    in_memory = not {"search", "bbox"} & set(filters.shape()) and not wants_primary(request)
+
+    if "nearby" in memory_index.endpoints and in_memory:
+        snapshot = memory_index.snapshot_for("nearby", await dataset_version.get(db))
+        if snapshot is not None:
+            rows, dist = snapshot.nearest(lon, lat, k, radius_m, params)
+            features = snapshot.features_json(rows, LIST_COLUMNS, extra={"distance_m": dist.round(1)})
+            return Response('{"type":"FeatureCollection","features":[' + features + "]}", media_type="application/json")
+
+    if radius_m is not None:
+        # Önce indeksli bbox ön filtresi, sonra kesin geography mesafesi
+        dlat = radius_m / METERS_PER_DEGREE
+        dlon = radius_m / (METERS_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01))
+        params.update({
+            "nb_min_lon": lon - dlon, "nb_min_lat": lat - dlat,
+            "nb_max_lon": lon + dlon, "nb_max_lat": lat + dlat,
+            "radius_m": radius_m,
+        })
+
+    # KNN küre üzerinde metre cinsinden sıralar; kesin (sferoid) mesafe binde
+    # birkaç farklı olabildiği için fazladan aday alınıp yeniden sıralanır.
+    params.update({"lon": lon, "lat": lat, "k": k, "candidates": k * KNN_OVERFETCH})
+    sql = _nearby_statement(filters.shape(), radius_m is not None)
+    body = (await db.execute(sql, params)).scalar()
+
+    return Response(body, media_type="application/json")
+
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _nearby_statement(shape: tuple[str, ...], with_radius: bool) -> TextClause:
+    # Nokta ifadesi sorguya gömülür: <-> operatörü ancak sabit/parametre
+    # karşısında indeksle sıralama yapabilir (CTE'den gelen değerle yapamaz).
+    # Sıralama geography üzerinden (idx_cultural_sites_geog): geometry <->
+    # derece cinsinden olduğu için boylam yönündeki siteleri geri bırakırdı.
+    point = "ST_SetSRID(ST_MakePoint(:lon, :lat), 4326)"
+
+    where = where_clauses(shape, "s")
+    if with_radius:
+        where += (
+            "s.geom && ST_MakeEnvelope(:nb_min_lon, :nb_min_lat, :nb_max_lon, :nb_max_lat, 4326)",
+            f"ST_DWithin(s.geom::geography, {point}::geography, :radius_m)",
+        )
+
+    return text(f"""
+        WITH candidates AS (
+          SELECT s.id, s.geom, {", ".join(f"s.{c}" for c in LIST_COLUMNS if c != "id")}
+          FROM cultural_sites s
+          {where_sql(where)}
+          ORDER BY s.geom::geography <-> {point}::geography
+          LIMIT :candidates
+        ),
+        nearest AS (
+          SELECT c.*, round(ST_Distance(c.geom::geography, {point}::geography)::numeric, 1) AS distance_m
+          FROM candidates c
+          ORDER BY distance_m
+          LIMIT :k
+        )
+        SELECT json_build_object(
+          'type', 'FeatureCollection',
+          'features', coalesce(
+            json_agg({_feature_sql(LIST_COLUMNS + ("distance_m",))} ORDER BY distance_m),
+            '[]'::json
+          )
+        )::text
+        FROM nearest
+    """)
+
+
+@router.get("/facets")
+async def site_facets(
+    request: Request,
+    filters: SiteFilters = Depends(),
+    db: DbSession = Depends(get_read_db),
+):
+    """
+    Filtre ekranı için şehir / ilçe / kategori / UNESCO sayımları.
+
+    Bbox ve arama yoksa sayımlar cultural_sites_facets materialized view'ından
+    (importer sonrası tazelenir) okunur; sadece bbox ya da arama varsa tabloda
+    canlı GROUP BY yapılır. Sonuç dataset sürümüyle önbelleklenir.
+    """
+    if filters.search:
+        filters.search = filters.search.strip() or None
+
+    live = filters.has_bbox or filters.search is not None
+    params = filters.params()
+    sql = _facets_statement(filters.shape(), live)
+    key = ("facets", sorted(params.items()))
+
+    async def produce():
+        rows = (await db.execute(sql, params)).all()
+        facets = {name: [] for name in FACET_GROUPS.values()}
+        total = 0
+        for r in rows:
+            name = FACET_GROUPS.get(r.g)
+            if name is None:
+                total = r.n
+                continue
+            value = getattr(r, name)
+            facets[name].append({"value": None if value == "" else value, "count": r.n})
+        return json.dumps({
+            "total": total,
+            "source": "live" if live else "aggregate",
+            "facets": facets,
+        }, ensure_ascii=False)
+
+    return await _cached_response(request, db, key, produce)
+
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _facets_statement(shape: tuple[str, ...], live: bool) -> TextClause:
+    where = where_clauses(shape)
+    if live:
+        source = f"""(
+          SELECT coalesce(city, '') AS city, coalesce(district, '') AS district,
+                 category, is_unesco, count(*) AS n
+          FROM cultural_sites
+          {where_sql(where)}
+          GROUP BY 1, 2, 3, 4
+        ) AS live"""
+        where = ()
+    else:
+        source = FACETS_VIEW
+
+    return text(f"""
         SELECT
-          id,
-          ST_AsGeoJSON(geom) AS geom_json,
-          name_tr, name_en, category, sub_category,
-          city, district, neighbourhood, address, region_id,
-          summary_tr, summary_en,
-          opening_hours, ticket_required, website, main_image_url,
-          is_unesco, protection_status,
-          source_name, source_url, last_update
+          GROUPING(city, district, category, is_unesco) AS g,
+          city, district, category, is_unesco,
+          coalesce(sum(n), 0)::bigint AS n
+        FROM {source}
+        {where_sql(where)}
+        GROUP BY GROUPING SETS ((city), (district), (category), (is_unesco), ())
+        ORDER BY g, n DESC
+    """)
+
+
+@router.post("/batch")
+async def get_sites_batch(payload: SiteBatchIn, db: DbSession = Depends(get_read_db)):
+    """
+    Birden çok siteyi tek istekte döner (detay paneli / favoriler).
+    features istekteki id sırasıyla gelir; bulunamayan id'ler "missing"
+    listesindedir. fields ve precision list_sites ile aynı anlamdadır.
+    """
+    ids = list(dict.fromkeys(str(i) for i in payload.ids))
+    columns = _parse_fields(payload.fields, DETAIL_COLUMNS)
+    params = {
+        "ids": ids,
+        "precision": GEOJSON_MAX_DECIMALS if payload.precision is None else payload.precision,
+    }
+
+    rows = (await db.execute(_batch_statement(columns), params)).all()
+    found = {r.id: r.feature for r in rows}
+    features = [found[i] for i in ids if i in found]
+    missing = [i for i in ids if i not in found]
+
+    # Feature'lar Postgres'te JSON metni olarak kurulur; burada sadece birleştirilir
+    body = (
+        '{"type":"FeatureCollection","features":[' + ",".join(features) + "],"
+        + '"missing":' + json.dumps(missing) + "}"
+    )
+    return Response(body, media_type="application/json")
+
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _batch_statement(columns: tuple[str, ...]) -> TextClause:
+    return text(f"""
+        SELECT id::text AS id, {_feature_sql(columns, precision=True)}::text AS feature
         FROM cultural_sites
-        WHERE id = :id
-        LIMIT 1
+        WHERE id = ANY(CAST(:ids AS uuid[]))
     """)
 
-    r = db.execute(sql, {"id": site_id}).mappings().first()
-    if not r:
-        raise HTTPException(404, detail="Site not found")
 
-    geom = json.loads(r["geom_json"]) if r["geom_json"] else None
-    props = {k: r[k] for k in r.keys() if k != "geom_json"}
-    if props.get("last_update") is not None:
-        props["last_update"] = str(props["last_update"])
+@router.post("/along-route")
+async def sites_along_route(payload: SiteAlongRouteIn, db: DbSession = Depends(get_read_db)):
+    """
+    Rotaya buffer_m metreden yakın siteler, rota üzerindeki sırasıyla.
+
+    Uzun rotalarda (binlerce köşe) tek bir bbox tüm bölgeyi kapsar ve indeks
+    işe yaramaz. Bu yüzden rota önce sadeleştirilir (tolerans buffer_m *
+    ROUTE_SIMPLIFY_RATIO), ST_Subdivide ile küçük parçalara bölünür ve her
+    parça için geom indeksinden aday alınır (yarıçap buffer + tolerans, yani
+    hiçbir site kaçmaz). Kesin mesafe ve sıra orijinal rotaya göre hesaplanır.
+
+    properties:
+    - distance_m: rotaya en kısa mesafe
+    - detour_m: gidiş-dönüş sapma (2 * distance_m, kuş uçuşu)
+    - route_position_m: rotanın başından siteye en yakın noktaya uzaklık
+    """
+    filters = SiteFilters(category=payload.category, is_unesco=payload.is_unesco)
+    columns = _parse_fields(payload.fields, LIST_COLUMNS)
+    tolerance = payload.buffer_m * ROUTE_SIMPLIFY_RATIO
+
+    params = filters.params()
+    params.update({
+        "route": payload.route.model_dump_json(),
+        "buffer_m": payload.buffer_m,
+        # Derece cinsinden tolerans: boylamda 1 derece <= 111 km, yani metre
+        # cinsinden sapma hiçbir yönde toleransı geçmez
+        "tolerance_deg": tolerance / METERS_PER_DEGREE,
+        "reach_m": payload.buffer_m + tolerance,
+        "m_per_deg": METERS_PER_DEGREE,
+        "max_vertices": ROUTE_SUBDIVIDE_VERTICES,
+        "limit": payload.limit,
+        "precision": GEOJSON_MAX_DECIMALS if payload.precision is None else payload.precision,
+    })
+
+    body = (await db.execute(_along_route_statement(filters.shape(), columns), params)).scalar()
+    return Response(body, media_type="application/json")
+
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _along_route_statement(shape: tuple[str, ...], columns: tuple[str, ...]) -> TextClause:
+    select = ", ".join(f"s.{c}" for c in columns if c != "id")
+    select = f"s.id, s.geom, {select}" if select else "s.id, s.geom"
+    props = columns + ("distance_m", "detour_m", "route_position_m")
+    return text(f"""
+        WITH input AS (
+          SELECT line, ST_Length(line::geography) AS length_m
+          FROM (SELECT ST_SetSRID(ST_GeomFromGeoJSON(:route), 4326) AS line) r
+        ),
+        simple AS (
+          SELECT ST_Simplify(line, :tolerance_deg) AS line FROM input
+        ),
+        pieces AS (
+          SELECT
+            p.geom,
+            -- Boylam dolgusu parçanın en yüksek enlemine göre (en geniş hali)
+            :reach_m / (:m_per_deg * greatest(
+              cos(radians(greatest(abs(ST_YMin(p.geom)), abs(ST_YMax(p.geom))))), 0.01
+            )) AS pad_lon
+          FROM simple, ST_Subdivide(simple.line, :max_vertices) AS p(geom)
+        ),
+        candidates AS (
+          SELECT DISTINCT s.id
+          FROM pieces p
+          JOIN cultural_sites s
+            ON s.geom && ST_Expand(p.geom, p.pad_lon, :reach_m / :m_per_deg)
+           AND ST_DWithin(s.geom::geography, p.geom::geography, :reach_m)
+          {where_sql(where_clauses(shape, "s"))}
+        ),
+        located AS (
+          SELECT
+            {select},
+            ST_Distance(s.geom::geography, i.line::geography) AS distance,
+            ST_LineLocatePoint(i.line, s.geom) AS fraction,
+            i.length_m
+          FROM candidates c
+          JOIN cultural_sites s ON s.id = c.id
+          CROSS JOIN input i
+        ),
+        hits AS (
+          SELECT
+            l.*,
+            round(l.distance::numeric, 1) AS distance_m,
+            round((2 * l.distance)::numeric, 1) AS detour_m,
+            round((l.fraction * l.length_m)::numeric, 1) AS route_position_m
+          FROM located l
+          WHERE l.distance <= :buffer_m
+        ),
+        page AS (
+          SELECT * FROM hits ORDER BY fraction, distance LIMIT :limit
+        )
+        SELECT json_build_object(
+          'type', 'FeatureCollection',
+          'route', json_build_object(
+            'length_m', (SELECT round(length_m::numeric, 1) FROM input),
+            'vertices', (SELECT ST_NPoints(line) FROM input),
+            'simplified_vertices', (SELECT ST_NPoints(line) FROM simple)
+          ),
+          'total', (SELECT count(*) FROM hits),
+          'features', coalesce(
+            json_agg({_feature_sql(props, precision=True)} ORDER BY fraction, distance),
+            '[]'::json
+          )
+        )::text
+        FROM page
+    """)
+
+
+@router.get("/changes")
+async def site_changes(
+    since: Optional[str] = None,
+    limit: int = Query(CHANGES_DEFAULT_LIMIT, ge=1, le=CHANGES_MAX_LIMIT),
+    fields: Optional[str] = Query(None, max_length=500),
+    precision: Optional[int] = Query(None, ge=0, le=7),
+    db: DbSession = Depends(get_read_db),
+):
+    """
+    Artımlı senkron: since imlecinden bu yana eklenen/güncellenen siteler
+    (upserts, GeoJSON Feature) ve silinen site id'leri (deleted).
+
+    - since verilmezse baştan başlar; ilk yükleme de bu endpoint'le yapılabilir
+    - has_more=true ise next_cursor ile hemen tekrar çağrılır; false ise
+      next_cursor saklanır ve bir sonraki senkronda gönderilir
+    - reset=true: imleç artık geçersiz (tablo sıfırlandı); yerel kopya
+      silinip since olmadan baştan senkron yapılmalı
+    - fields / precision: list_sites ile aynı
+
+    İmleç transaction id'sine (change_xid) dayanır ve sadece en eski açık
+    transaction'dan önce biten yazılar döner; uzun süren bir import
+    commit edene kadar beklenir, kendisinden sonra biten yazılar yüzünden
+    atlanmaz. Silmeler trigger'larla cultural_sites_deleted'a yazılır.
+    """
+    after_xid, after_id = _parse_change_cursor(since)
+    columns = _parse_fields(fields, LIST_COLUMNS)
+
+    state = (await db.execute(CHANGES_STATE_SQL)).first()
+    horizon, floor = int(state.horizon), int(state.floor)
+    if since is not None and after_xid < floor:
+        return Response(json.dumps({
+            "upserts": [], "deleted": [], "next_cursor": None, "has_more": False, "reset": True,
+        }), media_type="application/json")
+
+    rows = (await db.execute(_changes_statement(columns), {
+        "after_xid": str(after_xid),
+        "after_id": after_id,
+        "horizon": str(horizon),
+        "limit": limit + 1,
+        "precision": GEOJSON_MAX_DECIMALS if precision is None else precision,
+    })).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if has_more:
+        next_cursor = f"{rows[-1].xid}:{rows[-1].id}"
+    elif horizon > after_xid:
+        next_cursor = str(horizon)
+    else:
+        # Geride kalan bir replikadan okunduysa imleç geri gitmesin
+        next_cursor = since if since is not None else str(horizon)
+
+    upserts = [r.feature for r in rows if r.feature is not None]
+    deleted = [r.id for r in rows if r.feature is None]
+    body = (
+        '{"upserts":[' + ",".join(upserts) + "],"
+        + '"deleted":' + json.dumps(deleted) + ","
+        + '"next_cursor":' + json.dumps(next_cursor) + ","
+        + '"has_more":' + json.dumps(has_more) + ',"reset":false}'
+    )
+    return Response(body, media_type="application/json")
+
+
+def _parse_change_cursor(cursor: Optional[str]) -> tuple[int, str]:
+    """İmleç biçimi: "<xid>" (bu xid ve sonrası) ya da "<xid>:<id>" (bu satırdan sonrası)."""
+    if cursor is None:
+        return 0, NIL_UUID
+    xid, _, after_id = cursor.partition(":")
+    try:
+        if int(xid) < 0:
+            raise ValueError(xid)
+        return int(xid), str(uuid.UUID(after_id)) if after_id else NIL_UUID
+    except ValueError:
+        raise HTTPException(400, detail="Invalid cursor")
+
+
+# Ufuk: bu xid'den küçük tüm transaction'lar bitmiştir (commit ya da rollback).
+# Taban: TRUNCATE sonrası bundan eski imleçler geçersiz.
+CHANGES_STATE_SQL = text("""
+    SELECT pg_snapshot_xmin(pg_current_snapshot())::text AS horizon, changes_floor::text AS floor
+    FROM dataset_version
+    WHERE id = 1
+""")
+
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _changes_statement(columns: tuple[str, ...]) -> TextClause:
+    after = "(change_xid, id) > (CAST(:after_xid AS xid8), CAST(:after_id AS uuid))"
+    before = "change_xid < CAST(:horizon AS xid8)"
+    return text(f"""
+        WITH changes AS (
+          (SELECT change_xid, id, {_feature_sql(columns, precision=True)}::text AS feature
+           FROM cultural_sites
+           WHERE {after} AND {before}
+           ORDER BY change_xid, id
+           LIMIT :limit)
+          UNION ALL
+          (SELECT change_xid, id, NULL
+           FROM cultural_sites_deleted
+           WHERE {after} AND {before}
+           ORDER BY change_xid, id
+           LIMIT :limit)
+        )
+        SELECT change_xid::text AS xid, id::text AS id, feature
+        FROM changes
+        ORDER BY change_xid, id
+        LIMIT :limit
+    """)
+
+
+GET_SITE_SQL = text(f"""
+    SELECT {_feature_sql(DETAIL_COLUMNS)}::text
+    FROM cultural_sites
+    WHERE id = :id
+    LIMIT 1
+""")
+
+
+@router.get("/{site_id}")
+async def get_site(site_id: str, request: Request, db: DbSession = Depends(get_read_db)):
+    async def produce():
+        return (await db.execute(GET_SITE_SQL, {"id": site_id})).scalar()
 
-    return {"type": "Feature", "geometry": geom, "properties": props}
+    return await _cached_response(request, db, ("get_site", site_id), produce)
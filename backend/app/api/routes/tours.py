@@ -0,0 +1,62 @@
+import numpy as np
+from fastapi import APIRouter, Depends
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+
+from app.api.deps import get_read_db
+from app.core import tsp
+from app.db.session import DbSession
+from app.schemas.tours import TourOptimizeIn, TourOptimizeOut, TourStop
+
+router = APIRouter()
+
+TOUR_SITES_SQL = text("""
+    SELECT id::text AS id, name_tr, category, ST_Y(geom) AS lat, ST_X(geom) AS lon
+    FROM cultural_sites
+    WHERE id = ANY(CAST(:ids AS uuid[]))
+""")
+
+
+@router.post("/optimize", response_model=TourOptimizeOut)
+async def optimize_tour(payload: TourOptimizeIn, db: DbSession = Depends(get_read_db)):
+    """
+    Başlangıç noktası + site listesi için ziyaret sırası (dış servis yok).
+
+    Mesafeler kuş uçuşu (büyük daire) metredir; sıralama en yakın komşu +
+    2-opt + Or-opt ile time_budget_ms içinde bulunur (bkz. app/core/tsp.py).
+    Yol tarifi gerekiyorsa istemci sıralı duraklar için ayrıca ister.
+    """
+    ids = list(dict.fromkeys(str(i) for i in payload.site_ids))
+    rows = (await db.execute(TOUR_SITES_SQL, {"ids": ids})).mappings().all()
+    found = {r["id"]: r for r in rows}
+    sites = [found[i] for i in ids if i in found]
+    missing = [i for i in ids if i not in found]
+
+    # 0. nokta başlangıç; sitelerin indeksi 1'den başlar
+    lat = np.array([payload.start.lat] + [s["lat"] for s in sites], dtype=np.float64)
+    lon = np.array([payload.start.lon] + [s["lon"] for s in sites], dtype=np.float64)
+    result = await run_in_threadpool(
+        tsp.solve, lat, lon, payload.return_to_start, payload.time_budget_ms / 1000
+    )
+
+    stops = []
+    cumulative = 0.0
+    for k, leg in zip(result.order[1:], result.legs_m[1:]):
+        site = sites[k - 1]
+        cumulative += leg
+        stops.append(TourStop(
+            id=site["id"], name_tr=site["name_tr"], category=site["category"],
+            lat=site["lat"], lon=site["lon"],
+            leg_m=round(leg, 1), cumulative_m=round(cumulative, 1),
+        ))
+
+    return TourOptimizeOut(
+        stops=stops,
+        total_m=round(result.total_m + result.return_m, 1),
+        return_leg_m=round(result.return_m, 1),
+        missing=missing,
+        initial_m=round(result.initial_m, 1),
+        passes=result.passes,
+        elapsed_ms=round(result.elapsed_ms, 2),
+        timed_out=result.timed_out,
+    )
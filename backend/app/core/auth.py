@@ -5,10 +5,11 @@ from app.core.security import decode_token
 
 bearer = HTTPBearer(auto_error=False)
 
-def get_current_user(creds: HTTPAuthorizationCredentials = Depends(bearer)) -> dict:
+async def get_current_user(creds: HTTPAuthorizationCredentials = Depends(bearer)) -> dict:
     if not creds:
         raise HTTPException(status_code=401, detail="Missing token")
 
+    # Doğrulanmış token'lar önbellekte (bkz. TokenCache): tekrar imza kontrolü yok
     try:
         payload = decode_token(creds.credentials)
         user_id = payload.get("sub")
@@ -0,0 +1,91 @@
+import hashlib
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+
+class ResultCache:
+    """
+    Süreç içi sorgu sonucu önbelleği (hazır yanıt gövdeleri).
+
+    - LRU: toplam boyut max_bytes'ı ya da kayıt sayısı max_entries'i aşınca
+      en eski kullanılanlar atılır
+    - TTL: ttl saniyeden eski kayıtlar okunurken düşürülür
+    Anahtarlar dataset sürümünü içerdiği için import sonrası eski kayıtlar
+    kendiliğinden ıskalanır.
+    """
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 64 * 1024 * 1024, ttl: float = 300):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, bytes]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            stored_at, value = item
+            if time.monotonic() - stored_at > self.ttl:
+                self._pop(key)
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._data:
+                self._pop(key)
+            self._data[key] = (time.monotonic(), value)
+            self._bytes += len(value)
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                self._pop(next(iter(self._data)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def _pop(self, key: Hashable) -> None:
+        _, value = self._data.pop(key)
+        self._bytes -= len(value)
+
+
+def snap_bbox(min_lon: float, min_lat: float, max_lon: float, max_lat: float, zoom: Optional[int] = None):
+    """
+    Bbox'ı zoom'a bağlı bir ızgaraya dışa doğru yuvarlar; küçük kaydırmalar
+    aynı anahtara düşer. Sonuç her zaman istenen bbox'ı kapsar.
+    zoom verilmezse bbox genişliğinden tahmin edilir.
+    """
+    if zoom is None:
+        width = max(max_lon - min_lon, 1e-9)
+        zoom = max(0, min(22, int(math.log2(360.0 / width))))
+    # Izgara adımı: o zoom'daki karo genişliğinin dörtte biri
+    step = 360.0 / 2 ** (zoom + 2)
+    return (
+        math.floor(min_lon / step) * step,
+        math.floor(min_lat / step) * step,
+        math.ceil(max_lon / step) * step,
+        math.ceil(max_lat / step) * step,
+    )
+
+
+def make_etag(version: int, key: Hashable) -> str:
+    digest = hashlib.sha1(json.dumps(key, default=str).encode()).hexdigest()[:16]
+    return f'W/"v{version}-{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = {t.strip() for t in if_none_match.split(",")}
+    # W/ önekli ve öneksiz biçimler eşdeğer sayılır (zayıf karşılaştırma)
+    return "*" in tags or etag in tags or etag.removeprefix("W/") in tags
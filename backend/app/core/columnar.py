@@ -0,0 +1,88 @@
+"""
+Harita için kompakt, sütun bazlı ikili yanıt biçimi (format=columnar).
+
+GeoJSON her feature için tüm property anahtarlarını tekrarlar ve koordinatları
+metin olarak taşır. Bu biçimde her kolon tek bir dizi olarak gider:
+
+    0        4 bayt   magic "HSC1"
+    4        4 bayt   uint32 başlık uzunluğu (H)
+    8        H bayt   başlık JSON (utf-8), 4 bayta hizalanacak şekilde boşlukla doldurulur
+    ...      16*n     id'ler (ham UUID baytları)
+    ...      4*n      float32 boylam (lon)
+    ...      4*n      float32 enlem (lat)
+    ...      w*n      category kodları   (w = başlık.code_width, 2 ya da 4 bayt)
+    ...      w*n      city kodları
+    ...      w*n      district kodları
+    ...      n        is_unesco (uint8: 0/1)
+
+Tüm sayılar little-endian. Kodlar başlıktaki "dictionaries" listelerine indekstir;
+en büyük değer (0xFFFF / 0xFFFFFFFF) NULL anlamına gelir. İsimler (name_tr)
+başlıkta düz bir dizi olarak taşınır.
+"""
+import json
+import uuid
+from typing import Optional, Sequence
+
+import numpy as np
+
+COLUMNAR_MEDIA_TYPE = "application/vnd.heritage.columnar"
+MAGIC = b"HSC1"
+DICTIONARY_COLUMNS = ("category", "city", "district")
+
+
+def dictionary_encode(values: Sequence[Optional[str]]) -> tuple[list[int], list[str]]:
+    """Değerleri ilk görülme sırasıyla kodlar: (kodlar, sözlük); None -> -1."""
+    lookup: dict[str, int] = {}
+    codes = [-1 if v is None else lookup.setdefault(v, len(lookup)) for v in values]
+    return codes, list(lookup)
+
+
+def encode_columnar(rows: Sequence, precision: Optional[int] = None, next_cursor: Optional[str] = None) -> bytes:
+    """
+    rows: id, lon, lat, name_tr, category, city, district, is_unesco alanlı satırlar.
+    precision: koordinatlar bu kadar ondalık basamağa yuvarlanır (gzip'te daha iyi sıkışır).
+    """
+    n = len(rows)
+
+    encoded = {}
+    dictionaries = {}
+    for col in DICTIONARY_COLUMNS:
+        encoded[col], dictionaries[col] = dictionary_encode([getattr(r, col) for r in rows])
+
+    largest = max((len(d) for d in dictionaries.values()), default=0)
+    code_width = 2 if largest < 0xFFFF else 4
+    code_dtype = "<u2" if code_width == 2 else "<u4"
+    null_code = np.iinfo(code_dtype).max
+
+    lon = np.fromiter((r.lon for r in rows), dtype="<f8", count=n)
+    lat = np.fromiter((r.lat for r in rows), dtype="<f8", count=n)
+    if precision is not None:
+        lon = np.round(lon, precision)
+        lat = np.round(lat, precision)
+
+    header = json.dumps({
+        "count": n,
+        "precision": precision,
+        "code_width": code_width,
+        "dictionaries": dictionaries,
+        "name_tr": [r.name_tr for r in rows],
+        "next_cursor": next_cursor,
+    }, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    # Sonraki diziler 4 bayt hizalı başlasın (istemcide Float32Array için)
+    header += b" " * (-(len(MAGIC) + 4 + len(header)) % 4)
+
+    parts = [
+        MAGIC,
+        np.uint32(len(header)).astype("<u4").tobytes(),
+        header,
+        b"".join(uuid.UUID(str(r.id)).bytes for r in rows),
+        lon.astype("<f4").tobytes(),
+        lat.astype("<f4").tobytes(),
+    ]
+    for col in DICTIONARY_COLUMNS:
+        codes = np.asarray(encoded[col], dtype=np.int64)
+        codes[codes < 0] = null_code
+        parts.append(codes.astype(code_dtype).tobytes())
+    parts.append(np.fromiter((bool(r.is_unesco) for r in rows), dtype=np.uint8, count=n).tobytes())
+
+    return b"".join(parts)
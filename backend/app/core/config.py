@@ -4,4 +4,63 @@ class Settings(BaseSettings):
     DATABASE_URL: str
     JWT_SECRET: str = "change_me_now"
 
+    # Veritabanı: async (psycopg async + AsyncSession) ya da klasik senkron mod
+    DB_ASYNC: bool = True
+    # Bağlantı havuzu (sync ve async engine için aynı değerler)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    # psycopg (v3) sunucu tarafı prepared statement: aynı sorgu metni bu kadar
+    # çalıştıktan sonra hazırlanır (0 = ilk seferde, -1 = kapalı; pgbouncer
+    # transaction modu gibi oturum tutmayan havuzlarda kapatın).
+    # DB_PREPARED_MAX: bağlantı başına tutulan prepared statement sayısı.
+    DB_PREPARE_THRESHOLD: int = 1
+    DB_PREPARED_MAX: int = 256
+
+    # Okuma replikaları (virgülle ayrılmış URL'ler; boşsa tüm okumalar primary'de)
+    DATABASE_REPLICA_URLS: str = ""
+    # Replika sağlık kontrolü aralığı ve kabul edilen en fazla replikasyon gecikmesi
+    REPLICA_CHECK_INTERVAL: float = 5
+    REPLICA_MAX_LAG: float = 30
+    # Bu sürede bağlanamayan replika sağlıksız sayılır
+    REPLICA_CONNECT_TIMEOUT: int = 3
+
+    # Sorgu sonucu önbelleği (süreç içi) ve HTTP önbellek başlıkları
+    RESULT_CACHE_MAX_ENTRIES: int = 512
+    RESULT_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    RESULT_CACHE_TTL: float = 300
+    # dataset_version tablosunun en fazla kaç saniyede bir okunacağı
+    DATASET_VERSION_TTL: float = 5
+    HTTP_CACHE_MAX_AGE: int = 30
+
+    # Bellek içi site indeksi (app/core/memory_index.py): hangi endpoint'lerin
+    # Postgres yerine süreç içindeki kopyadan cevaplanacağı, virgülle ayrılmış
+    # (list_sites, nearby; boşsa indeks hiç yüklenmez). Kopya dataset_changed
+    # NOTIFY'ı ya da en geç MEMORY_INDEX_POLL_INTERVAL saniyelik sürüm
+    # kontrolüyle tazelenir.
+    MEMORY_INDEX_ENDPOINTS: str = ""
+    MEMORY_INDEX_POLL_INTERVAL: float = 30
+
+    # Vector tile önbelleği (0 = kapalı)
+    TILE_CACHE_DIR: str = ".cache/tiles"
+    TILE_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+
+    # Parola hash'leme (argon2). Değerler değişirse eski hash'ler login'de
+    # yeni parametrelerle yeniden hesaplanır.
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536  # KiB
+    ARGON2_PARALLELISM: int = 4
+    # Hash'leme kendi thread havuzunda: login patlaması sites isteklerini aç bırakmasın
+    HASH_WORKERS: int = 2
+    # Kuyrukta + çalışan en fazla iş; aşılırsa 503 + Retry-After
+    HASH_MAX_PENDING: int = 16
+    HASH_RETRY_AFTER: int = 1
+
+    # Doğrulanmış JWT payload önbelleği (token'ın exp anında düşer)
+    TOKEN_CACHE_MAX_ENTRIES: int = 10_000
+
+    # /metrics endpoint'i ve istek/DB metrikleri
+    METRICS_ENABLED: bool = True
+
 settings = Settings()
@@ -0,0 +1,80 @@
+import asyncio
+import time
+
+from sqlalchemy import text
+
+from app.core.tile_cache import TileCache
+
+# Importer sürümü artırdığında NOTIFY gönderilen kanal
+DATASET_CHANNEL = "dataset_changed"
+
+# /facets'in okuduğu materialized view (bkz. f2c6d9a4b8e1 migration'ı)
+FACETS_VIEW = "cultural_sites_facets"
+
+
+def mark_dataset_changed(conn, tile_cache_dir: str) -> int:
+    """
+    Importer cultural_sites'a yazdıktan sonra çağrılır (senkron Connection):
+    facet özetini tazeler, dataset sürümünü artırır, dinleyenlere NOTIFY
+    gönderir ve tile önbelleğini geçersiz kılar. Yeni sürümü döner.
+    """
+    # Sürüm artmadan önce: yeni sürümle önbelleğe eski sayımlar girmesin.
+    # CONCURRENTLY okuyucuları bloklamaz.
+    conn.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {FACETS_VIEW}"))
+    version = conn.execute(text("""
+        UPDATE dataset_version
+        SET version = version + 1, updated_at = now()
+        WHERE id = 1
+        RETURNING version
+    """)).scalar()
+    conn.execute(text("SELECT pg_notify(:channel, :version)"), {
+        "channel": DATASET_CHANNEL, "version": str(version),
+    })
+    conn.commit()
+
+    TileCache(tile_cache_dir).invalidate()
+    return version
+
+
+class DatasetVersion:
+    """
+    API tarafında dataset sürümünü en fazla ttl saniyede bir okur.
+    Sürüm değişince kayıtlı callback'ler çağrılır (ör. önbellek temizliği).
+    """
+
+    def __init__(self, ttl: float = 5):
+        self.ttl = ttl
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+        self._listeners = []
+
+    def on_change(self, callback) -> None:
+        self._listeners.append(callback)
+
+    @property
+    def current(self):
+        """Son okunan sürüm (henüz okunmadıysa None); veritabanına gitmez."""
+        return self._version
+
+    async def get(self, db, fresh: bool = False) -> int:
+        """fresh=True: TTL beklenmeden okunur (read-your-writes isteklerinde primary'den)."""
+        if not fresh and self._version is not None and time.monotonic() - self._checked_at < self.ttl:
+            return self._version
+        async with self._lock:
+            if not fresh and self._version is not None and time.monotonic() - self._checked_at < self.ttl:
+                return self._version
+            version = (await db.execute(text("SELECT version FROM dataset_version WHERE id = 1"))).scalar() or 0
+            # Okuma replikalardan geldiğinde geride kalan bir replika sürümü
+            # geri almasın (önbellek boşuna temizlenirdi); sürüm sadece artar.
+            version = max(version, self._version or 0)
+            self.set(version)
+            return version
+
+    def set(self, version: int) -> None:
+        changed = self._version is not None and version != self._version
+        self._version = version
+        self._checked_at = time.monotonic()
+        if changed:
+            for callback in self._listeners:
+                callback(version)
@@ -0,0 +1,418 @@
+"""
+Bellek içi site indeksi: cultural_sites'ın süreç içindeki salt okunur kopyası.
+
+Veri seti belleğe rahat sığdığı için bbox / eşitlik filtresi / en yakın k
+site sorguları Postgres'e gitmeden buradan cevaplanabilir. Hangi
+endpoint'lerin kullanacağı MEMORY_INDEX_ENDPOINTS ile seçilir; kapsanmayan
+istekler (arama, kopyada olmayan fields alanları, akış biçimleri,
+X-Consistency: primary, kopyanın sürümü geride) her zaman PostGIS'e gider.
+
+Kopya (SiteSnapshot) değişmez; tazeleme yeni bir kopya kurup referansı
+değiştirir. Yapı:
+
+- Satırlar id sırasında (keyset sayfalama için satır no = id sırası)
+- lon / lat: float64 NumPy dizileri (geom NULL ise NaN)
+- category / city / district: sözlük kodlu int32 (-1 = NULL)
+- is_unesco: int8 (-1 = NULL); diğer metin kolonları object dizisi
+- Izgara indeksi: satır numaraları hücreye göre sıralı tek bir dizide,
+  hücre başlangıçları ayrı bir ofset dizisinde. Bir bbox'ın her ızgara
+  satırı bu dizide tek bir dilimdir.
+
+Yanıtlar list_sites / nearby'ın PostGIS çıktısıyla aynı biçimdedir; JSON
+parçaları (kolon değerleri) yüklemede bir kez kodlanır.
+
+Tazeleme: importer'ın gönderdiği dataset_changed NOTIFY'ı (LISTEN) ya da en
+geç MEMORY_INDEX_POLL_INTERVAL saniyede bir dataset_version kontrolü.
+"""
+import asyncio
+import json
+import math
+import time
+from collections import namedtuple
+from json.encoder import encode_basestring
+from typing import Optional
+
+import numpy as np
+import psycopg
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from starlette.concurrency import run_in_threadpool
+
+from app.core import metrics
+from app.core.columnar import dictionary_encode
+from app.core.config import settings
+from app.core.dataset import DATASET_CHANNEL
+from app.db.session import open_db
+
+# Bellek indeksinin cevaplayabildiği endpoint'ler
+ENDPOINTS = ("list_sites", "nearby")
+
+CODED_COLUMNS = ("category", "city", "district")
+TEXT_COLUMNS = ("name_tr", "name_en", "sub_category", "main_image_url", "summary_tr")
+# Kopyada bulunan properties alanları (routes/sites.py LIST_COLUMNS + is_unesco)
+COLUMNS = ("id",) + TEXT_COLUMNS + CODED_COLUMNS + ("is_unesco",)
+# Eşitlik filtresi olarak desteklenenler (bkz. SiteFilters)
+EQUALS_FILTERS = CODED_COLUMNS + ("is_unesco",)
+
+# Izgara: hücre başına ortalama nokta sayısı hedefi ve hücre sayısı üst sınırı
+GRID_POINTS_PER_CELL = 16
+GRID_MAX_CELLS = 1 << 22
+# Bbox adayları kopyanın bu oranını aşarsa ızgara yerine tüm diziler taranır
+# (sonuç zaten id sırasında gelir, sıralama gerekmez)
+GRID_SCAN_RATIO = 0.25
+# Hazır geometri metinlerinin ondalık basamağı (ST_AsGeoJSON varsayılanı)
+GEOMETRY_DECIMALS = 9
+
+EARTH_RADIUS_M = 6_371_008.8
+
+VERSION_SQL = text("SELECT version FROM dataset_version WHERE id = 1")
+LOAD_SQL = text(f"""
+    SELECT id::text AS id, ST_X(geom) AS lon, ST_Y(geom) AS lat,
+           {", ".join(TEXT_COLUMNS + CODED_COLUMNS)}, is_unesco
+    FROM cultural_sites
+    ORDER BY id
+""")
+
+# encode_columnar'ın beklediği satır biçimi
+ColumnarRow = namedtuple("ColumnarRow", "id lon lat name_tr category city district is_unesco")
+
+
+def haversine_m(lon: float, lat: float, lons: np.ndarray, lats: np.ndarray) -> np.ndarray:
+    """Tek noktadan dizilere küresel mesafe (metre)."""
+    phi, lam = math.radians(lat), math.radians(lon)
+    phis, lams = np.radians(lats), np.radians(lons)
+    a = np.sin((phis - phi) / 2) ** 2 + math.cos(phi) * np.cos(phis) * np.sin((lams - lam) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class SiteSnapshot:
+    """Belirli bir dataset sürümündeki sitelerin değişmez, sütun bazlı kopyası."""
+
+    def __init__(self, rows, version: int):
+        self.version = version
+        self.loaded_at = time.time()
+        n = self.size = len(rows)
+
+        self.ids = np.array([r.id for r in rows], dtype="U36")
+        self.lon = np.fromiter((np.nan if r.lon is None else r.lon for r in rows), dtype=np.float64, count=n)
+        self.lat = np.fromiter((np.nan if r.lat is None else r.lat for r in rows), dtype=np.float64, count=n)
+
+        self.codes: dict[str, np.ndarray] = {}
+        self.lookup: dict[str, dict] = {}
+        # JSON kodlanmış değerler: kodlu kolonlarda sözlük başına, diğerlerinde satır başına
+        self.fragments: dict[str, np.ndarray] = {}
+        for col in CODED_COLUMNS:
+            codes, values = dictionary_encode([getattr(r, col) for r in rows])
+            self.codes[col] = np.asarray(codes, dtype=np.int32).reshape(n)
+            self.lookup[col] = {v: i for i, v in enumerate(values)}
+            # Son eleman NULL (-1 kodu) için
+            self.fragments[col] = np.array([_json(v) for v in values] + ["null"], dtype=object)
+
+        self.codes["is_unesco"] = np.fromiter(
+            (-1 if r.is_unesco is None else int(r.is_unesco) for r in rows), dtype=np.int8, count=n,
+        )
+        self.lookup["is_unesco"] = {False: 0, True: 1}
+        self.fragments["is_unesco"] = np.array(["false", "true", "null"], dtype=object)
+
+        for col in ("id",) + TEXT_COLUMNS:
+            self.fragments[col] = np.array([_json(getattr(r, col)) for r in rows], dtype=object)
+        # precision -> satır başına hazır geometri metni (ilk kullanımda kurulur)
+        self._geometry: dict[int, np.ndarray] = {}
+        self.geometry(GEOMETRY_DECIMALS)
+        # format=columnar isimleri ham metin olarak taşır
+        self.name_tr = np.array([r.name_tr for r in rows], dtype=object)
+
+        self._build_grid()
+
+    # -----------------------------
+    # Izgara indeksi
+    # -----------------------------
+    def _build_grid(self) -> None:
+        located = np.flatnonzero(~np.isnan(self.lon) & ~np.isnan(self.lat))
+        if len(located) == 0:
+            self.cell_size, self.lon0, self.lat0, self.nx, self.ny = 1.0, 0.0, 0.0, 1, 1
+            self.cell_rows = np.empty(0, dtype=np.int64)
+            self.cell_start = np.zeros(2, dtype=np.int64)
+            return
+
+        lon, lat = self.lon[located], self.lat[located]
+        self.lon0, self.lat0 = float(lon.min()), float(lat.min())
+        width = max(float(lon.max()) - self.lon0, 1e-6)
+        height = max(float(lat.max()) - self.lat0, 1e-6)
+        cells = min(max(len(located) / GRID_POINTS_PER_CELL, 1), GRID_MAX_CELLS)
+        self.cell_size = math.sqrt(width * height / cells)
+        self.nx = int(width / self.cell_size) + 1
+        self.ny = int(height / self.cell_size) + 1
+
+        cx = ((lon - self.lon0) / self.cell_size).astype(np.int64)
+        cy = ((lat - self.lat0) / self.cell_size).astype(np.int64)
+        cell = cy * self.nx + cx
+        order = np.argsort(cell, kind="stable")
+        self.cell_rows = located[order]
+        self.cell_start = np.searchsorted(cell[order], np.arange(self.nx * self.ny + 1))
+
+    def bbox_rows(self, min_lon: float, min_lat: float, max_lon: float, max_lat: float) -> np.ndarray:
+        """Bbox içindeki (kenarlar dahil, geom && envelope gibi) satırlar, id sırasında."""
+        c0 = max(int(math.floor((min_lon - self.lon0) / self.cell_size)), 0)
+        c1 = min(int(math.floor((max_lon - self.lon0) / self.cell_size)), self.nx - 1)
+        r0 = max(int(math.floor((min_lat - self.lat0) / self.cell_size)), 0)
+        r1 = min(int(math.floor((max_lat - self.lat0) / self.cell_size)), self.ny - 1)
+        if c0 > c1 or r0 > r1:
+            return np.empty(0, dtype=np.int64)
+
+        starts = self.cell_start[np.arange(r0, r1 + 1) * self.nx + c0]
+        ends = self.cell_start[np.arange(r0, r1 + 1) * self.nx + c1 + 1]
+        if (ends - starts).sum() > self.size * GRID_SCAN_RATIO:
+            lon, lat = self.lon, self.lat
+            return np.flatnonzero((lon >= min_lon) & (lon <= max_lon) & (lat >= min_lat) & (lat <= max_lat))
+
+        rows = np.concatenate([self.cell_rows[s:e] for s, e in zip(starts, ends)])
+        lon, lat = self.lon[rows], self.lat[rows]
+        rows = rows[(lon >= min_lon) & (lon <= max_lon) & (lat >= min_lat) & (lat <= max_lat)]
+        return np.sort(rows)
+
+    # -----------------------------
+    # Sorgular
+    # -----------------------------
+    def match(self, rows: Optional[np.ndarray], equals: dict) -> np.ndarray:
+        """Eşitlik filtreleri (city, district, category, is_unesco). rows None ise tüm satırlar."""
+        if rows is None:
+            rows = np.arange(self.size)
+        for col, value in equals.items():
+            code = self.lookup[col].get(value)
+            if code is None:
+                return np.empty(0, dtype=np.int64)
+            rows = rows[self.codes[col][rows] == code]
+        return rows
+
+    def page(
+        self, bbox: Optional[tuple], equals: dict, after_id: Optional[str], limit: Optional[int],
+    ) -> np.ndarray:
+        """list_sites'ın sayfa sorgusu: filtre + "id > after_id" + ORDER BY id LIMIT."""
+        rows = self.bbox_rows(*bbox) if bbox is not None else None
+        rows = self.match(rows, equals)
+        if after_id is not None:
+            rows = rows[rows >= np.searchsorted(self.ids, after_id, side="right")]
+        return rows[:limit] if limit is not None else rows
+
+    def nearest(
+        self, lon: float, lat: float, k: int, radius_m: Optional[float], equals: dict,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        En yakın k satır ve mesafeleri (metre, artan). Arama yarıçapı k sonuç
+        bulunana kadar ikiye katlanır; yarıçap içindeki her nokta o yarıçapın
+        bbox'ındadır, yani sonuç kesindir.
+        """
+        if radius_m is not None:
+            r = radius_m
+        else:
+            # Nokta verinin kapsamı dışındaysa aramaya kapsamın kenarından başla
+            gap = haversine_m(
+                lon, lat,
+                np.array([min(max(lon, self.lon0), self.lon0 + self.nx * self.cell_size)]),
+                np.array([min(max(lat, self.lat0), self.lat0 + self.ny * self.cell_size)]),
+            )[0]
+            r = gap + math.radians(self.cell_size) * EARTH_RADIUS_M
+        while True:
+            dlat = math.degrees(r / EARTH_RADIUS_M)
+            edge = min(abs(lat) + dlat, 90.0)
+            coslat = math.cos(math.radians(edge))
+            dlon = 180.0 if coslat < 1e-6 else min(dlat / coslat, 180.0)
+            rows = self.match(self.bbox_rows(lon - dlon, lat - dlat, lon + dlon, lat + dlat), equals)
+            dist = haversine_m(lon, lat, self.lon[rows], self.lat[rows])
+            inside = dist <= r
+            whole_world = r >= math.pi * EARTH_RADIUS_M
+            if radius_m is not None or inside.sum() >= k or whole_world:
+                break
+            r *= 2
+
+        rows, dist = rows[inside], dist[inside]
+        if len(rows) > k:
+            top = np.argpartition(dist, k - 1)[:k]
+            rows, dist = rows[top], dist[top]
+        order = np.lexsort((rows, dist))
+        return rows[order], dist[order]
+
+    # -----------------------------
+    # Çıktı
+    # -----------------------------
+    def features_json(
+        self, rows: np.ndarray, columns: tuple[str, ...], precision: Optional[int] = None,
+        extra: Optional[dict[str, np.ndarray]] = None,
+    ) -> str:
+        """
+        Virgülle ayrılmış GeoJSON Feature'lar (PostGIS _feature_sql çıktısının
+        karşılığı). precision verilmezse GEOMETRY_DECIMALS.
+        """
+        if len(rows) == 0:
+            return ""
+        geometries = self.geometry(GEOMETRY_DECIMALS if precision is None else min(precision, GEOMETRY_DECIMALS))[rows]
+
+        values = []
+        for col in columns:
+            fragments = self.fragments[col]
+            values.append(fragments[self.codes[col][rows]] if col in self.codes else fragments[rows])
+        for col, array in (extra or {}).items():
+            columns = columns + (col,)
+            values.append([_json(v) for v in array.tolist()])
+
+        template = (
+            '{"type":"Feature","geometry":%s,"properties":{'
+            + ",".join(f'"{c}":%s' for c in columns) + "}}"
+        )
+        return ",".join([template % row for row in zip(geometries, *values)])
+
+    def geometry(self, precision: int) -> np.ndarray:
+        cached = self._geometry.get(precision)
+        if cached is None:
+            cached = self._geometry[precision] = np.array(_geometries(self.lon, self.lat, precision), dtype=object)
+        return cached
+
+    def columnar_rows(self, rows: np.ndarray) -> list[ColumnarRow]:
+        def decode(col):
+            values = list(self.lookup[col])
+            return [None if c < 0 else values[c] for c in self.codes[col][rows].tolist()]
+
+        unesco = [None if u < 0 else bool(u) for u in self.codes["is_unesco"][rows].tolist()]
+        return [
+            ColumnarRow(*r) for r in zip(
+                self.ids[rows].tolist(), self.lon[rows].tolist(), self.lat[rows].tolist(),
+                self.name_tr[rows].tolist(),
+                decode("category"), decode("city"), decode("district"), unesco,
+            )
+        ]
+
+
+def _json(value) -> str:
+    # Metinler için json.dumps'tan birkaç kat hızlı (yükleme süresinin çoğu burada)
+    if value is None:
+        return "null"
+    if isinstance(value, str):
+        return encode_basestring(value)
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+def _coordinates(values: np.ndarray, precision: int) -> list[str]:
+    """ST_AsGeoJSON gibi: sabit ondalık, sondaki sıfırlar ve nokta atılır (29.0 -> 29, -0 -> 0)."""
+    fmt = "%%.%df" % precision
+    out = [fmt % v for v in values.tolist()]
+    if precision > 0:
+        out = [v.rstrip("0").rstrip(".") for v in out]
+    return ["0" if v == "-0" else v for v in out]
+
+
+def _geometries(lon: np.ndarray, lat: np.ndarray, precision: int) -> list[str]:
+    return [
+        "null" if x == "nan" else '{"type":"Point","coordinates":[%s,%s]}' % (x, y)
+        for x, y in zip(_coordinates(lon, precision), _coordinates(lat, precision))
+    ]
+
+
+class MemoryIndex:
+    """
+    Güncel SiteSnapshot'ı tutar ve tazeler. Endpoint'ler snapshot_for() ile
+    kopyayı ister; kopya yoksa ya da sürümü istenenle aynı değilse None döner
+    ve istek PostGIS'e gider (önbellekte yeni sürüm anahtarı altına eski
+    veri yazılmasın).
+    """
+
+    def __init__(self, endpoints: list[str]):
+        unknown = set(endpoints) - set(ENDPOINTS)
+        if unknown:
+            raise ValueError(f"MEMORY_INDEX_ENDPOINTS: bilinmeyen endpoint(ler): {', '.join(sorted(unknown))}")
+        self.endpoints = frozenset(endpoints)
+        self.snapshot: Optional[SiteSnapshot] = None
+        self.last_error: Optional[str] = None
+        self._wake = asyncio.Event()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.endpoints)
+
+    def snapshot_for(self, endpoint: str, version: Optional[int]) -> Optional[SiteSnapshot]:
+        if endpoint not in self.endpoints:
+            return None
+        snapshot = self.snapshot
+        if snapshot is None or snapshot.version != version:
+            metrics.memory_index_requests.inc(endpoint, "postgis")
+            return None
+        metrics.memory_index_requests.inc(endpoint, "memory")
+        return snapshot
+
+    def wake(self, _version=None) -> None:
+        """Sürüm değişikliği görüldü (NOTIFY ya da DatasetVersion): hemen tazele."""
+        self._wake.set()
+
+    async def refresh(self) -> bool:
+        """Veritabanındaki sürüm kopyadan yeniyse yeniden yükler; yüklediyse True."""
+        async with open_db(read_only=True) as db:
+            # Sürüm satırlardan önce okunur: arada bir import biterse kopya
+            # eski sürüm etiketiyle yeni veriyi taşır, bir sonraki kontrolde
+            # tekrar yüklenir (tersi, yeni etiketle eski veri, olmaz).
+            version = (await db.execute(VERSION_SQL)).scalar() or 0
+            if self.snapshot is not None and self.snapshot.version >= version:
+                return False
+            rows = (await db.execute(LOAD_SQL)).all()
+        self.snapshot = await run_in_threadpool(SiteSnapshot, rows, version)
+        return True
+
+    async def run(self, interval: float) -> None:
+        while True:
+            self._wake.clear()
+            try:
+                await self.refresh()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e).splitlines()[0] if str(e) else type(e).__name__
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def listen(self, interval: float) -> None:
+        """dataset_changed kanalını dinler; bağlantı koparsa interval sonra yeniden bağlanır."""
+        conninfo = make_url(settings.DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(conninfo, autocommit=True) as conn:
+                    await conn.execute(f"LISTEN {DATASET_CHANNEL}")
+                    # Bağlantı yokken kaçmış olabilecek bir bildirim için
+                    self.wake()
+                    async for _notify in conn.notifies():
+                        self.wake()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Sürüm kontrolü (run) bu arada tazelemeye devam eder
+                await asyncio.sleep(interval)
+
+
+memory_index = MemoryIndex([e.strip() for e in settings.MEMORY_INDEX_ENDPOINTS.split(",") if e.strip()])
+
+
+def start_memory_index() -> list[asyncio.Task]:
+    """Lifespan'de çağrılır; MEMORY_INDEX_ENDPOINTS boşsa bir şey yapmaz."""
+    if not memory_index.enabled:
+        return []
+    interval = settings.MEMORY_INDEX_POLL_INTERVAL
+    return [
+        asyncio.create_task(memory_index.run(interval)),
+        asyncio.create_task(memory_index.listen(interval)),
+    ]
+
+
+def _index_state() -> dict[tuple, float]:
+    snapshot = memory_index.snapshot
+    if snapshot is None:
+        return {}
+    return {
+        ("rows",): snapshot.size,
+        ("version",): snapshot.version,
+        ("age_seconds",): time.time() - snapshot.loaded_at,
+    }
+
+
+metrics.registry.register(metrics.Gauge(
+    "memory_index_state", "Bellek içi site indeksinin satır sayısı, sürümü ve yaşı",
+    ("field",), callback=_index_state,
+))
@@ -0,0 +1,279 @@
+"""
+Süreç içi metrikler ve Prometheus metin biçimi (/metrics).
+
+Dış bağımlılık yok: Counter / Gauge / Histogram burada, etiketli ve thread-safe.
+HTTP tarafı MetricsMiddleware, veritabanı tarafı app/db/session.py'deki engine
+event'leri ve havuz sınıfları tarafından doldurulur.
+
+İstek başına DB süresi (http_request_db_seconds) toplam süreyle
+karşılaştırılarak yavaşlığın PostGIS'ten mi, serileştirmeden mi, yoksa havuz
+beklemesinden mi geldiği ayrılabilir.
+"""
+import bisect
+import contextvars
+import threading
+import time
+from typing import Callable, Optional
+
+# Saniye cinsinden gecikme kovaları (Prometheus varsayılanlarına yakın)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+ROW_BUCKETS = (1, 10, 100, 1000, 10000, 100000)
+
+# Eşleşmeyen yollar tek etikette toplanır (etiket sayısı patlamasın)
+UNMATCHED_ROUTE = "unmatched"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: Optional[tuple[str, str]] = None) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self.header() + [
+            f"{self.name}{_labels(self.labelnames, k)} {_number(v)}" for k, v in items
+        ]
+
+
+class Gauge(_Metric):
+    """Değer doğrudan tutulur ya da render anında callback ile okunur."""
+
+    type = "gauge"
+
+    def __init__(self, *args, callback: Optional[Callable[[], dict[tuple, float]]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: dict[tuple, float] = {}
+        self.callback = callback
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = dict(self._values)
+        if self.callback is not None:
+            items.update(self.callback())
+        return self.header() + [
+            f"{self.name}{_labels(self.labelnames, k)} {_number(v)}" for k, v in items.items()
+        ]
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, *args, buckets: tuple[float, ...] = LATENCY_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # etiketler -> [kova sayaçları..., +Inf], toplam
+        self._values: dict[tuple, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *labels) -> None:
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+            entry[0][i] += 1
+            entry[1][0] += value
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = [(k, list(counts), total[0]) for k, (counts, total) in self._values.items()]
+        lines = self.header()
+        for labels, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = ("le", _number(bound))
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+# -----------------------------
+# HTTP
+# -----------------------------
+http_requests = registry.register(Counter(
+    "http_requests_total", "HTTP istekleri (route şablonu ve durum koduna göre)",
+    ("method", "route", "status"),
+))
+http_latency = registry.register(Histogram(
+    "http_request_duration_seconds", "İstek süresi (yanıt gövdesinin tamamı gönderilene kadar)",
+    ("method", "route"),
+))
+http_db_time = registry.register(Histogram(
+    "http_request_db_seconds", "İstek başına toplam veritabanı süresi (havuz beklemesi dahil)",
+    ("method", "route"),
+))
+http_response_size = registry.register(Histogram(
+    "http_response_size_bytes", "Yanıt gövdesi boyutu",
+    ("method", "route"), buckets=SIZE_BUCKETS,
+))
+http_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "Şu an işlenen istek sayısı",
+))
+
+# -----------------------------
+# Veritabanı
+# -----------------------------
+db_statement_latency = registry.register(Histogram(
+    "db_statement_duration_seconds", "SQL statement süresi (cursor execute)",
+    ("route", "operation"),
+))
+db_statement_rows = registry.register(Histogram(
+    "db_statement_rows", "Statement başına dönen/etkilenen satır sayısı",
+    ("route", "operation"), buckets=ROW_BUCKETS,
+))
+db_statement_errors = registry.register(Counter(
+    "db_statement_errors_total", "Hata ile biten statement'lar",
+    ("route", "operation"),
+))
+db_pool_wait = registry.register(Histogram(
+    "db_pool_checkout_wait_seconds", "Havuzdan bağlantı alma beklemesi",
+    ("engine",),
+))
+db_pool_timeouts = registry.register(Counter(
+    "db_pool_checkout_timeouts_total", "pool_timeout içinde bağlantı alınamayan istekler",
+    ("engine",),
+))
+db_reads = registry.register(Counter(
+    "db_read_sessions_total", "Salt okunur oturumların yönlendirildiği hedef (replica-N, primary, primary-fallback)",
+    ("target",),
+))
+
+# -----------------------------
+# Bellek içi site indeksi
+# -----------------------------
+memory_index_requests = registry.register(Counter(
+    "memory_index_requests_total", "Bellek indeksi açık endpoint'lerde isteği cevaplayan motor (memory, postgis)",
+    ("endpoint", "engine"),
+))
+
+# -----------------------------
+# İstek bağlamı: DB event'leri hangi route'a ait olduğunu buradan okur
+# -----------------------------
+# {"scope": ASGI scope, "db_seconds": float}; threadpool'a kopyalanan context
+# aynı dict'i gösterdiği için sync modda da toplanır.
+request_context: contextvars.ContextVar[Optional[dict]] = contextvars.ContextVar("metrics_request", default=None)
+
+
+def route_template(scope: dict) -> str:
+    # FastAPI include_router prefix'li tam şablonu ayrı bir bağlamda tutar;
+    # scope["route"] ise router içindeki (prefix'siz) route'tur.
+    effective = scope.get("fastapi", {}).get("effective_route_context")
+    path = getattr(effective, "path_format", None) or getattr(scope.get("route"), "path", None)
+    return path or UNMATCHED_ROUTE
+
+
+def current_route() -> str:
+    ctx = request_context.get()
+    return route_template(ctx["scope"]) if ctx is not None else "-"
+
+
+def add_db_time(seconds: float) -> None:
+    ctx = request_context.get()
+    if ctx is not None:
+        ctx["db_seconds"] += seconds
+
+
+class MetricsMiddleware:
+    """
+    Saf ASGI middleware: route şablonu başına gecikme, durum kodu, yanıt
+    boyutu ve eşzamanlı istek sayısı. BaseHTTPMiddleware kullanılmaz; akış
+    (streaming) yanıtları tamponlanmaz ve süre son parçaya kadar ölçülür.
+    """
+
+    def __init__(self, app, exclude_paths: tuple[str, ...] = ("/metrics",)):
+        self.app = app
+        self.exclude_paths = exclude_paths
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        state = {"status": 500, "bytes": 0}
+        token = request_context.set({"scope": scope, "db_seconds": 0.0})
+        http_in_flight.inc()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                state["bytes"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_in_flight.dec()
+            ctx = request_context.get()
+            request_context.reset(token)
+
+            method = scope["method"]
+            route = route_template(scope)
+            http_requests.inc(method, route, str(state["status"]))
+            http_latency.observe(time.perf_counter() - started, method, route)
+            http_db_time.observe(ctx["db_seconds"], method, route)
+            http_response_size.observe(state["bytes"], method, route)
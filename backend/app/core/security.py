@@ -1,10 +1,23 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from typing import Optional
+
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__rounds=settings.ARGON2_TIME_COST,
+    argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+    argon2__parallelism=settings.ARGON2_PARALLELISM,
+)
 
 
 def hash_password(password: str) -> str:
@@ -13,13 +26,91 @@ def hash_password(password: str) -> str:
 def verify_password(password: str, password_hash: str) -> bool:
     return pwd_context.verify(password, password_hash)
 
+def verify_and_update_password(password: str, password_hash: str) -> tuple[bool, Optional[str]]:
+    """
+    Doğrular; hash eski argon2 parametreleriyle üretildiyse yenisini de döner
+    (login sırasında şeffaf yeniden hash'leme için).
+    """
+    return pwd_context.verify_and_update(password, password_hash)
+
+
+class HashingBusy(Exception):
+    """Hash kuyruğu dolu: istek 503 ile geri çevrilir."""
+
+
+class HashExecutor:
+    """
+    argon2 için ayrı ve sınırlı thread havuzu.
+
+    Paylaşılan request threadpool'u yerine burada çalışır; aynı anda en fazla
+    max_pending iş (çalışan + bekleyen) kabul edilir, fazlası HashingBusy alır.
+    argon2-cffi hash sırasında GIL'i bıraktığı için thread'ler gerçekten paralel çalışır.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="argon2")
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    async def run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HashingBusy()
+        future = self._executor.submit(fn, *args)
+        # İstek iptal edilse de slot iş bitince boşalır
+        future.add_done_callback(lambda _: self._slots.release())
+        return await asyncio.wrap_future(future)
+
+
+hash_executor = HashExecutor(settings.HASH_WORKERS, settings.HASH_MAX_PENDING)
+
+
+class TokenCache:
+    """
+    Doğrulanmış JWT payload'ları için LRU önbellek.
+    Kayıt token'ın exp zamanında düşer; süresi geçmiş token tekrar
+    jwt.decode'a gider ve orada reddedilir.
+    """
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[dict]:
+        with self._lock:
+            payload = self._data.get(token)
+            if payload is None:
+                return None
+            if time.time() >= payload["exp"]:
+                del self._data[token]
+                return None
+            self._data.move_to_end(token)
+            return payload
+
+    def put(self, token: str, payload: dict) -> None:
+        if "exp" not in payload or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._data[token] = payload
+            self._data.move_to_end(token)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+
+token_cache = TokenCache(settings.TOKEN_CACHE_MAX_ENTRIES)
+
+
 def create_access_token(user_id: str, role: str, minutes: int = 60) -> str:
     expire = datetime.utcnow() + timedelta(minutes=minutes)
     payload = {"sub": user_id, "role": role, "exp": expire}
     return jwt.encode(payload, settings.JWT_SECRET, algorithm="HS256")
 
 def decode_token(token: str) -> dict:
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
     try:
-        return jwt.decode(token, settings.JWT_SECRET, algorithms=["HS256"])
+        payload = jwt.decode(token, settings.JWT_SECRET, algorithms=["HS256"])
     except JWTError:
         raise ValueError("Invalid token")
+    token_cache.put(token, payload)
+    return payload
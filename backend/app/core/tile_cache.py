@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Optional
+
+
+class TileCache:
+    """
+    Vector tile'lar için disk tabanlı önbellek.
+
+    - Anahtar: z/x/y + filtre seti + nesil (generation) numarası
+    - Boyut aşılınca en eski erişilen dosyalar silinir (mtime ~ son erişim)
+    - invalidate() nesil dosyasını günceller; eski nesilden kalan karolar
+      bir daha okunmaz ve tahliye sırasında temizlenir
+
+    Importer ayrı bir süreç olduğu için durum sadece dosya sisteminde tutulur.
+    """
+
+    GENERATION_FILE = ".generation"
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def generation(self) -> int:
+        try:
+            return os.stat(os.path.join(self.directory, self.GENERATION_FILE)).st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    def key(self, z: int, x: int, y: int, filters: dict, generation: int) -> str:
+        raw = json.dumps([z, x, y, filters, generation], sort_keys=True, default=str)
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.mvt")
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        # LRU için erişim zamanını güncelle
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Yarım yazılmış dosya okunmasın diye önce geçici dosyaya yaz
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+
+        with self._lock:
+            # Aynı anahtar yeniden yazılıyorsa eski dosyanın boyutu düşülür
+            try:
+                replaced = os.stat(path).st_size
+            except OSError:
+                replaced = 0
+            os.replace(tmp, path)
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(data) - replaced
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def invalidate(self) -> None:
+        """Import sonrası çağrılır: tüm karoları geçersiz kılar."""
+        os.makedirs(self.directory, exist_ok=True)
+        marker = os.path.join(self.directory, self.GENERATION_FILE)
+        with open(marker, "w") as f:
+            f.write(str(time.time_ns()))
+
+        for entry in self._entries():
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+        with self._lock:
+            self._size = 0
+
+    def _entries(self):
+        if not os.path.isdir(self.directory):
+            return
+        for sub in os.scandir(self.directory):
+            if not sub.is_dir():
+                continue
+            for entry in os.scandir(sub.path):
+                if entry.name.endswith(".mvt"):
+                    yield entry
+
+    def _scan_size(self) -> int:
+        return sum(e.stat().st_size for e in self._entries())
+
+    def _evict(self) -> None:
+        # Limitin %80'ine inene kadar en eski dosyaları sil
+        entries = []
+        for e in self._entries():
+            try:
+                st = e.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, e.path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.8)
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+        self._size = total
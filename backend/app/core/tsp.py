@@ -0,0 +1,213 @@
+"""
+Çok duraklı tur sıralaması (gezgin satıcı problemi, sezgisel).
+
+Mesafeler büyük daire (haversine) üzerinden ve NumPy ile tek seferde
+matris olarak hesaplanır; yol ağı kullanılmaz. Çözüm:
+
+1. En yakın komşu ile başlangıç turu
+2. 2-opt: iki kenarı çaprazlayıp aradaki parçayı ters çevirme
+3. Or-opt: 1-3 duraklık bir parçayı (gerekirse ters) başka bir kenara taşıma
+
+2-opt ve Or-opt adımlarında bir durağın tüm aday hamleleri vektör olarak
+değerlendirilir. İyileşme bitene ya da zaman bütçesi dolana kadar sürer.
+
+Açık tur (başlangıca dönmeyen) için sanal bir düğüm eklenir: başlangıca
+mesafesi 0, diğer tüm düğümlere sabit ve çok büyük. Her kapalı turda tam bir
+pahalı kenar bulunur; sanal düğüm başlangıcın yanında kalır ve diğer komşusu
+yolun serbest son durağı olur.
+"""
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+EARTH_RADIUS_M = 6_371_008.8
+# Kayan nokta gürültüsüyle sonsuz döngüye girmemek için en küçük kazanç (metre)
+MIN_GAIN_M = 1e-6
+OR_OPT_SEGMENTS = (1, 2, 3)
+
+
+@dataclass
+class TourResult:
+    order: list[int]       # giriş noktalarının ziyaret sırası (0 = başlangıç)
+    legs_m: list[float]    # order[i-1] -> order[i] mesafesi (ilk eleman 0)
+    total_m: float
+    return_m: float        # return_to_start ise son duraktan başlangıca
+    initial_m: float       # en yakın komşu turunun uzunluğu
+    passes: int
+    elapsed_ms: float
+    timed_out: bool
+
+
+def haversine_matrix(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    """Derece cinsinden noktalar -> metre cinsinden simetrik mesafe matrisi."""
+    phi = np.radians(lat)[:, None]
+    lam = np.radians(lon)[:, None]
+    dphi = phi - phi.T
+    dlam = lam - lam.T
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi) * np.cos(phi.T) * np.sin(dlam / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def nearest_neighbour(dist: np.ndarray, start: int = 0) -> np.ndarray:
+    n = len(dist)
+    visited = np.zeros(n, dtype=bool)
+    order = np.empty(n, dtype=np.int64)
+    current = start
+    for i in range(n):
+        order[i] = current
+        visited[current] = True
+        if i == n - 1:
+            break
+        row = np.where(visited, np.inf, dist[current])
+        current = int(np.argmin(row))
+    return order
+
+
+def two_opt_pass(order: np.ndarray, dist: np.ndarray, deadline: float) -> tuple[bool, bool]:
+    """
+    Bir geçiş; (en az bir iyileştirme yapıldı mı, geçiş süre dolmadan
+    tamamlandı mı) döner.
+    """
+    n = len(order)
+    improved = False
+    for i in range(n - 2):
+        if time.perf_counter() > deadline:
+            return improved, False
+        a, b = order[i], order[i + 1]
+        j = np.arange(i + 2, n if i > 0 else n - 1)
+        if len(j) == 0:
+            continue
+        c = order[j]
+        d = order[(j + 1) % n]
+        delta = dist[a, c] + dist[b, d] - dist[a, b] - dist[c, d]
+        k = int(np.argmin(delta))
+        if delta[k] < -MIN_GAIN_M:
+            jj = j[k]
+            order[i + 1:jj + 1] = order[i + 1:jj + 1][::-1].copy()
+            improved = True
+    return improved, True
+
+
+def or_opt_pass(order: np.ndarray, dist: np.ndarray, deadline: float) -> tuple[bool, bool]:
+    """
+    1-3 duraklık parçaları en ucuz kenara taşır. order[0] (başlangıç) yerinde
+    kalır; parçalar 1..n-1 aralığından seçilir. Dönüş two_opt_pass ile aynı.
+    """
+    n = len(order)
+    improved = False
+    for seg_len in OR_OPT_SEGMENTS:
+        i = 1
+        while i + seg_len <= n:
+            if time.perf_counter() > deadline:
+                return improved, False
+            prev, first = order[i - 1], order[i]
+            last, nxt = order[i + seg_len - 1], order[(i + seg_len) % n]
+            removal_gain = dist[prev, first] + dist[last, nxt] - dist[prev, nxt]
+
+            # Parça çıkarıldıktan sonraki tur ve kenarları (u -> v)
+            rest = np.concatenate((order[:i], order[i + seg_len:]))
+            u = rest
+            v = np.roll(rest, -1)
+            forward = dist[u, first] + dist[last, v] - dist[u, v]
+            reverse = dist[u, last] + dist[first, v] - dist[u, v]
+            # Parçanın çıkarıldığı yer (prev -> nxt) aday değil
+            forward[i - 1] = reverse[i - 1] = np.inf
+
+            best_fwd, best_rev = int(np.argmin(forward)), int(np.argmin(reverse))
+            use_rev = reverse[best_rev] < forward[best_fwd]
+            k = best_rev if use_rev else best_fwd
+            cost = reverse[k] if use_rev else forward[k]
+
+            if cost - removal_gain < -MIN_GAIN_M:
+                segment = order[i:i + seg_len].copy()
+                if use_rev:
+                    segment = segment[::-1]
+                order[:] = np.concatenate((rest[:k + 1], segment, rest[k + 1:]))
+                improved = True
+            i += 1
+    return improved, True
+
+
+def _to_path(order: np.ndarray, dummy: Optional[int]) -> list[int]:
+    """Kapalı tur -> başlangıçla başlayan sıra; açık turda sanal düğüm atılır."""
+    order = np.roll(order, -int(np.where(order == 0)[0][0]))
+    if dummy is not None:
+        if order[1] == dummy:
+            order = np.concatenate(([0], order[1:][::-1]))
+        order = order[order != dummy]
+    return [int(k) for k in order]
+
+
+def _path_length(path: list[int], dist: np.ndarray, closed: bool) -> float:
+    total = float(dist[path[:-1], path[1:]].sum())
+    return total + float(dist[path[-1], path[0]]) if closed else total
+
+
+def solve(
+    lat: np.ndarray,
+    lon: np.ndarray,
+    return_to_start: bool = False,
+    time_budget_s: float = 0.3,
+    dist: Optional[np.ndarray] = None,
+) -> TourResult:
+    """
+    lat/lon[0] başlangıç noktasıdır ve turun başında kalır. return_to_start
+    False ise son durak serbesttir (açık tur).
+    """
+    started = time.perf_counter()
+    deadline = started + time_budget_s
+    n = len(lat)
+    if dist is None:
+        dist = haversine_matrix(np.asarray(lat, dtype=np.float64), np.asarray(lon, dtype=np.float64))
+
+    if n <= 2:
+        order = list(range(n))
+        legs = [0.0] + [float(dist[order[k - 1], order[k]]) for k in range(1, n)]
+        back = float(dist[order[-1], 0]) if return_to_start and n > 1 else 0.0
+        return TourResult(order, legs, sum(legs), back, sum(legs) + back, 0, 0.0, False)
+
+    work = dist
+    dummy = None
+    if not return_to_start:
+        dummy = n
+        far = float(dist.max()) * n + 1.0
+        work = np.full((n + 1, n + 1), far)
+        work[:n, :n] = dist
+        work[dummy, dummy] = 0.0
+        work[dummy, 0] = work[0, dummy] = 0.0
+
+    order = nearest_neighbour(work, 0)
+    initial = _path_length(_to_path(order, dummy), dist, return_to_start)
+
+    # Yerel optimuma ancak süre dolmadan tamamlanan ve hiç iyileştirme
+    # yapmayan bir geçişle ulaşılır; süre ondan önce dolduysa timed_out.
+    passes = 0
+    timed_out = False
+    while True:
+        passes += 1
+        improved, finished = two_opt_pass(order, work, deadline)
+        if finished:
+            moved, finished = or_opt_pass(order, work, deadline)
+            improved = improved or moved
+        if not finished:
+            timed_out = True
+            break
+        if not improved:
+            break
+
+    order = _to_path(order, dummy)
+    legs = [0.0] + [float(dist[order[k - 1], order[k]]) for k in range(1, n)]
+    back = float(dist[order[-1], 0]) if return_to_start else 0.0
+    total = sum(legs)
+    return TourResult(
+        order=order,
+        legs_m=legs,
+        total_m=total,
+        return_m=back,
+        initial_m=initial,
+        passes=passes,
+        elapsed_ms=(time.perf_counter() - started) * 1000,
+        timed_out=timed_out,
+    )
@@ -1,14 +1,419 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import asyncio
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Optional, Sequence
 
+from sqlalchemy import Row, create_engine, event, text
+from sqlalchemy.engine import Result, make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+
+from app.core import metrics
 from app.core.config import settings
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+
+class _TimedPoolMixin:
+    """Havuzdan bağlantı alma (checkout) beklemesini ölçer; havuz açlığı buradan görünür."""
+
+    metrics_name = "sync"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            metrics.db_pool_timeouts.inc(self.metrics_name)
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            metrics.db_pool_wait.observe(waited, self.metrics_name)
+            metrics.add_db_time(waited)
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    metrics_name = "sync"
+
+
+class TimedAsyncQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    metrics_name = "async"
+
+
+def _operation(statement: str) -> str:
+    word = statement.lstrip().split(None, 1)
+    return word[0].upper() if word else "-"
+
+
+def instrument_engine(sync_engine) -> None:
+    """
+    Her statement'ın süresini, dönen/etkilenen satır sayısını ve hatalarını
+    route etiketiyle kaydeder. Async engine için .sync_engine verilir.
+    """
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["metrics_started"].pop()
+        route, operation = metrics.current_route(), _operation(statement)
+        metrics.db_statement_latency.observe(elapsed, route, operation)
+        metrics.add_db_time(elapsed)
+        # Server-side cursor'da satır sayısı henüz bilinmez (-1)
+        if cursor.rowcount is not None and cursor.rowcount >= 0:
+            metrics.db_statement_rows.observe(cursor.rowcount, route, operation)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(context):
+        started = context.connection.info.get("metrics_started") if context.connection is not None else None
+        if started:
+            started.pop()
+        statement = context.statement or ""
+        metrics.db_statement_errors.inc(metrics.current_route(), _operation(statement))
+
+
+def driver_connect_args(url: str) -> dict:
+    """
+    psycopg (v3) için prepared statement eşiği. Route'lar sabit sorgu
+    metinleri kullandığı için (bkz. routes/sites.py) Postgres aynı
+    statement'ı tekrar parse/plan etmez; psycopg2 URL'lerinde etkisizdir.
+    """
+    if make_url(url).get_driver_name() != "psycopg":
+        return {}
+    threshold = settings.DB_PREPARE_THRESHOLD
+    return {"prepare_threshold": threshold if threshold >= 0 else None}
+
+
+def configure_prepared(sync_engine) -> None:
+    @event.listens_for(sync_engine, "connect")
+    def _connect(dbapi_connection, connection_record):
+        conn = getattr(dbapi_connection, "driver_connection", dbapi_connection)
+        if hasattr(conn, "prepared_max"):
+            conn.prepared_max = settings.DB_PREPARED_MAX
+
+
+POOL_OPTIONS = dict(
+    pool_pre_ping=True,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+)
+
+# Senkron engine: importer, script'ler ve DB_ASYNC=false modu
+engine = create_engine(
+    settings.DATABASE_URL, poolclass=TimedQueuePool,
+    connect_args=driver_connect_args(settings.DATABASE_URL), **POOL_OPTIONS,
+)
+instrument_engine(engine)
+configure_prepared(engine)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
-def get_db():
-    db = SessionLocal()
+
+def async_url(url: str) -> str:
+    """psycopg2/varsayılan sürücü URL'sini psycopg (v3, async destekli) sürücüsüne çevirir."""
+    u = make_url(url)
+    if u.drivername in ("postgresql", "postgresql+psycopg2"):
+        u = u.set(drivername="postgresql+psycopg")
+    return u.render_as_string(hide_password=False)
+
+
+# Async engine: DB_ASYNC=true iken API isteklerinin tamamı buradan geçer
+async_engine = (
+    create_async_engine(
+        async_url(settings.DATABASE_URL), poolclass=TimedAsyncQueuePool,
+        connect_args=driver_connect_args(async_url(settings.DATABASE_URL)), **POOL_OPTIONS,
+    )
+    if settings.DB_ASYNC else None
+)
+if async_engine is not None:
+    instrument_engine(async_engine.sync_engine)
+    configure_prepared(async_engine.sync_engine)
+AsyncSessionLocal = (
+    async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+    if async_engine is not None else None
+)
+
+
+def _is_connection_error(error: OperationalError) -> bool:
+    """Bağlanamama/kopma mı (08xxx, kapanan sunucu), yoksa sorgu hatası mı (ör. statement_timeout)."""
+    if error.connection_invalidated:
+        return True
+    sqlstate = getattr(error.orig, "sqlstate", None) or getattr(error.orig, "pgcode", None)
+    return sqlstate is None or sqlstate.startswith("08") or sqlstate in ("57P01", "57P02", "57P03")
+
+
+class DbSession:
+    """
+    Route'ların kullandığı tek oturum arayüzü.
+
+    - DB_ASYNC=true : AsyncSession (psycopg async); sorgu beklerken event loop serbest
+    - DB_ASYNC=false: klasik Session; her çağrı threadpool'da çalışır
+
+    execute() her iki modda da tamponlanmış bir Result döner
+    (.scalar(), .mappings().all() vb. aynı şekilde kullanılır).
+    """
+
+    def __init__(
+        self,
+        session: Session | AsyncSession,
+        fallback: Optional[Callable[[], Session | AsyncSession]] = None,
+        on_fallback: Optional[Callable[[Exception], None]] = None,
+    ):
+        self.session = session
+        self.is_async = isinstance(session, AsyncSession)
+        # Replika oturumlarında: ilk statement bağlantı hatası alırsa primary'ye geçilir
+        self._fallback = fallback
+        self._on_fallback = on_fallback
+
+    async def execute(self, statement, params: Optional[dict] = None) -> Result:
+        try:
+            result = await self._execute(statement, params)
+        except OperationalError as e:
+            if not await self._switch_to_fallback(e):
+                raise
+            result = await self._execute(statement, params)
+        self._fallback = None
+        return result
+
+    async def _execute(self, statement, params: Optional[dict]) -> Result:
+        if self.is_async:
+            return await self.session.execute(statement, params)
+        return await run_in_threadpool(self._execute_buffered, statement, params)
+
+    async def _switch_to_fallback(self, error: OperationalError) -> bool:
+        # Sadece oturumun ilk statement'ında: sonrasında aynı anlık görüntüyü
+        # paylaşmayan iki sunucudan okunmuş olurdu.
+        if self._fallback is None or not _is_connection_error(error):
+            return False
+        fallback, self._fallback = self._fallback, None
+        if self._on_fallback is not None:
+            self._on_fallback(error)
+        try:
+            await self.close()
+        except Exception:
+            pass
+        self.session = fallback()
+        self.is_async = isinstance(self.session, AsyncSession)
+        return True
+
+    def _execute_buffered(self, statement, params: Optional[dict]) -> Result:
+        # Satırlar thread içinde okunur; event loop'ta cursor'a dokunulmaz
+        result = self.session.execute(statement, params)
+        return result.freeze()() if result.returns_rows else result
+
+    async def commit(self) -> None:
+        if self.is_async:
+            await self.session.commit()
+        else:
+            await run_in_threadpool(self.session.commit)
+
+    async def rollback(self) -> None:
+        if self.is_async:
+            await self.session.rollback()
+        else:
+            await run_in_threadpool(self.session.rollback)
+
+    async def close(self) -> None:
+        if self.is_async:
+            await self.session.close()
+        else:
+            await run_in_threadpool(self.session.close)
+
+    async def stream(self, statement, params: Optional[dict] = None, chunk_size: int = 500) -> AsyncIterator[Sequence[Row]]:
+        """Server-side cursor ile chunk_size satırlık parçalar üretir."""
+        try:
+            result = await self._open_stream(statement, params, chunk_size)
+        except OperationalError as e:
+            if not await self._switch_to_fallback(e):
+                raise
+            result = await self._open_stream(statement, params, chunk_size)
+        self._fallback = None
+        if self.is_async:
+            async for chunk in result.partitions(chunk_size):
+                yield chunk
+        else:
+            async for chunk in iterate_in_threadpool(result.partitions(chunk_size)):
+                yield chunk
+
+    async def _open_stream(self, statement, params: Optional[dict], chunk_size: int):
+        if self.is_async:
+            return await self.session.stream(
+                statement, params, execution_options={"yield_per": chunk_size}
+            )
+        return await run_in_threadpool(
+            self.session.execute, statement, params,
+            execution_options={"stream_results": True, "yield_per": chunk_size},
+        )
+
+
+# -----------------------------
+# Okuma replikaları
+# -----------------------------
+# Replikasyon gecikmesi (sn). Replika WAL'ın tamamını uygulamışsa gecikme 0
+# sayılır; aksi halde son uygulanan transaction'ın yaşı. Primary'ye
+# yönlendirilmiş bir URL de (test için) 0 döner.
+REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+class Replica:
+    """Tek bir okuma replikası: kendi engine'i, havuzu ve sağlık durumu."""
+
+    def __init__(self, name: str, url: str):
+        self.name = name
+        self.url = url
+        # İlk kontrol gelene kadar iyimser: bağlantı hatasında zaten primary'ye düşülür
+        self.healthy = True
+        self.lag: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+        url = async_url(url) if settings.DB_ASYNC else url
+        connect_args = dict(driver_connect_args(url), connect_timeout=settings.REPLICA_CONNECT_TIMEOUT)
+        if settings.DB_ASYNC:
+            pool = type("ReplicaAsyncQueuePool", (TimedAsyncQueuePool,), {"metrics_name": name})
+            self.engine = create_async_engine(url, poolclass=pool, connect_args=connect_args, **POOL_OPTIONS)
+            self.session_factory = async_sessionmaker(bind=self.engine, autoflush=False, expire_on_commit=False)
+        else:
+            pool = type("ReplicaQueuePool", (TimedQueuePool,), {"metrics_name": name})
+            self.engine = create_engine(url, poolclass=pool, connect_args=connect_args, **POOL_OPTIONS)
+            self.session_factory = sessionmaker(bind=self.engine, autoflush=False, autocommit=False)
+        sync_engine = self.engine.sync_engine if settings.DB_ASYNC else self.engine
+        instrument_engine(sync_engine)
+        configure_prepared(sync_engine)
+
+    @property
+    def pool(self):
+        return self.engine.sync_engine.pool if settings.DB_ASYNC else self.engine.pool
+
+    def _lag_sync(self) -> float:
+        with self.engine.connect() as conn:
+            return conn.execute(REPLICA_LAG_SQL).scalar()
+
+    async def _lag(self) -> float:
+        if settings.DB_ASYNC:
+            async with self.engine.connect() as conn:
+                return (await conn.execute(REPLICA_LAG_SQL)).scalar()
+        return await run_in_threadpool(self._lag_sync)
+
+    async def check(self) -> None:
+        try:
+            lag = await asyncio.wait_for(self._lag(), timeout=settings.REPLICA_CONNECT_TIMEOUT * 2)
+        except Exception as e:
+            self.mark_failed(e)
+            return
+        self.lag = float(lag or 0)
+        self.healthy = self.lag <= settings.REPLICA_MAX_LAG
+        self.last_error = None if self.healthy else f"gecikme {self.lag:.1f} sn"
+
+    def mark_failed(self, error: Exception) -> None:
+        # Bir sonraki sağlık kontrolüne kadar trafik almaz
+        self.healthy = False
+        self.last_error = str(error).splitlines()[0] if str(error) else type(error).__name__
+
+
+class ReplicaSet:
+    """Sağlıklı replikalar arasında round-robin; hiçbiri yoksa None (primary kullanılır)."""
+
+    def __init__(self, urls: list[str]):
+        self.replicas = [Replica(f"replica-{i}", url) for i, url in enumerate(urls)]
+        self._counter = itertools.count()
+
+    def pick(self) -> Optional[Replica]:
+        healthy = [r for r in self.replicas if r.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._counter) % len(healthy)]
+
+    async def check_all(self) -> None:
+        await asyncio.gather(*(r.check() for r in self.replicas))
+
+    async def monitor(self, interval: float) -> None:
+        while True:
+            await self.check_all()
+            await asyncio.sleep(interval)
+
+
+replicas = ReplicaSet([u.strip() for u in settings.DATABASE_REPLICA_URLS.split(",") if u.strip()])
+
+
+def start_replica_monitor() -> Optional[asyncio.Task]:
+    """Lifespan'de çağrılır; replika yoksa bir şey yapmaz."""
+    if not replicas.replicas:
+        return None
+    return asyncio.create_task(replicas.monitor(settings.REPLICA_CHECK_INTERVAL))
+
+
+@asynccontextmanager
+async def open_db(read_only: bool = False) -> AsyncIterator[DbSession]:
+    """
+    read_only=True: sağlıklı bir replikadan okunur (yoksa primary). Replika
+    ilk statement'ta bağlantı hatası verirse oturum primary'ye geçer ve
+    replika bir sonraki sağlık kontrolüne kadar devre dışı kalır.
+    """
+    primary = AsyncSessionLocal if settings.DB_ASYNC else SessionLocal
+    replica = replicas.pick() if read_only else None
+    if replica is None:
+        if read_only:
+            metrics.db_reads.inc("primary")
+        db = DbSession(primary())
+    else:
+        metrics.db_reads.inc(replica.name)
+
+        def on_fallback(error: Exception) -> None:
+            replica.mark_failed(error)
+            metrics.db_reads.inc("primary-fallback")
+
+        db = DbSession(replica.session_factory(), fallback=primary, on_fallback=on_fallback)
     try:
         yield db
     finally:
-        db.close()
+        await db.close()
+
+
+def _pool_state() -> dict[tuple, float]:
+    """/metrics render anında havuz doluluğu."""
+    values = {}
+    pools = [("sync", engine.pool), ("async", async_engine.sync_engine.pool if async_engine else None)]
+    pools += [(r.name, r.pool) for r in replicas.replicas]
+    for name, pool in pools:
+        if pool is None:
+            continue
+        values[(name, "checked_out")] = pool.checkedout()
+        values[(name, "idle")] = pool.checkedin()
+        values[(name, "overflow")] = max(pool.overflow(), 0)
+        values[(name, "size")] = pool.size()
+    return values
+
+
+metrics.registry.register(metrics.Gauge(
+    "db_pool_connections", "Havuzdaki bağlantılar (durumuna göre)",
+    ("engine", "state"), callback=_pool_state,
+))
+
+
+def _replica_state() -> dict[tuple, float]:
+    return {(r.name,): 1 if r.healthy else 0 for r in replicas.replicas}
+
+
+def _replica_lag() -> dict[tuple, float]:
+    return {(r.name,): r.lag for r in replicas.replicas if r.lag is not None}
+
+
+metrics.registry.register(metrics.Gauge(
+    "db_replica_healthy", "Replika trafik alıyor mu (1/0)", ("replica",), callback=_replica_state,
+))
+metrics.registry.register(metrics.Gauge(
+    "db_replica_lag_seconds", "Son sağlık kontrolünde ölçülen replikasyon gecikmesi",
+    ("replica",), callback=_replica_lag,
+))
@@ -1,9 +1,30 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.routes.auth import router as auth_router
 from app.api.routes.sites import router as sites_router
+from app.api.routes.tours import router as tours_router
+from app.core.config import settings
+from app.core.memory_index import start_memory_index
+from app.core.metrics import MetricsMiddleware, registry
+from app.db.session import start_replica_monitor
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Okuma replikalarının sağlık/gecikme kontrolü (replika tanımlı değilse None)
+    monitor = start_replica_monitor()
+    # Bellek içi site indeksi: yükleme + tazeleme (MEMORY_INDEX_ENDPOINTS boşsa yok)
+    index_tasks = start_memory_index()
+    yield
+    if monitor is not None:
+        monitor.cancel()
+    for task in index_tasks:
+        task.cancel()
 
-app = FastAPI(title="Heritage API")
+
+app = FastAPI(title="Heritage API", lifespan=lifespan)
 
 # --- 1. ADIM: CORS AYARLARI (EN ÜSTTE OLMALI) ---
 # Frontend (localhost:5173) Backend'e (localhost:8000) istek atabilsin diye izin veriyoruz.
@@ -15,10 +36,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# --- Metrikler: en dışta, CORS dahil tüm süre ölçülsün ---
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # --- 2. ADIM: ROUTER TANIMLARI (CORS'TAN SONRA GELMELİ) ---
 app.include_router(auth_router, prefix="/api/auth", tags=["auth"])
 app.include_router(sites_router, prefix="/api/sites", tags=["sites"])
+app.include_router(tours_router, prefix="/api/tours", tags=["tours"])
 
 @app.get("/")
 def read_root():
-    return {"message": "Heritage API is running 🚀"}
\ No newline at end of file
+    return {"message": "Heritage API is running 🚀"}
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    # Prometheus metin biçimi (text exposition format 0.0.4)
+    if not settings.METRICS_ENABLED:
+        return Response(status_code=404)
+    return Response(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
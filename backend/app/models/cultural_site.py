@@ -1,6 +1,6 @@
 import uuid
-from sqlalchemy import String, Text, Boolean, Date, DateTime, func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import String, Text, Boolean, Date, DateTime, Computed, Index, func, text
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 from geoalchemy2 import Geometry
 from geoalchemy2.shape import to_shape
@@ -9,6 +9,29 @@ from app.db.base import Base
 
 class CulturalSite(Base):
     __tablename__ = "cultural_sites"
+    __table_args__ = (
+        # list_sites filtre kombinasyonları (bkz. b7e2c91d4a6f migration'ı)
+        Index("idx_cultural_sites_city_district_category", "city", "district", "category"),
+        Index("idx_cultural_sites_district", "district"),
+        Index("idx_cultural_sites_category_unesco", "category", "is_unesco"),
+        Index("idx_cultural_sites_unesco", "is_unesco", postgresql_where=text("is_unesco")),
+        # ILIKE '%x%' araması için trigram
+        Index(
+            "idx_cultural_sites_name_tr_trgm", "name_tr",
+            postgresql_using="gin", postgresql_ops={"name_tr": "gin_trgm_ops"},
+        ),
+        Index(
+            "idx_cultural_sites_name_en_trgm", "name_en",
+            postgresql_using="gin", postgresql_ops={"name_en": "gin_trgm_ops"},
+        ),
+        # /search ve /suggest (bkz. c3f8a2d19e47 migration'ı)
+        Index("idx_cultural_sites_search_tr", "search_tr", postgresql_using="gin"),
+        Index("idx_cultural_sites_search_en", "search_en", postgresql_using="gin"),
+        Index("idx_cultural_sites_name_tr_norm", "name_tr_norm"),
+        Index("idx_cultural_sites_name_en_norm", "name_en_norm"),
+        # Artımlı import tombstone'ları (bkz. e8b4f1c7a2d6 migration'ı)
+        Index("idx_cultural_sites_import_source", "import_source"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -44,9 +67,38 @@ class CulturalSite(Base):
     source_url: Mapped[str | None] = mapped_column(Text)
     last_update: Mapped[Date | None] = mapped_column(Date)
 
+    # Artımlı import: içerik hash'i (md5) ve satırın geldiği kaynak
+    content_hash: Mapped[str | None] = mapped_column(String(32))
+    import_source: Mapped[str | None] = mapped_column(String(255))
+
     # PostGIS Point(4326)
     geom: Mapped[str] = mapped_column(Geometry(geometry_type="POINT", srid=4326), nullable=False)
 
+    # Arama kolonları: Postgres tarafından hesaplanır (tr_fold/tr_lower SQL fonksiyonları)
+    name_tr_norm: Mapped[str | None] = mapped_column(
+        Text(collation="C"), Computed("tr_fold(name_tr)", persisted=True)
+    )
+    name_en_norm: Mapped[str | None] = mapped_column(
+        Text(collation="C"), Computed("tr_fold(name_en)", persisted=True)
+    )
+    search_tr: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('simple', coalesce(tr_fold(name_tr), '')), 'A') || "
+            "setweight(to_tsvector('turkish', coalesce(tr_lower(name_tr), '')), 'A') || "
+            "setweight(to_tsvector('turkish', coalesce(tr_lower(summary_tr), '')), 'B')",
+            persisted=True,
+        ),
+    )
+    search_en: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(name_en, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(summary_en, '')), 'B')",
+            persisted=True,
+        ),
+    )
+
     created_at: Mapped[DateTime] = mapped_column(DateTime, server_default=func.now())
     updated_at: Mapped[DateTime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
 
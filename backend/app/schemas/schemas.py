@@ -1,5 +1,6 @@
-from pydantic import BaseModel, UUID4
-from typing import Optional, List
+from pydantic import BaseModel, Field, UUID4, field_validator
+from typing import Literal, Optional, List, Tuple
+from uuid import UUID
 from datetime import date
 
 # API'den dönecek tekil site objesi
@@ -18,4 +19,37 @@ class CulturalSiteRead(BaseModel):
     longitude: float
 
     class Config:
-        from_attributes = True # ORM modunu aktif eder
\ No newline at end of file
+        from_attributes = True # ORM modunu aktif eder
+
+# POST /api/sites/batch gövdesi
+class SiteBatchIn(BaseModel):
+    # UUID4 değil: importer stabil id'leri uuid5 üretir
+    ids: List[UUID] = Field(..., min_length=1, max_length=200)
+    # Verilmezse detay alanlarının tamamı (get_site ile aynı)
+    fields: Optional[List[str]] = None
+    precision: Optional[int] = Field(None, ge=0, le=7)
+
+
+# POST /api/sites/along-route gövdesi: GeoJSON LineString, [lon, lat] sırası
+class RouteLineString(BaseModel):
+    type: Literal["LineString"] = "LineString"
+    coordinates: List[Tuple[float, float]] = Field(..., min_length=2, max_length=50000)
+
+    @field_validator("coordinates")
+    @classmethod
+    def check_range(cls, coords):
+        for lon, lat in coords:
+            if not (-180 <= lon <= 180 and -90 <= lat <= 90):
+                raise ValueError("coordinates must be [lon, lat] in WGS84")
+        return coords
+
+
+class SiteAlongRouteIn(BaseModel):
+    route: RouteLineString
+    # Rotaya en fazla uzaklık (metre)
+    buffer_m: float = Field(1000, gt=0, le=50000)
+    category: Optional[str] = None
+    is_unesco: Optional[bool] = None
+    limit: int = Field(500, ge=1, le=2000)
+    fields: Optional[List[str]] = None
+    precision: Optional[int] = Field(None, ge=0, le=7)
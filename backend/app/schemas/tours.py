@@ -0,0 +1,39 @@
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class TourPoint(BaseModel):
+    lat: float = Field(..., ge=-90, le=90)
+    lon: float = Field(..., ge=-180, le=180)
+
+
+class TourOptimizeIn(BaseModel):
+    start: TourPoint
+    site_ids: List[UUID] = Field(..., min_length=1, max_length=500)
+    # False: son durakta biter (açık tur); True: başlangıca döner
+    return_to_start: bool = False
+    # Sezgisel iyileştirme için süre sınırı
+    time_budget_ms: int = Field(300, ge=10, le=2000)
+
+
+class TourStop(BaseModel):
+    id: str
+    name_tr: Optional[str] = None
+    category: Optional[str] = None
+    lat: float
+    lon: float
+    leg_m: float           # önceki duraktan (ilk durak için başlangıçtan) mesafe
+    cumulative_m: float
+
+
+class TourOptimizeOut(BaseModel):
+    stops: List[TourStop]
+    total_m: float         # return_to_start ise dönüş dahil
+    return_leg_m: float
+    missing: List[str]     # bulunamayan site id'leri
+    initial_m: float       # en yakın komşu turu (iyileştirme öncesi)
+    passes: int
+    elapsed_ms: float
+    timed_out: bool
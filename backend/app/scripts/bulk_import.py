@@ -0,0 +1,426 @@
+"""
+Toplu (bulk) import: CSV parça parça okunur, normalizasyon pandas kolon
+işlemleriyle (vektörel) yapılır, satırlar COPY ile geçici bir staging
+tablosuna akıtılır ve tek bir set tabanlı INSERT ... SELECT ile birleştirilir.
+
+Satır satır mod (import_cultural_side.main) ile aynı kuralları uygular;
+koordinatı olmayan/geçersiz satırlar rejects dosyasına sebebiyle yazılır.
+
+Artımlı (incremental) modda kimlikler kaynak anahtarından türetilir (uuid5),
+her satırın içerik hash'i saklanır ve sadece hash'i değişen satırlar
+güncellenir; aynı dosyanın tekrar yüklenmesi neredeyse hiçbir şey yazmaz.
+"""
+import io
+import os
+import time
+import uuid
+from typing import Optional
+
+import pandas as pd
+from sqlalchemy import text
+
+# (kolon, en fazla uzunluk) — cultural_sites şemasıyla aynı sınırlar
+STR_COLUMNS = [
+    ("name_tr", 255), ("name_en", 255), ("category", 64), ("sub_category", 64),
+    ("city", 64), ("district", 64), ("neighbourhood", 128), ("address", None),
+    ("region_id", 32), ("summary_tr", None), ("summary_en", None),
+    ("opening_hours", 64), ("website", None), ("main_image_url", None),
+    ("protection_status", 64), ("source_name", 128), ("source_url", None),
+]
+
+# Staging tablosuna COPY edilen kolonlar (sıra önemli)
+STAGING_COLUMNS = [
+    "id", "external_code", "name_tr", "name_en", "category", "sub_category",
+    "city", "district", "neighbourhood", "address", "region_id",
+    "summary_tr", "summary_en", "opening_hours", "ticket_required",
+    "website", "main_image_url", "is_unesco", "protection_status",
+    "source_name", "source_url", "last_update", "lon", "lat", "line",
+]
+
+# Merge'de cultural_sites'a yazılan kolonlar (geom hariç)
+SITE_COLUMNS = STAGING_COLUMNS[:STAGING_COLUMNS.index("lon")]
+
+# Hash'e girmeyen kolonlar: kimlikten türeyenler ve satır numarası
+HASH_COLUMNS = [c for c in STAGING_COLUMNS if c not in ("id", "external_code", "line")]
+
+# Kaynak anahtarından stabil UUID üretmek için sabit namespace
+SITE_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_DNS, "heritage-app.cultural_sites")
+
+# Bölgesel dosyalarda farklı adlandırılmış kolonlar (küçük harfe çevrilip eşlenir)
+COLUMN_ALIASES = {
+    "longitude": "lon", "lng": "lon", "long": "lon",
+    "latitude": "lat",
+}
+
+DATE_FORMATS = ("%Y-%m-%d", "%d.%m.%Y", "%d/%m/%Y", "%Y/%m/%d", "%d-%m-%Y")
+TRUE_VALUES = ("1", "true", "t", "yes", "y")
+
+
+# -----------------------------
+# Vektörel yardımcılar (to_bool/to_date/norm_str/to_float karşılıkları)
+# -----------------------------
+def norm_str_col(s: pd.Series, maxlen: Optional[int] = None) -> pd.Series:
+    s = s.astype("string").str.strip()
+    s = s.mask(s.eq("") | s.str.lower().eq("nan"))
+    if maxlen:
+        s = s.str.slice(0, maxlen)
+    return s.astype(object).where(s.notna(), None)
+
+
+def to_bool_col(s: pd.Series, default: bool = False) -> pd.Series:
+    s = s.astype("string").str.strip().str.lower()
+    return s.isin(TRUE_VALUES).where(s.notna() & s.ne(""), default).astype(bool)
+
+
+def to_date_col(s: pd.Series) -> pd.Series:
+    s = s.astype("string").str.strip()
+    parsed = pd.Series(pd.NaT, index=s.index, dtype="datetime64[ns]")
+    for fmt in DATE_FORMATS:
+        parsed = parsed.fillna(pd.to_datetime(s, format=fmt, errors="coerce"))
+    parsed = parsed.fillna(pd.to_datetime(s, format="ISO8601", errors="coerce"))
+    return parsed.dt.date.astype(object).where(parsed.notna(), None)
+
+
+def to_float_col(s: pd.Series) -> pd.Series:
+    return pd.to_numeric(s, errors="coerce")
+
+
+def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
+    df.columns = [COLUMN_ALIASES.get(c.strip().lower(), c.strip()) for c in df.columns]
+    return df
+
+
+def column(df: pd.DataFrame, name: str) -> pd.Series:
+    if name in df.columns:
+        return df[name]
+    return pd.Series(pd.NA, index=df.index, dtype="string")
+
+
+# -----------------------------
+# Kimlik
+# -----------------------------
+def source_keys(df: pd.DataFrame, out: pd.DataFrame) -> pd.Series:
+    """
+    Satırın kaynaktaki kimliği. CSV'deki id kodları tekrar edebildiği için
+    (ör. TR-Afyonkarahisar-0001 birden çok yerde) isimle birlikte kullanılır;
+    id yoksa şehir/ilçe/isim üçlüsü anahtardır.
+    """
+    src_id = norm_str_col(column(df, "id")).fillna("")
+    fallback = out["city"].fillna("") + "|" + out["district"].fillna("")
+    return src_id.where(src_id.ne(""), fallback) + "|" + out["name_tr"]
+
+
+def stable_ids(keys: pd.Series) -> list[str]:
+    return [str(uuid.uuid5(SITE_NAMESPACE, k)) for k in keys]
+
+
+# -----------------------------
+# Normalizasyon
+# -----------------------------
+def normalize_chunk(df: pd.DataFrame, first_line: int, stable: bool = False) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Ham CSV parçasını staging kolonlarına çevirir.
+    (geçerli satırlar, reddedilen satırlar) döner; rejects, orijinal değerlerle
+    birlikte _line (CSV satır no) ve _reason kolonlarını taşır.
+
+    stable=True ise id kaynak anahtarından türetilir (uuid5) ve rejects'e de
+    _id olarak eklenir (tombstone sırasında silinmesinler diye).
+    """
+    out = pd.DataFrame(index=df.index)
+    for name, maxlen in STR_COLUMNS:
+        out[name] = norm_str_col(column(df, name), maxlen)
+
+    out["name_tr"] = out["name_tr"].fillna("Bilinmiyor")
+    out["category"] = out["category"].fillna("Genel")
+    out["ticket_required"] = to_bool_col(column(df, "ticket_required"))
+    out["is_unesco"] = to_bool_col(column(df, "is_unesco"))
+    # Boş tarih merge'de CURRENT_DATE olur; hash'e ham değer girer
+    out["last_update"] = to_date_col(column(df, "last_update"))
+    out["lon"] = to_float_col(column(df, "lon"))
+    out["lat"] = to_float_col(column(df, "lat"))
+    out["line"] = df.index + first_line
+
+    missing = out["lon"].isna() | out["lat"].isna()
+    out_of_range = ~missing & ((out["lon"].abs() > 180) | (out["lat"].abs() > 90))
+    bad = missing | out_of_range
+
+    rejects = df[bad].copy()
+    rejects.insert(0, "_line", rejects.index + first_line)
+    rejects.insert(1, "_reason", "")
+    rejects.loc[missing[bad], "_reason"] = "koordinat yok/geçersiz"
+    rejects.loc[out_of_range[bad], "_reason"] = "koordinat aralık dışı"
+
+    if stable:
+        ids = pd.Series(stable_ids(source_keys(df, out)), index=df.index)
+        rejects.insert(2, "_id", ids[bad])
+        # 32 bit önek milyonlarca satırda çakışır; stabil kodda 12 hane kullanılır
+        suffix = ids.str.replace("-", "", regex=False).str.slice(0, 12)
+    else:
+        # Satır modundaki gibi: her satıra yeni UUID, TR-Şehir-UUIDönek dış kod
+        ids = pd.Series([str(uuid.uuid4()) for _ in range(len(df))], index=df.index)
+        suffix = ids.str.split("-").str[0]
+
+    good = out[~bad].copy()
+    good["id"] = ids[~bad]
+    city_slug = good["city"].fillna("TR").astype(str).str.replace(" ", "", regex=False).str.slice(0, 48)
+    good["external_code"] = "TR-" + city_slug + "-" + suffix[~bad]
+
+    return good[STAGING_COLUMNS], rejects
+
+
+# -----------------------------
+# COPY + merge
+# -----------------------------
+def create_staging(conn) -> None:
+    conn.execute(text("""
+        CREATE TEMP TABLE cultural_sites_staging (
+            id uuid, external_code varchar(64),
+            name_tr varchar(255), name_en varchar(255),
+            category varchar(64), sub_category varchar(64),
+            city varchar(64), district varchar(64), neighbourhood varchar(128),
+            address text, region_id varchar(32),
+            summary_tr text, summary_en text, opening_hours varchar(64),
+            ticket_required boolean, website text, main_image_url text,
+            is_unesco boolean, protection_status varchar(64),
+            source_name varchar(128), source_url text, last_update date,
+            lon double precision, lat double precision, line integer
+        ) ON COMMIT DROP
+    """))
+
+
+def to_copy_buffer(df: pd.DataFrame) -> str:
+    return df.to_csv(header=False, index=False)
+
+
+def copy_chunk(conn, buf: str) -> None:
+    """to_copy_buffer() çıktısını (CSV metni) COPY ile staging tablosuna yazar."""
+    sql = f"COPY cultural_sites_staging ({', '.join(STAGING_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+    raw = conn.connection.driver_connection
+    with raw.cursor() as cur:
+        if hasattr(cur, "copy"):  # psycopg 3
+            with cur.copy(sql) as copy:
+                copy.write(buf)
+        else:  # psycopg2
+            cur.copy_expert(sql, io.StringIO(buf))
+
+
+def _select_columns() -> str:
+    return ", ".join("coalesce(last_update, CURRENT_DATE)" if c == "last_update" else c for c in SITE_COLUMNS)
+
+
+def merge_staging(conn) -> int:
+    """Staging'den cultural_sites'a tek INSERT ... SELECT; eklenen satır sayısı."""
+    result = conn.execute(text(f"""
+        INSERT INTO cultural_sites ({", ".join(SITE_COLUMNS)}, geom)
+        SELECT {_select_columns()}, ST_SetSRID(ST_Point(lon, lat), 4326)
+        FROM cultural_sites_staging
+        ON CONFLICT (id) DO NOTHING
+    """))
+    return result.rowcount
+
+
+def reject_conflicts(conn, incremental: bool) -> pd.DataFrame:
+    """
+    external_code'u başka bir id'ye ait olan staging satırlarını staging'den
+    çıkarır ve (line, _reason ve staging kolonlarıyla) döner. ON CONFLICT (id)
+    external_code'u kapsamaz: toplu modda çakışan satırlar sessizce atlanır,
+    artımlı modda ise tüm dosyanın transaction'ı geri alınırdı.
+
+    - Mevcut kayıtla çakışma: external_code cultural_sites'ta başka id'de
+    - Dosya içi çakışma: aynı external_code'lu farklı id'lerden ilk satır kalır
+    Artımlı modda önce her id'nin son satırı seçilir (upsert'teki kural), kontrol
+    sadece bu satırlar arasında yapılır.
+    """
+    if incremental:
+        conn.execute(text("""
+            DELETE FROM cultural_sites_staging s
+            USING cultural_sites_staging t
+            WHERE t.id = s.id AND t.line > s.line
+        """))
+    rows = conn.execute(text("""
+        WITH ranked AS (
+            SELECT line, id, external_code,
+                   row_number() OVER (PARTITION BY external_code ORDER BY line) AS rank
+            FROM cultural_sites_staging
+        ),
+        lost AS (
+            SELECT line,
+                   CASE WHEN owned THEN 'external_code çakışması (mevcut kayıt)'
+                        ELSE 'external_code çakışması (dosyada tekrar)' END AS _reason
+            FROM (
+                SELECT r.line, r.rank, EXISTS (
+                    SELECT 1 FROM cultural_sites c
+                    WHERE c.external_code = r.external_code AND c.id <> r.id
+                ) AS owned
+                FROM ranked r
+            ) AS checked
+            WHERE owned OR rank > 1
+        )
+        DELETE FROM cultural_sites_staging s
+        USING lost
+        WHERE s.line = lost.line
+        RETURNING s.*, lost._reason
+    """)).mappings().all()
+    return pd.DataFrame([dict(r) for r in rows], columns=[*STAGING_COLUMNS, "_reason"]).sort_values("line")
+
+
+def conflict_rejects(conflicts: pd.DataFrame, columns: list[str], incremental: bool) -> pd.DataFrame:
+    """reject_conflicts() çıktısını normalize_chunk rejects'inin kolon düzenine getirir."""
+    rejects = pd.DataFrame({"_line": conflicts["line"].to_numpy(), "_reason": conflicts["_reason"].to_numpy()})
+    if incremental:
+        rejects["_id"] = conflicts["id"].astype(str).to_numpy()
+    # Ham değerler staging'de yok; kaynak id'si hariç normalize edilmiş değerler yazılır
+    for col in columns:
+        source = col not in ("id", "external_code", "line") and col in conflicts
+        rejects[col] = conflicts[col].to_numpy() if source else None
+    return rejects
+
+
+def upsert_staging(conn, source: str) -> tuple[int, int]:
+    """
+    Artımlı merge: aynı id dosyada birden çok kez geçerse son satır kazanır,
+    mevcut satırlar sadece içerik hash'i değiştiyse güncellenir.
+    (eklenen, güncellenen) döner.
+
+    Satırın sahibi (import_source) onu ilk ekleyen kaynaktır; güncelleme sahipliği
+    devralmaz. Aynı satırları içeren iki dosya (ör. data/TR_WES.csv ve
+    data/TR-West-Locations.csv.csv) aynı uuid5 id'lerini üretir; kaynak karşılaştırmada
+    olsaydı her senkronda satırlar iki kez yazılır, dataset_version artar ve
+    --prune ile sahiplik iki kaynak arasında gidip gelirdi.
+    """
+    updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in SITE_COLUMNS if c != "id")
+    row = conn.execute(text(f"""
+        WITH up AS (
+            INSERT INTO cultural_sites ({", ".join(SITE_COLUMNS)}, geom, content_hash, import_source)
+            SELECT DISTINCT ON (id)
+                {_select_columns()}, ST_SetSRID(ST_Point(lon, lat), 4326),
+                md5(ROW({", ".join(HASH_COLUMNS)})::text), :source
+            FROM cultural_sites_staging
+            ORDER BY id, line DESC
+            ON CONFLICT (id) DO UPDATE SET
+                {updates}, geom = EXCLUDED.geom,
+                content_hash = EXCLUDED.content_hash,
+                import_source = COALESCE(cultural_sites.import_source, EXCLUDED.import_source),
+                updated_at = now()
+            WHERE cultural_sites.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+            -- xmax = 0: satır bu statement'ta eklendi (güncellenmedi)
+            RETURNING (xmax = 0) AS inserted
+        )
+        SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted)
+        FROM up
+    """), {"source": source}).one()
+    return row[0], row[1]
+
+
+def prune_source(conn, source: str, kept_ids: list[str]) -> int:
+    """
+    Tombstone: bu kaynaktan gelmiş ama dosyada artık olmayan satırları siler.
+    Reddedilen (ör. koordinatı bozulmuş) satırlar kept_ids ile korunur.
+    """
+    result = conn.execute(text("""
+        DELETE FROM cultural_sites c
+        WHERE c.import_source = :source
+          AND NOT EXISTS (SELECT 1 FROM cultural_sites_staging s WHERE s.id = c.id)
+          AND NOT (c.id = ANY(CAST(:kept AS uuid[])))
+    """), {"source": source, "kept": kept_ids})
+    return result.rowcount
+
+
+def write_rejects(rejects: pd.DataFrame, path: str, first: bool) -> None:
+    rejects.to_csv(path, mode="w" if first else "a", header=first, index=False)
+
+
+def default_rejects_path(csv_path: str) -> str:
+    return os.path.splitext(csv_path)[0] + ".rejects.csv"
+
+
+def read_normalized(csv_path: str, chunksize: int, rejects_path: str, stats: dict, incremental: bool = False):
+    """
+    CSV'yi parça parça okuyup normalize eder; her parça için COPY metnini üretir.
+    Reddedilen satırları rejects dosyasına yazar ve sayaçları stats içinde tutar
+    (rows, staged, rejected, rejected_ids).
+    """
+    for chunk in pd.read_csv(csv_path, chunksize=chunksize, dtype=str):
+        normalize_columns(chunk)
+        stats["columns"] = list(chunk.columns)
+        # CSV satır no: başlık 1. satır; chunk index'i dosya genelinde süreklidir
+        good, rejects = normalize_chunk(chunk, first_line=2, stable=incremental)
+        if len(rejects):
+            write_rejects(rejects, rejects_path, first=(stats["rejected"] == 0))
+            if incremental:
+                stats["rejected_ids"].extend(rejects["_id"])
+
+        stats["rows"] += len(chunk)
+        stats["staged"] += len(good)
+        stats["rejected"] += len(rejects)
+        yield to_copy_buffer(good)
+
+
+def load_staging(conn, source: str, incremental: bool, prune: bool, stats: dict, rejects_path: str) -> None:
+    """
+    Staging dolduktan sonra merge/upsert (+ tombstone); sonuçları stats'a yazar.
+    external_code çakışmaları önce ayıklanıp rejects dosyasına eklenir.
+    """
+    conflicts = reject_conflicts(conn, incremental)
+    if len(conflicts):
+        rejects = conflict_rejects(conflicts, stats["columns"], incremental)
+        write_rejects(rejects, rejects_path, first=(stats["rejected"] == 0))
+        stats["staged"] -= len(rejects)
+        stats["rejected"] += len(rejects)
+        if incremental:
+            stats["rejected_ids"].extend(rejects["_id"])
+
+    if incremental:
+        stats["inserted"], stats["updated"] = upsert_staging(conn, source)
+        # Boş/tamamen bozuk dosya kaynağın tüm satırlarını silmesin
+        if prune and stats["staged"]:
+            stats["deleted"] = prune_source(conn, source, stats["rejected_ids"])
+    else:
+        stats["inserted"] = merge_staging(conn)
+
+
+def new_stats() -> dict:
+    return {
+        "rows": 0, "staged": 0, "inserted": 0, "updated": 0, "deleted": 0,
+        "rejected": 0, "rejected_ids": [], "columns": [],
+    }
+
+
+def bulk_import(
+    engine,
+    csv_path: str,
+    chunksize: int = 50_000,
+    rejects_path: Optional[str] = None,
+    incremental: bool = False,
+    source: Optional[str] = None,
+    prune: bool = False,
+) -> dict:
+    """
+    Tek transaction içinde: staging oluştur -> parçaları COPY et -> merge.
+    incremental=True ise stabil id + hash'li upsert yapılır; prune=True ise
+    source'a ait olup dosyada olmayan satırlar silinir.
+    Özet istatistikleri döner (satır, eklenen, güncellenen, silinen, reddedilen, süre, satır/sn).
+    """
+    rejects_path = rejects_path or default_rejects_path(csv_path)
+    source = source or os.path.basename(csv_path)
+    started = time.perf_counter()
+    stats = new_stats()
+
+    with engine.connect() as conn:
+        create_staging(conn)
+        for buf in read_normalized(csv_path, chunksize, rejects_path, stats, incremental):
+            copy_chunk(conn, buf)
+            elapsed = time.perf_counter() - started
+            print(f"  ... {stats['rows']} satır okundu ({stats['rows'] / elapsed:,.0f} satır/sn)")
+
+        load_staging(conn, source, incremental, prune, stats, rejects_path)
+        conn.commit()
+
+    elapsed = time.perf_counter() - started
+    del stats["rejected_ids"], stats["columns"]
+    stats.update({
+        "rejects_path": rejects_path if stats["rejected"] else None,
+        "seconds": round(elapsed, 2),
+        "rows_per_sec": round(stats["rows"] / elapsed, 1) if elapsed else None,
+    })
+    return stats
@@ -0,0 +1,79 @@
+"""
+list_sites filtre yollarının indeks kullandığını EXPLAIN ile doğrular.
+
+Her filtre kombinasyonu için list_sites'ın çalıştırdığı sayfa sorgusunun
+kendisi (_page_statement: json_build_object + ORDER BY id LIMIT :limit,
+parametreler _page_params ile) EXPLAIN (FORMAT JSON) ile planlanır ve planda
+beklenen indeksin geçtiği kontrol edilir. ORDER BY id LIMIT planner'ı PK
+üzerinden filtrelemeye itebilir; bu da burada regresyon olarak yakalanır.
+Küçük tablolarda planner haklı olarak seq scan seçebileceği için
+enable_seqscan kapatılır: amaç indeksin *kullanılabilir* olduğunu kanıtlamak.
+
+Kullanım (backend klasöründen):
+    python -m app.scripts.check_query_plans
+Bir yol indeks kullanmıyorsa 1 ile çıkar (CI'da regresyon testi olarak).
+"""
+import json
+import sys
+
+from sqlalchemy import text
+
+from app.api.filters import SiteFilters
+from app.api.routes.sites import DEFAULT_LIMIT, GEOJSON_MAX_DECIMALS, _page_params, _page_statement
+from app.db.session import SessionLocal
+
+BBOX = {"min_lon": 26.0, "min_lat": 36.0, "max_lon": 30.0, "max_lat": 40.0}
+
+# (açıklama, filtreler, planda görülmesi gereken indeksler)
+CASES = [
+    ("bbox", SiteFilters(**BBOX), {"idx_cultural_sites_geom"}),
+    ("city", SiteFilters(city="İzmir"), {"idx_cultural_sites_city_district_category"}),
+    ("city+district", SiteFilters(city="İzmir", district="Selçuk"), {"idx_cultural_sites_city_district_category"}),
+    ("district", SiteFilters(district="Selçuk"), {"idx_cultural_sites_district"}),
+    ("category", SiteFilters(category="Museum"), {"idx_cultural_sites_category_unesco"}),
+    ("category+is_unesco", SiteFilters(category="Museum", is_unesco=True), {"idx_cultural_sites_category_unesco"}),
+    ("is_unesco", SiteFilters(is_unesco=True), {"idx_cultural_sites_unesco"}),
+    ("search", SiteFilters(search="kale"), {"idx_cultural_sites_name_tr_trgm", "idx_cultural_sites_name_en_trgm"}),
+]
+
+
+def plan_indexes(node: dict) -> set[str]:
+    found = set()
+    if "Index Name" in node:
+        found.add(node["Index Name"])
+    for child in node.get("Plans", []):
+        found |= plan_indexes(child)
+    return found
+
+
+def main() -> int:
+    failed = 0
+    db = SessionLocal()
+    try:
+        for name, filters, expected in CASES:
+            statement = _page_statement("geojson", filters.shape(), False, True)
+            params = {**_page_params(filters, DEFAULT_LIMIT, None), "precision": GEOJSON_MAX_DECIMALS}
+            sql = text(f"EXPLAIN (FORMAT JSON) {statement.text}")
+
+            with db.begin():
+                db.execute(text("SET LOCAL enable_seqscan = off"))
+                plan = db.execute(sql, params).scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+
+            used = plan_indexes(plan[0]["Plan"])
+            missing = expected - used
+            if missing:
+                failed += 1
+                print(f"❌ {name}: beklenen {sorted(missing)}, planda {sorted(used) or 'indeks yok'}")
+            else:
+                print(f"✅ {name}: {', '.join(sorted(used))}")
+    finally:
+        db.close()
+
+    print(f"\n{len(CASES) - failed}/{len(CASES)} filtre yolu indeks kullanıyor")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
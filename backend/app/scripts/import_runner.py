@@ -0,0 +1,257 @@
+"""
+Çoklu dosya import'u: bir klasör ya da glob'daki tüm CSV'leri paralel yükler.
+
+- Okuma + normalizasyon bir process havuzunda (çekirdek başına bir dosya)
+- Yazma sınırlı sayıda DB bağlantısıyla (writer thread'leri, dosya başına bir transaction)
+- Bellekte bekleyen (okunmuş ama yazılmamış) dosya sayısı sınırlıdır
+- Her dosya için ilerleme, hız ve hata sayıları; sonunda özet JSON
+
+Klasör verildiğinde benchmarks.generate_dataset çıktıları (synthetic_*.csv) ve
+rejects dosyaları atlanır; bunlar gerekiyorsa dosya ya da glob olarak açıkça verilir.
+
+Artımlı modda farklı dosyalar aynı satırları içerebilir (ör. data/TR_WES.csv ile
+data/TR-West-Locations.csv.csv aynı uuid5 id'lerini üretir). Bu yüzden okuma
+paralel kalır ama yazma tek bağlantıyla ve dosya adı sırasıyla yapılır: ortak
+satırların sahibi (import_source) her zaman sıradaki ilk dosyadır, sonrakiler
+içerik aynıysa bu satırlara hiç yazmaz.
+
+Kullanım:
+    python -m app.scripts.import_runner data/ [--incremental [--prune]] [--workers 4] [--writers 2]
+    python -m app.scripts.import_runner 'data/synthetic_*.csv' --writers 4
+"""
+import argparse
+import glob
+import json
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+
+from sqlalchemy import create_engine
+
+from app.core.dataset import mark_dataset_changed
+from app.scripts.bulk_import import (
+    copy_chunk,
+    create_staging,
+    default_rejects_path,
+    load_staging,
+    new_stats,
+    read_normalized,
+)
+from app.scripts.import_cultural_side import DB_URL, TILE_CACHE_DIR
+
+
+# Klasör taramasında atlanan üretilmiş dosyalar (benchmarks.generate_dataset çıktısı)
+GENERATED_PREFIXES = ("synthetic_",)
+
+
+def find_files(patterns: list[str]) -> list[str]:
+    """
+    Klasör -> içindeki *.csv (üretilmiş synthetic_* dosyaları hariç), diğerleri
+    glob olarak açılır. Rejects dosyaları her durumda atlanır.
+    """
+    files = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            files.extend(
+                f for f in glob.glob(os.path.join(pattern, "*.csv"))
+                if not os.path.basename(f).startswith(GENERATED_PREFIXES)
+            )
+        else:
+            files.extend(glob.glob(pattern))
+    return sorted({f for f in files if not f.endswith(".rejects.csv")})
+
+
+def parse_file(path: str, chunksize: int, incremental: bool) -> dict:
+    """Process havuzunda çalışır: dosyayı okuyup COPY metinlerini döner."""
+    started = time.perf_counter()
+    stats = new_stats()
+    rejects_path = default_rejects_path(path)
+    buffers = list(read_normalized(path, chunksize, rejects_path, stats, incremental))
+    stats["rejects_path"] = rejects_path if stats["rejected"] else None
+    stats["parse_seconds"] = round(time.perf_counter() - started, 3)
+    return {"path": path, "buffers": buffers, "stats": stats}
+
+
+def write_file(engine, parsed: dict, incremental: bool, prune: bool) -> dict:
+    """Writer thread'inde çalışır: staging'e COPY + merge, tek transaction."""
+    started = time.perf_counter()
+    stats = parsed["stats"]
+    rejects_path = default_rejects_path(parsed["path"])
+    with engine.connect() as conn:
+        create_staging(conn)
+        for buf in parsed["buffers"]:
+            copy_chunk(conn, buf)
+        load_staging(conn, os.path.basename(parsed["path"]), incremental, prune, stats, rejects_path)
+        conn.commit()
+    # external_code çakışmaları rejects dosyasını yazma sırasında oluşturabilir
+    stats["rejects_path"] = rejects_path if stats["rejected"] else None
+    stats["write_seconds"] = round(time.perf_counter() - started, 3)
+    return stats
+
+
+class ImportRunner:
+    def __init__(self, engine, workers: int, writers: int, chunksize: int, incremental: bool, prune: bool):
+        self.engine = engine
+        self.workers = workers
+        self.writers = writers
+        self.chunksize = chunksize
+        self.incremental = incremental
+        self.prune = prune
+
+        self.results: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        # Artımlı modda yazma sırası: okunan dosyalar burada bekler, sıradakiler yazılır
+        self._ready: dict[int, dict] = {}
+        self._next = 0
+        # Okunmuş ama henüz yazılmamış dosyalar bellekte birikmesin
+        self._slots = threading.BoundedSemaphore(workers + writers)
+        self._done = 0
+        self._total = 0
+
+    def _report(self, path: str, result: dict) -> None:
+        with self._lock:
+            self.results[path] = result
+            self._done += 1
+            name = os.path.basename(path)
+            if result.get("error"):
+                print(f"[{self._done}/{self._total}] ❌ {name}: {result['error']}")
+                return
+            seconds = result["parse_seconds"] + result["write_seconds"]
+            print(
+                f"[{self._done}/{self._total}] ✅ {name}: {result['rows']} satır, "
+                f"+{result['inserted']} ~{result['updated']} -{result['deleted']}, "
+                f"{result['rejected']} red, {result['rows'] / seconds if seconds else 0:,.0f} satır/sn"
+            )
+
+    def _write(self, path: str, parsed: dict) -> None:
+        try:
+            self._report(path, write_file(self.engine, parsed, self.incremental, self.prune))
+        except Exception as e:
+            self._report(path, {"error": f"yazma hatası: {e}"})
+        finally:
+            self._slots.release()
+
+    def _write_in_order(self, write_pool, files: list[str], index: int, parsed) -> None:
+        """
+        Artımlı mod: dosyalar okunma sırasından bağımsız olarak liste sırasıyla
+        (tek writer thread'inin FIFO kuyruğuna) yazılır. parsed=None okuma hatasıdır.
+        """
+        with self._lock:
+            self._ready[index] = parsed
+            while self._next in self._ready:
+                ready = self._ready.pop(self._next)
+                if ready is None:
+                    self._slots.release()
+                else:
+                    write_pool.submit(self._write, files[self._next], ready)
+                self._next += 1
+
+    def run(self, files: list[str]) -> dict:
+        self._total = len(files)
+        started = time.perf_counter()
+        # Ortak id'leri upsert eden dosyalar eşzamanlı yazılmasın (bkz. modül açıklaması)
+        writers = 1 if self.incremental else self.writers
+
+        with ThreadPoolExecutor(max_workers=writers) as write_pool:
+            def dispatch(index, path, future):
+                # Process havuzunun yönetim thread'inde çağrılır
+                try:
+                    parsed = future.result()
+                except Exception as e:
+                    self._report(path, {"error": f"okuma hatası: {e}"})
+                    parsed = None
+                else:
+                    print(f"  ... {os.path.basename(path)} okundu ({parsed['stats']['parse_seconds']} sn)")
+
+                if self.incremental:
+                    self._write_in_order(write_pool, files, index, parsed)
+                elif parsed is None:
+                    self._slots.release()
+                else:
+                    write_pool.submit(self._write, path, parsed)
+
+            with ProcessPoolExecutor(max_workers=self.workers) as parse_pool:
+                for index, path in enumerate(files):
+                    self._slots.acquire()
+                    future = parse_pool.submit(parse_file, path, self.chunksize, self.incremental)
+                    future.add_done_callback(lambda f, index=index, path=path: dispatch(index, path, f))
+
+        return self.summary(files, time.perf_counter() - started)
+
+    def summary(self, files: list[str], elapsed: float) -> dict:
+        per_file = []
+        totals = {k: 0 for k in ("rows", "inserted", "updated", "deleted", "rejected")}
+        file_seconds = 0.0
+        errors = 0
+        for path in files:
+            result = dict(self.results.get(path, {"error": "sonuç yok"}))
+            result.pop("rejected_ids", None)
+            result.pop("columns", None)
+            if result.get("error"):
+                errors += 1
+            else:
+                for k in totals:
+                    totals[k] += result[k]
+                file_seconds += result["parse_seconds"] + result["write_seconds"]
+            per_file.append({"path": path, **result})
+
+        return {
+            "finished_at": datetime.now().isoformat(timespec="seconds"),
+            "mode": "incremental" if self.incremental else "bulk",
+            "workers": self.workers,
+            "writers": 1 if self.incremental else self.writers,
+            "files": per_file,
+            "totals": {**totals, "files": len(files), "errors": errors},
+            "seconds": round(elapsed, 2),
+            # Dosyalar sırayla yüklenseydi geçecek süre (paralellik kazancı için)
+            "sum_file_seconds": round(file_seconds, 2),
+            "rows_per_sec": round(totals["rows"] / elapsed, 1) if elapsed else None,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Klasör/glob içindeki CSV'leri paralel import eder")
+    parser.add_argument("paths", nargs="+", help="Klasör, dosya ya da glob (ör. 'data/*.csv')")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Okuma/normalizasyon process sayısı")
+    parser.add_argument("--writers", type=int, default=2, help="Eşzamanlı DB yazma bağlantısı sayısı (artımlı modda her zaman 1)")
+    parser.add_argument("--chunksize", type=int, default=50_000)
+    parser.add_argument("--incremental", action="store_true", help="Stabil id + içerik hash'i ile upsert")
+    parser.add_argument("--prune", action="store_true", help="Artımlı modda kaynakta olmayan satırları sil")
+    parser.add_argument("--summary", default="import_summary.json", help="Özet JSON dosyası")
+    args = parser.parse_args()
+
+    if args.prune and not args.incremental:
+        parser.error("--prune sadece --incremental ile kullanılabilir")
+
+    files = find_files(args.paths)
+    if not files:
+        print("HATA: CSV dosyası bulunamadı.")
+        return
+
+    writers = 1 if args.incremental else args.writers
+    print(f"🚀 {len(files)} dosya, {args.workers} okuyucu, {writers} yazıcı")
+    engine = create_engine(DB_URL, future=True, pool_size=writers, max_overflow=0)
+    runner = ImportRunner(engine, args.workers, args.writers, args.chunksize, args.incremental, args.prune)
+    summary = runner.run(files)
+
+    totals = summary["totals"]
+    if totals["inserted"] or totals["updated"] or totals["deleted"]:
+        with engine.connect() as conn:
+            mark_dataset_changed(conn, TILE_CACHE_DIR)
+
+    with open(args.summary, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    print(f"\nSONUÇ RAPORU:")
+    print(f"📄 Dosya: {totals['files']} ({totals['errors']} hatalı)")
+    print(f"✅ Eklenen: {totals['inserted']}  🔁 Güncellenen: {totals['updated']}  🗑️ Silinen: {totals['deleted']}")
+    print(f"❌ Reddedilen: {totals['rejected']}")
+    print(f"⏱️ Süre: {summary['seconds']} sn (sıralı olsaydı ~{summary['sum_file_seconds']} sn), "
+          f"{summary['rows_per_sec']:,} satır/sn")
+    print(f"📝 Özet: {args.summary}")
+
+
+if __name__ == "__main__":
+    main()
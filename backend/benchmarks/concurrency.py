@@ -0,0 +1,132 @@
+"""
+Sync (threadpool + Session) ve async (AsyncSession) veritabanı modlarını
+aynı yük altında karşılaştırır.
+
+Her mod için DB_ASYNC ortam değişkeniyle ayrı bir uvicorn süreci başlatılır,
+sabit sayıda eşzamanlı istemci belirtilen süre boyunca endpoint'lere istek atar.
+Sonuç: istek/sn, gecikme yüzdelikleri ve hata sayısı (JSON).
+
+Kullanım (backend klasöründen, DATABASE_URL tanımlı):
+    python -m benchmarks.concurrency --concurrency 64 --duration 15
+"""
+import argparse
+import http.client
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from typing import Optional
+
+DEFAULT_PATHS = [
+    "/api/sites?limit=200",
+    "/api/sites?min_lon=26&min_lat=36&max_lon=30&max_lat=40&limit=500",
+    "/api/sites/nearby?lat=39.92&lon=32.85&k=20",
+    "/api/sites/suggest?q=ka",
+]
+
+
+def start_server(mode_async: bool, port: int, extra_env: Optional[dict] = None) -> subprocess.Popen:
+    env = dict(os.environ, DB_ASYNC="true" if mode_async else "false", **(extra_env or {}))
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/")
+            if conn.getresponse().status == 200:
+                return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError("uvicorn başlatılamadı")
+
+
+def run_load(port: int, paths: list[str], concurrency: int, duration: float) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def worker(offset: int):
+        nonlocal errors
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        i = offset
+        local, local_errors = [], 0
+        while time.perf_counter() < stop_at:
+            path = paths[i % len(paths)]
+            i += 1
+            t0 = time.perf_counter()
+            try:
+                conn.request("GET", path)
+                resp = conn.getresponse()
+                resp.read()
+                if resp.status >= 400:
+                    local_errors += 1
+            except (OSError, http.client.HTTPException):
+                local_errors += 1
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+                continue
+            local.append((time.perf_counter() - t0) * 1000)
+        with lock:
+            latencies.extend(local)
+            errors += local_errors
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    latencies.sort()
+
+    def pct(p: float) -> float:
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))], 2) if latencies else 0.0
+
+    return {
+        "requests": len(latencies),
+        "rps": round(len(latencies) / duration, 1),
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "mean_ms": round(statistics.fmean(latencies), 2) if latencies else 0.0,
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=15)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--path", action="append", help="Test edilecek yol (birden fazla verilebilir)")
+    args = parser.parse_args()
+    paths = args.path or DEFAULT_PATHS
+
+    results = {}
+    for name, mode_async in (("sync", False), ("async", True)):
+        proc = start_server(mode_async, args.port)
+        try:
+            run_load(args.port, paths, min(args.concurrency, 8), 2)  # ısınma
+            results[name] = run_load(args.port, paths, args.concurrency, args.duration)
+        finally:
+            proc.terminate()
+            proc.wait()
+        print(f"{name}: {results[name]}", file=sys.stderr)
+
+    print(json.dumps({
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "paths": paths,
+        **results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
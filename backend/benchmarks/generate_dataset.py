@@ -0,0 +1,236 @@
+"""
+Sentetik cultural_sites verisi üretir (importer'ın CSV biçiminde).
+
+- Mekânsal dağılım Türkiye'ye benzer: satırların çoğu şehir/ilçe merkezleri
+  etrafında yoğun kümeler, kalanı kaba bir Türkiye poligonu içinde kırsal noktalar
+- Şehir ve kategori dağılımları çarpık (İstanbul, Ankara, İzmir ... ağır basar)
+- Aynı seed ile aynı dosya üretilir: benchmark sonuçları commit'ler arasında karşılaştırılabilir
+
+Kullanım (backend klasöründen):
+    python -m benchmarks.generate_dataset --rows 100000 --out data/synthetic_100k.csv
+    python -m benchmarks.generate_dataset --preset 1m
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+PRESETS = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+# (şehir, enlem, boylam, ağırlık, bölge, ilçeler)
+CITIES = [
+    ("İstanbul", 41.01, 28.98, 20, "TR-WEST", ["Fatih", "Beyoğlu", "Üsküdar", "Kadıköy", "Beşiktaş", "Eyüpsultan"]),
+    ("Ankara", 39.93, 32.86, 8, "TR-CENTRAL", ["Çankaya", "Altındağ", "Keçiören", "Polatlı"]),
+    ("İzmir", 38.42, 27.14, 7, "TR-WEST", ["Konak", "Selçuk", "Bergama", "Çeşme"]),
+    ("Antalya", 36.89, 30.71, 6, "TR-SOUTH", ["Muratpaşa", "Kaş", "Manavgat", "Demre"]),
+    ("Bursa", 40.19, 29.06, 5, "TR-WEST", ["Osmangazi", "Yıldırım", "İznik"]),
+    ("Konya", 37.87, 32.48, 5, "TR-CENTRAL", ["Selçuklu", "Meram", "Karatay", "Çumra"]),
+    ("Nevşehir", 38.62, 34.71, 4, "TR-CENTRAL", ["Merkez", "Ürgüp", "Avanos"]),
+    ("Şanlıurfa", 37.16, 38.79, 4, "TR-EAST", ["Eyyübiye", "Haliliye", "Harran"]),
+    ("Muğla", 37.22, 28.36, 3, "TR-WEST", ["Menteşe", "Bodrum", "Fethiye"]),
+    ("Mardin", 37.31, 40.74, 3, "TR-EAST", ["Artuklu", "Midyat"]),
+    ("Trabzon", 41.00, 39.72, 3, "TR-NORTH", ["Ortahisar", "Maçka"]),
+    ("Edirne", 41.68, 26.56, 3, "TR-WEST", ["Merkez", "Uzunköprü"]),
+    ("Çanakkale", 40.15, 26.41, 3, "TR-WEST", ["Merkez", "Eceabat", "Ayvacık"]),
+    ("Gaziantep", 37.07, 37.38, 3, "TR-EAST", ["Şahinbey", "Şehitkamil"]),
+    ("Diyarbakır", 37.91, 40.24, 3, "TR-EAST", ["Sur", "Bağlar"]),
+    ("Kayseri", 38.73, 35.49, 2, "TR-CENTRAL", ["Melikgazi", "Talas"]),
+    ("Van", 38.49, 43.38, 2, "TR-EAST", ["İpekyolu", "Tuşba"]),
+    ("Erzurum", 39.90, 41.27, 2, "TR-EAST", ["Yakutiye", "Palandöken"]),
+    ("Sivas", 39.75, 37.02, 2, "TR-CENTRAL", ["Merkez", "Divriği"]),
+    ("Afyonkarahisar", 38.76, 30.54, 2, "TR-WEST", ["Merkez", "İhsaniye"]),
+    ("Aydın", 37.85, 27.85, 2, "TR-WEST", ["Efeler", "Kuşadası"]),
+    ("Denizli", 37.78, 29.09, 2, "TR-WEST", ["Pamukkale", "Merkezefendi"]),
+    ("Samsun", 41.29, 36.33, 2, "TR-NORTH", ["İlkadım", "Bafra"]),
+    ("Eskişehir", 39.78, 30.52, 2, "TR-CENTRAL", ["Odunpazarı", "Tepebaşı"]),
+    ("Adana", 37.00, 35.32, 2, "TR-SOUTH", ["Seyhan", "Yüreğir"]),
+    ("Hatay", 36.20, 36.16, 2, "TR-SOUTH", ["Antakya", "İskenderun"]),
+    ("Kars", 40.60, 43.10, 1, "TR-EAST", ["Merkez"]),
+    ("Amasya", 40.65, 35.83, 1, "TR-NORTH", ["Merkez"]),
+    ("Malatya", 38.35, 38.31, 1, "TR-EAST", ["Battalgazi"]),
+    ("Kastamonu", 41.38, 33.78, 1, "TR-NORTH", ["Merkez"]),
+]
+
+# (kategori, ağırlık, alt kategoriler, isim ekleri)
+CATEGORIES = [
+    ("Religious Site", 30, ["Mosque", "Church", "Tomb", "Synagogue"], ["Camii", "Kilisesi", "Türbesi", "Mescidi"]),
+    ("Historical Site", 25, ["Castle", "Bridge", "Inn", "Bath"], ["Kalesi", "Köprüsü", "Hanı", "Hamamı"]),
+    ("Archaeological Site", 15, ["Ancient City", "Mound", "Theatre"], ["Antik Kenti", "Höyüğü", "Tiyatrosu"]),
+    ("Museum", 12, ["Museum", "House Museum"], ["Müzesi", "Evi"]),
+    ("Cultural Site", 10, ["Mansion", "Bazaar", "Fountain"], ["Konağı", "Çarşısı", "Çeşmesi"]),
+    ("Natural Site", 8, ["Cave", "Canyon", "Lake"], ["Mağarası", "Kanyonu", "Gölü"]),
+]
+
+NAME_PREFIXES = [
+    "Eski", "Büyük", "Küçük", "Yeni", "Sultan", "Paşa", "Hacı", "Kara", "Yeşil",
+    "Ulu", "Saray", "Kervan", "Çifte", "Taş", "Tarihi", "Kale", "Çarşı", "Sahil",
+]
+
+# Kaba Türkiye sınırı (boylam, enlem); kırsal noktalar için reddetme örneklemesi
+TURKEY_POLYGON = np.array([
+    (26.0, 40.6), (26.6, 41.8), (28.0, 42.0), (29.1, 41.25), (31.2, 41.1), (33.5, 42.0),
+    (35.2, 42.0), (38.3, 40.95), (40.2, 41.0), (41.55, 41.5), (43.45, 41.1), (44.8, 39.7),
+    (44.3, 38.4), (44.8, 37.2), (42.2, 37.3), (40.6, 37.1), (38.0, 36.8), (36.6, 36.9),
+    (36.2, 36.0), (35.6, 36.6), (34.6, 36.8), (32.5, 36.1), (30.6, 36.3), (29.3, 36.2),
+    (27.4, 36.7), (27.2, 37.4), (26.3, 38.3), (26.2, 39.4), (26.2, 40.0),
+])
+
+RURAL_SHARE = 0.08
+UNESCO_SHARE = 0.003
+
+COLUMNS = [
+    "id", "name_tr", "name_en", "category", "sub_category", "city", "district",
+    "neighbourhood", "address", "region_id", "summary_tr", "summary_en",
+    "opening_hours", "ticket_required", "website", "main_image_url", "is_unesco",
+    "protection_status", "source_name", "source_url", "last_update", "lon", "lat",
+]
+
+
+def inside_polygon(lon: np.ndarray, lat: np.ndarray, polygon: np.ndarray) -> np.ndarray:
+    """Vektörel ışın atma (ray casting) ile nokta-poligon testi."""
+    inside = np.zeros(len(lon), dtype=bool)
+    x1, y1 = polygon[-1]
+    for x2, y2 in polygon:
+        crosses = ((y1 > lat) != (y2 > lat)) & (lon < (x2 - x1) * (lat - y1) / (y2 - y1 + 1e-12) + x1)
+        inside ^= crosses
+        x1, y1 = x2, y2
+    return inside
+
+
+def rural_points(rng: np.random.Generator, n: int) -> tuple[np.ndarray, np.ndarray]:
+    lons, lats = [], []
+    remaining = n
+    while remaining > 0:
+        lon = rng.uniform(26.0, 44.8, remaining * 2)
+        lat = rng.uniform(36.0, 42.1, remaining * 2)
+        ok = inside_polygon(lon, lat, TURKEY_POLYGON)
+        lons.append(lon[ok][:remaining])
+        lats.append(lat[ok][:remaining])
+        remaining -= len(lons[-1])
+    return np.concatenate(lons), np.concatenate(lats)
+
+
+def generate(rows: int, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+
+    # İlçe merkezleri: şehir merkezinin etrafında sabit (seed'e bağlı) ofsetler
+    districts = []  # (şehir indeksi, ilçe adı, enlem, boylam)
+    for ci, (_, lat, lon, _, _, names) in enumerate(CITIES):
+        for di, name in enumerate(names):
+            spread = 0.0 if di == 0 else 0.35
+            districts.append((ci, name, lat + rng.normal(0, spread), lon + rng.normal(0, spread)))
+    district_city = np.array([d[0] for d in districts])
+
+    city_weights = np.array([c[3] for c in CITIES], dtype=float)
+    city_weights /= city_weights.sum()
+
+    n_rural = int(rows * RURAL_SHARE)
+    n_urban = rows - n_rural
+
+    # Şehir -> ilçe -> merkez etrafında sıkı küme (şehir büyüdükçe daha yayvan)
+    city_idx = rng.choice(len(CITIES), size=n_urban, p=city_weights)
+    district_idx = np.empty(n_urban, dtype=int)
+    for ci in range(len(CITIES)):
+        mask = city_idx == ci
+        choices = np.flatnonzero(district_city == ci)
+        district_idx[mask] = rng.choice(choices, size=mask.sum())
+    d_lat = np.array([d[2] for d in districts])[district_idx]
+    d_lon = np.array([d[3] for d in districts])[district_idx]
+    sigma = 0.02 + 0.004 * np.array([c[3] for c in CITIES])[city_idx]
+    lat = d_lat + rng.normal(0, 1, n_urban) * sigma
+    lon = d_lon + rng.normal(0, 1, n_urban) * sigma / np.cos(np.radians(d_lat))
+
+    # Kırsal noktalar: en yakın ilçe merkezine atanır
+    r_lon, r_lat = rural_points(rng, n_rural)
+    all_d_lat = np.array([d[2] for d in districts])
+    all_d_lon = np.array([d[3] for d in districts])
+    nearest = np.empty(n_rural, dtype=int)
+    for start in range(0, n_rural, 100_000):
+        sl = slice(start, start + 100_000)
+        dist = (r_lat[sl, None] - all_d_lat) ** 2 + (r_lon[sl, None] - all_d_lon) ** 2
+        nearest[sl] = dist.argmin(axis=1)
+
+    lat = np.concatenate([lat, r_lat])
+    lon = np.concatenate([lon, r_lon])
+    district_idx = np.concatenate([district_idx, nearest])
+    city_idx = district_city[district_idx]
+
+    # Kategori / alt kategori / isim
+    cat_weights = np.array([c[1] for c in CATEGORIES], dtype=float)
+    cat_idx = rng.choice(len(CATEGORIES), size=rows, p=cat_weights / cat_weights.sum())
+    sub_pick = rng.integers(0, 1_000_000, rows)
+    prefix = np.array(NAME_PREFIXES)[rng.integers(0, len(NAME_PREFIXES), rows)]
+
+    city_names = np.array([c[0] for c in CITIES])[city_idx]
+    district_names = np.array([d[1] for d in districts])[district_idx]
+    regions = np.array([c[4] for c in CITIES])[city_idx]
+
+    sub_category = np.empty(rows, dtype=object)
+    suffix_tr = np.empty(rows, dtype=object)
+    for ci, (_, _, subs, suffixes) in enumerate(CATEGORIES):
+        mask = cat_idx == ci
+        k = sub_pick[mask] % len(subs)
+        sub_category[mask] = np.array(subs)[k]
+        suffix_tr[mask] = np.array(suffixes)[k]
+    categories = np.array([c[0] for c in CATEGORIES])[cat_idx]
+
+    serial = np.arange(1, rows + 1)
+    name_tr = pd.Series(prefix, dtype=object) + " " + pd.Series(district_names) + " " + pd.Series(suffix_tr)
+    # Aynı isim çok tekrarlanmasın: bir kısmına sıra numarası
+    numbered = rng.random(rows) < 0.5
+    name_tr[numbered] = name_tr[numbered] + " " + pd.Series(serial[numbered] % 97 + 1).astype(str).values
+
+    has_en = rng.random(rows) < 0.6
+    name_en = pd.Series(np.where(has_en, pd.Series(prefix) + " " + pd.Series(sub_category), None), dtype=object)
+
+    last_update = np.datetime64("2020-01-01") + rng.integers(0, 2000, rows).astype("timedelta64[D]")
+
+    df = pd.DataFrame({
+        "id": pd.Series(city_names).str.replace(" ", "", regex=False).radd("TR-") + "-" + pd.Series(serial).map("{:07d}".format),
+        "name_tr": name_tr,
+        "name_en": name_en,
+        "category": categories,
+        "sub_category": sub_category,
+        "city": city_names,
+        "district": district_names,
+        "neighbourhood": None,
+        "address": pd.Series(district_names) + "/" + pd.Series(city_names),
+        "region_id": regions,
+        "summary_tr": name_tr + ", " + pd.Series(city_names) + " ilinin " + pd.Series(district_names)
+        + " ilçesinde yer alan tarihi bir yapıdır.",
+        "summary_en": None,
+        "opening_hours": np.where(rng.random(rows) < 0.4, "09:00-17:00", "24/7"),
+        "ticket_required": np.where(rng.random(rows) < 0.3, "TRUE", "FALSE"),
+        "website": None,
+        "main_image_url": None,
+        "is_unesco": np.where(rng.random(rows) < UNESCO_SHARE, "TRUE", "FALSE"),
+        "protection_status": "Registered",
+        "source_name": "Synthetic",
+        "source_url": None,
+        "last_update": last_update,
+        "lon": np.round(lon, 7),
+        "lat": np.round(lat, 7),
+    })
+    return df[COLUMNS]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sentetik cultural_sites CSV üretir")
+    parser.add_argument("--rows", type=int, default=None)
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="10k")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default=None, help="Varsayılan: data/synthetic_<preset|rows>.csv")
+    args = parser.parse_args()
+
+    rows = args.rows or PRESETS[args.preset]
+    out = args.out or f"data/synthetic_{args.preset if args.rows is None else rows}.csv"
+
+    started = time.perf_counter()
+    df = generate(rows, args.seed)
+    df.to_csv(out, index=False)
+    print(f"{rows} satır -> {out} ({time.perf_counter() - started:.1f} sn)")
+
+
+if __name__ == "__main__":
+    main()
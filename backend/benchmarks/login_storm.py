@@ -0,0 +1,132 @@
+"""
+Login patlaması sırasında sites endpoint'lerinin gecikmesini ölçer.
+
+İki sunucu yapılandırması karşılaştırılır:
+- shared:  argon2 havuzu request threadpool'u kadar geniş ve kuyruk sınırsız
+           (eski davranışa yakın: hash'ler tüm thread'leri doldurur)
+- bounded: varsayılan HASH_WORKERS / HASH_MAX_PENDING (admission control)
+
+Her yapılandırmada önce sadece sites yükü (baseline), sonra aynı yük +
+paralel login istekleri çalıştırılır. Sonuç JSON: sites gecikme yüzdelikleri,
+login başarı / 503 / hata sayıları.
+
+Kullanım (backend klasöründen, DATABASE_URL tanımlı):
+    python -m benchmarks.login_storm --concurrency 16 --logins 64 --duration 10
+"""
+import argparse
+import http.client
+import json
+import sys
+import threading
+import time
+import uuid
+from urllib.parse import urlencode
+
+from benchmarks.concurrency import DEFAULT_PATHS, run_load, start_server
+
+CONFIGS = {
+    "shared": {"HASH_WORKERS": "40", "HASH_MAX_PENDING": "100000"},
+    "bounded": {},
+}
+
+# Not: auth router'ı hem kendi prefix'i hem include_router prefix'iyle bağlı
+AUTH_PREFIX = "/api/auth/api/auth"
+
+
+def register_user(port: int, email: str, password: str) -> None:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    body = json.dumps({"email": email, "password": password, "display_name": "bench"})
+    conn.request("POST", f"{AUTH_PREFIX}/register", body, {"Content-Type": "application/json"})
+    resp = conn.getresponse()
+    resp.read()
+    if resp.status not in (200, 409):
+        raise RuntimeError(f"kullanıcı oluşturulamadı: {resp.status}")
+
+
+def login_storm(port: int, email: str, password: str, concurrency: int, stop: threading.Event) -> dict:
+    counts = {"ok": 0, "busy": 0, "errors": 0}
+    lock = threading.Lock()
+    path = f"{AUTH_PREFIX}/login?" + urlencode({"email": email, "password": password})
+
+    def worker():
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+        local = {"ok": 0, "busy": 0, "errors": 0}
+        while not stop.is_set():
+            try:
+                conn.request("POST", path)
+                resp = conn.getresponse()
+                resp.read()
+            except (OSError, http.client.HTTPException):
+                local["errors"] += 1
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+                continue
+            if resp.status == 200:
+                local["ok"] += 1
+            elif resp.status == 503:
+                local["busy"] += 1
+                # İstemci Retry-After'a uyar gibi kısa bekle
+                time.sleep(float(resp.getheader("Retry-After", "1")) / 10)
+            else:
+                local["errors"] += 1
+        with lock:
+            for k in counts:
+                counts[k] += local[k]
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    return {"threads": threads, "counts": counts}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=16, help="Eşzamanlı sites istemcisi")
+    parser.add_argument("--logins", type=int, default=64, help="Eşzamanlı login istemcisi")
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--path", action="append", help="Sites yolu (birden fazla verilebilir)")
+    args = parser.parse_args()
+    paths = args.path or DEFAULT_PATHS
+
+    email = f"bench-{uuid.uuid4().hex[:8]}@example.com"
+    password = "bench-password"
+
+    results = {}
+    for name, extra_env in CONFIGS.items():
+        proc = start_server(True, args.port, extra_env)
+        try:
+            register_user(args.port, email, password)
+            run_load(args.port, paths, min(args.concurrency, 8), 2)  # ısınma
+            baseline = run_load(args.port, paths, args.concurrency, args.duration)
+
+            stop = threading.Event()
+            storm = login_storm(args.port, email, password, args.logins, stop)
+            time.sleep(1)  # login kuyruğu dolsun
+            under_storm = run_load(args.port, paths, args.concurrency, args.duration)
+            stop.set()
+            for t in storm["threads"]:
+                t.join()
+
+            results[name] = {
+                "env": extra_env,
+                "sites_baseline": baseline,
+                "sites_during_storm": under_storm,
+                "logins": storm["counts"],
+            }
+        finally:
+            proc.terminate()
+            proc.wait()
+        print(f"{name}: {results[name]}", file=sys.stderr)
+
+    print(json.dumps({
+        "concurrency": args.concurrency,
+        "login_concurrency": args.logins,
+        "duration_s": args.duration,
+        "paths": paths,
+        **results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
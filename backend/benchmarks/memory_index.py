@@ -0,0 +1,203 @@
+"""
+Bellek içi site indeksi (app/core/memory_index.py) ile PostGIS yolunun karşılaştırması.
+
+1. Doğrudan ölçüm (varsayılan): cultural_sites bir kez belleğe yüklenir
+   (yükleme süresi raporlanır), sonra her senaryo iki motorla --repeat kez
+   çalıştırılır.
+   - memory_ms: sorgu + yanıt metni (route'taki _memory_page / nearest)
+   - postgis_ms: aynı route statement'ı tek bir psycopg bağlantısında
+   - same: iki motorun döndüğü id'ler aynı mı (nearby'da küre / sferoid
+     farkı yüzünden eşit uzaklıktaki sıralar değişebilir: küme olarak)
+
+2. --http: aynı list_sites / nearby senaryoları MEMORY_INDEX_ENDPOINTS boş ve
+   "list_sites,nearby" ile iki ayrı uvicorn sürecine gönderilir (sonuç
+   önbelleği kapalı); p50 / p95 karşılaştırılır.
+
+Kullanım (backend klasöründen, DATABASE_URL veri yüklü yerel PostGIS'i göstermeli):
+    python -m benchmarks.memory_index --repeat 200
+    python -m benchmarks.memory_index --http --repeat 100
+"""
+import argparse
+import http.client
+import json
+import math
+import statistics
+import sys
+import time
+
+import psycopg
+
+from app.api.filters import SiteFilters
+from app.api.routes import sites
+from app.core.memory_index import LOAD_SQL, VERSION_SQL, SiteSnapshot
+from app.db.session import engine
+from benchmarks.concurrency import start_server
+from benchmarks.prepared_statements import compile_psycopg, conninfo
+from benchmarks.suite import BBOXES, list_cases, measure
+
+NEARBY = [
+    ("nearby.k20", (28.98, 41.01, 20, None)),
+    ("nearby.radius", (32.86, 39.93, 50, 5000.0)),
+    ("nearby.k200", (35.0, 39.0, 200, None)),
+]
+
+
+def load_snapshot() -> tuple[SiteSnapshot, dict]:
+    started = time.perf_counter()
+    with engine.connect() as conn:
+        version = conn.execute(VERSION_SQL).scalar() or 0
+        rows = conn.execute(LOAD_SQL).all()
+    fetched = time.perf_counter()
+    snapshot = SiteSnapshot(rows, version)
+    built = time.perf_counter()
+
+    arrays = [snapshot.ids, snapshot.lon, snapshot.lat, snapshot.cell_rows, snapshot.cell_start,
+              *snapshot.codes.values()]
+    return snapshot, {
+        "rows": snapshot.size,
+        "fetch_s": round(fetched - started, 3),
+        "build_s": round(built - fetched, 3),
+        "numeric_mb": round(sum(a.nbytes for a in arrays) / 2 ** 20, 1),
+        "grid": [snapshot.nx, snapshot.ny],
+    }
+
+
+def page_cases() -> list[tuple[str, SiteFilters]]:
+    cases = []
+    for name, (min_lon, min_lat, max_lon, max_lat) in BBOXES:
+        bbox = dict(min_lon=min_lon, min_lat=min_lat, max_lon=max_lon, max_lat=max_lat)
+        cases.append((f"list_sites.bbox_{name}", SiteFilters(**bbox)))
+        cases.append((f"list_sites.bbox_{name}.category", SiteFilters(**bbox, category="Religious Site")))
+    cases += [
+        ("list_sites.no_filter", SiteFilters()),
+        ("list_sites.city_district", SiteFilters(city="İstanbul", district="Fatih")),
+        ("list_sites.category_unesco", SiteFilters(category="Museum", is_unesco=True)),
+    ]
+    return cases
+
+
+def timed(fn, repeat: int) -> tuple[float, object]:
+    result = fn()  # ısınma
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), result
+
+
+def feature_ids(body: str) -> list[str]:
+    return [f["properties"]["id"] for f in json.loads(body)["features"]]
+
+
+def run_direct(repeat: int) -> dict:
+    snapshot, load = load_snapshot()
+    print(f"  yükleme: {load}", file=sys.stderr)
+    results = {"load": load, "cases": {}}
+
+    with psycopg.connect(conninfo(), autocommit=True) as conn:
+        def postgis(statement, params):
+            sql, bound = compile_psycopg(statement, params)
+            return lambda: conn.execute(sql, bound).fetchone()[0]
+
+        for name, filters in page_cases():
+            limit = sites.DEFAULT_LIMIT
+            params = {**sites._page_params(filters, limit, None), "precision": sites.GEOJSON_MAX_DECIMALS}
+            db_ms, db_body = timed(postgis(sites._page_statement("geojson", filters.shape(), False, True), params), repeat)
+            mem_ms, mem_body = timed(lambda: sites._memory_page(
+                snapshot, filters, None, limit, sites.LIST_COLUMNS, sites.GEOJSON_MAX_DECIMALS,
+            ), repeat)
+            same = feature_ids(db_body) == feature_ids(mem_body)
+            results["cases"][name] = report(name, mem_ms, db_ms, same, len(feature_ids(mem_body)))
+
+        for name, (lon, lat, k, radius_m) in NEARBY:
+            params = {"lon": lon, "lat": lat, "k": k, "candidates": k * sites.KNN_OVERFETCH}
+            if radius_m is not None:
+                dlat = radius_m / sites.METERS_PER_DEGREE
+                dlon = dlat / max(math.cos(math.radians(lat)), 0.01)
+                params.update({
+                    "nb_min_lon": lon - dlon, "nb_min_lat": lat - dlat,
+                    "nb_max_lon": lon + dlon, "nb_max_lat": lat + dlat, "radius_m": radius_m,
+                })
+            db_ms, db_body = timed(postgis(sites._nearby_statement((), radius_m is not None), params), repeat)
+
+            def memory():
+                rows, dist = snapshot.nearest(lon, lat, k, radius_m, {})
+                return "[" + snapshot.features_json(rows, sites.LIST_COLUMNS, extra={"distance_m": dist.round(1)}) + "]"
+
+            mem_ms, mem_body = timed(memory, repeat)
+            mem_ids = [f["properties"]["id"] for f in json.loads(mem_body)]
+            same = set(feature_ids(db_body)) == set(mem_ids)
+            results["cases"][name] = report(name, mem_ms, db_ms, same, len(mem_ids))
+    return results
+
+
+def report(name: str, mem_ms: float, db_ms: float, same: bool, n: int) -> dict:
+    print(
+        f"  {name:40s} bellek={mem_ms:8.3f} ms  postgis={db_ms:8.3f} ms  "
+        f"{db_ms / mem_ms if mem_ms else float('inf'):6.1f}x  n={n:5d}  {'aynı' if same else 'FARKLI'}",
+        file=sys.stderr,
+    )
+    return {"memory_ms": round(mem_ms, 3), "postgis_ms": round(db_ms, 3), "same": same, "features": n}
+
+
+def wait_for_index(port: int, timeout: float = 120) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        conn.request("GET", "/metrics")
+        body = conn.getresponse().read().decode()
+        conn.close()
+        if 'memory_index_state{field="rows"}' in body:
+            return
+        time.sleep(0.5)
+    raise RuntimeError("bellek indeksi yüklenmedi")
+
+
+def run_http(repeat: int, port: int, db_async: bool) -> dict:
+    cases = [(name, path) for name, path in list_cases()
+             if (name.startswith("list_sites.") and "search" not in name) or name.startswith("nearby.")]
+    results = {}
+    for label, endpoints in (("postgis", ""), ("memory", "list_sites,nearby")):
+        proc = start_server(db_async, port, {
+            "RESULT_CACHE_MAX_ENTRIES": "0", "METRICS_ENABLED": "true", "MEMORY_INDEX_ENDPOINTS": endpoints,
+        })
+        try:
+            if endpoints:
+                wait_for_index(port)
+            results[label] = {}
+            for name, path in cases:
+                measure(port, [path], min(3, repeat))
+                results[label][name] = measure(port, [path], repeat)
+        finally:
+            proc.terminate()
+            proc.wait()
+
+    print(f"{'senaryo':40s} {'postgis p50':>12s} {'bellek p50':>11s} {'oran':>7s}", file=sys.stderr)
+    for name, before in results["postgis"].items():
+        after = results["memory"][name]
+        ratio = before["p50_ms"] / after["p50_ms"] if after["p50_ms"] else float("inf")
+        print(f"{name:40s} {before['p50_ms']:9.2f} ms {after['p50_ms']:8.2f} ms {ratio:6.1f}x", file=sys.stderr)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--http", action="store_true", help="Uçtan uca: iki uvicorn süreci")
+    parser.add_argument("--port", type=int, default=8769)
+    parser.add_argument("--sync", dest="db_async", action="store_false", help="DB_ASYNC=false ile ölç (--http)")
+    parser.add_argument("--out", default=None, help="Sonuç JSON dosyası")
+    args = parser.parse_args()
+
+    result = run_http(args.repeat, args.port, args.db_async) if args.http else run_direct(args.repeat)
+    text_out = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text_out)
+    else:
+        print(text_out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Sunucu tarafı prepared statement'ların planlama süresine etkisi.
+
+1. Doğrudan ölçüm (varsayılan): routes/sites.py'deki statement önbelleğinden
+   alınan her sorgu tek bir psycopg bağlantısında --repeat kez çalıştırılır.
+   - planning_ms: EXPLAIN (ANALYZE, SUMMARY) ile hazırlanmamış sorgunun
+     planlama süresi (her istekte ödenen maliyet)
+   - plain_ms / prepared_ms: prepare=False / prepare=True ile istemci
+     tarafı ortalama süre; fark parse + planlamadan kazanılan süredir
+   - generic/custom: pg_prepared_statements'a göre Postgres'in kaç kez
+     genel (yeniden planlanmayan) plan kullandığı. Genel plan seçilmezse
+     kazanç sadece parse/analiz kısmıdır.
+
+2. --http: aynı senaryolar DB_PREPARE_THRESHOLD=-1 ve 1 ile iki ayrı uvicorn
+   sürecine gönderilir; /metrics'teki db_statement_duration_seconds
+   ortalamaları route bazında karşılaştırılır.
+
+Kullanım (backend klasöründen, DATABASE_URL veri yüklü yerel PostGIS'i göstermeli):
+    python -m benchmarks.prepared_statements --repeat 200
+    python -m benchmarks.prepared_statements --http --repeat 100
+"""
+import argparse
+import http.client
+import json
+import re
+import statistics
+import sys
+import time
+
+import psycopg
+from sqlalchemy.dialects.postgresql import psycopg as pg_psycopg
+from sqlalchemy.engine import make_url
+
+from app.api.routes import sites
+from app.core.config import settings
+from benchmarks.concurrency import start_server
+from benchmarks.suite import list_cases, measure
+
+REGION = {"min_lon": 26.0, "min_lat": 37.0, "max_lon": 31.0, "max_lat": 41.5}
+CITY = {"min_lon": 28.80, "min_lat": 40.95, "max_lon": 29.15, "max_lat": 41.10}
+
+
+def statement_cases(site_id: str | None) -> list[tuple[str, object, dict]]:
+    """(ad, TextClause, parametreler) — route'ların kullandığı statement'lar."""
+    cases = [
+        ("list_sites.bbox_region", sites._page_statement("geojson", ("bbox",), False, True),
+         {**REGION, "limit": 2000, "precision": 9}),
+        ("list_sites.bbox_city.category", sites._page_statement("geojson", ("bbox", "category"), False, True),
+         {**CITY, "category": "Religious Site", "limit": 2000, "precision": 9}),
+        ("list_sites.city_district", sites._page_statement("geojson", ("city", "district"), False, True),
+         {"city": "İstanbul", "district": "Fatih", "limit": 2000, "precision": 9}),
+        ("list_sites.columnar", sites._page_statement("columnar", ("bbox",), False, True),
+         {**CITY, "limit": 2000}),
+        ("clusters.z6", sites._clusters_statement(()),
+         {"cell_x": 0.33, "cell_y": 0.25, "min_points": 3, "max_cells": sites.MAX_CLUSTER_CELLS}),
+        ("search.single", sites._search_statement(()),
+         {"q": "camii", "q_like": "camii", "limit": 20}),
+        ("suggest.prefix", sites.SUGGEST_SQL, {"q": "ye", "limit": 10}),
+        ("nearby.k20", sites._nearby_statement((), False),
+         {"lon": 28.98, "lat": 41.01, "k": 20, "candidates": 20 * sites.KNN_OVERFETCH}),
+        ("facets.all", sites._facets_statement((), False), {}),
+    ]
+    if site_id is not None:
+        cases.append(("get_site", sites.GET_SITE_SQL, {"id": site_id}))
+    return cases
+
+
+def compile_psycopg(statement, params: dict) -> tuple[str, dict]:
+    """text() statement'ını psycopg'nin %(ad)s biçimine çevirir."""
+    compiled = statement.compile(dialect=pg_psycopg.dialect())
+    return str(compiled), {k: params[k] for k in compiled.params}
+
+
+def conninfo() -> str:
+    return make_url(settings.DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+def planning_ms(conn: psycopg.Connection, sql: str, params: dict) -> float:
+    plans = []
+    for _ in range(5):
+        plan = conn.execute("EXPLAIN (ANALYZE, SUMMARY, FORMAT JSON) " + sql, params, prepare=False).fetchone()[0]
+        plans.append(plan[0]["Planning Time"])
+    return statistics.median(plans)
+
+
+def timed(conn: psycopg.Connection, sql: str, params: dict, repeat: int, prepare: bool) -> float:
+    for _ in range(10):  # ısınma; prepared modda custom plan aşaması da geçilir
+        conn.execute(sql, params, prepare=prepare).fetchall()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        conn.execute(sql, params, prepare=prepare).fetchall()
+    return (time.perf_counter() - started) * 1000 / repeat
+
+
+def plan_counts(conn: psycopg.Connection) -> tuple:
+    try:
+        row = conn.execute(
+            "SELECT sum(generic_plans), sum(custom_plans) FROM pg_prepared_statements", prepare=False
+        ).fetchone()
+    except psycopg.Error:  # PostgreSQL < 14
+        conn.rollback()
+        return None, None
+    return row[0], row[1]
+
+
+def run_direct(repeat: int) -> dict:
+    with psycopg.connect(conninfo(), autocommit=True) as conn:
+        row = conn.execute("SELECT id::text FROM cultural_sites LIMIT 1").fetchone()
+    site_id = row[0] if row else None
+
+    results = {}
+    for name, statement, params in statement_cases(site_id):
+        sql, bound = compile_psycopg(statement, params)
+        # Her senaryo kendi bağlantısında: prepared statement sayıları karışmasın
+        with psycopg.connect(conninfo(), autocommit=True, prepare_threshold=None) as conn:
+            plan = planning_ms(conn, sql, bound)
+            plain = timed(conn, sql, bound, repeat, prepare=False)
+            prepared = timed(conn, sql, bound, repeat, prepare=True)
+            generic, custom = plan_counts(conn)
+        results[name] = {
+            "planning_ms": round(plan, 3),
+            "plain_ms": round(plain, 3),
+            "prepared_ms": round(prepared, 3),
+            "saved_ms": round(plain - prepared, 3),
+            "generic_plans": generic,
+            "custom_plans": custom,
+        }
+        print(
+            f"  {name:32s} plan={plan:7.3f} ms  düz={plain:8.3f} ms  hazır={prepared:8.3f} ms  "
+            f"kazanç={plain - prepared:7.3f} ms  generic/custom={generic}/{custom}",
+            file=sys.stderr,
+        )
+    return results
+
+
+METRIC_LINE = re.compile(r'^db_statement_duration_seconds_(sum|count)\{route="([^"]*)",operation="SELECT"\} (\S+)$')
+
+
+def statement_means(port: int) -> dict[str, float]:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    conn.request("GET", "/metrics")
+    body = conn.getresponse().read().decode()
+    conn.close()
+
+    sums, counts = {}, {}
+    for line in body.splitlines():
+        m = METRIC_LINE.match(line)
+        if m:
+            (sums if m.group(1) == "sum" else counts)[m.group(2)] = float(m.group(3))
+    return {route: sums[route] / counts[route] * 1000 for route in counts if counts[route]}
+
+
+def run_http(repeat: int, port: int, db_async: bool) -> dict:
+    results = {}
+    for label, threshold in (("unprepared", "-1"), ("prepared", "1")):
+        proc = start_server(db_async, port, {
+            "RESULT_CACHE_MAX_ENTRIES": "0", "METRICS_ENABLED": "true", "DB_PREPARE_THRESHOLD": threshold,
+        })
+        try:
+            for _name, path in list_cases():
+                measure(port, [path], repeat)
+            results[label] = statement_means(port)
+        finally:
+            proc.terminate()
+            proc.wait()
+
+    print(f"{'route':40s} {'hazırlanmamış':>14s} {'hazır':>10s} {'oran':>7s}", file=sys.stderr)
+    for route, before in sorted(results["unprepared"].items()):
+        after = results["prepared"].get(route)
+        if after is None:
+            continue
+        print(f"{route:40s} {before:11.3f} ms {after:7.3f} ms {after / before:6.2f}x", file=sys.stderr)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--http", action="store_true", help="Uçtan uca: iki uvicorn süreci ve /metrics")
+    parser.add_argument("--port", type=int, default=8768)
+    parser.add_argument("--sync", dest="db_async", action="store_false", help="DB_ASYNC=false ile ölç (--http)")
+    parser.add_argument("--out", default=None, help="Sonuç JSON dosyası")
+    args = parser.parse_args()
+
+    result = run_http(args.repeat, args.port, args.db_async) if args.http else run_direct(args.repeat)
+    text_out = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text_out)
+    else:
+        print(text_out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+list_sites serileştirme karşılaştırması: eski Python yolu vs. SQL'de kurulan GeoJSON.
+
+Eski yol: ST_AsGeoJSON -> json.loads -> props dict -> jsonable_encoder -> json.dumps
+Yeni yol: json_build_object/json_agg ile hazır metin -> doğrudan Response gövdesi
+
+Kullanım (backend klasöründen):
+    python -m benchmarks.serialization --limit 2000 --repeat 20
+"""
+import argparse
+import json
+import statistics
+import time
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import text
+
+from app.api.filters import SiteFilters
+from app.api.routes.sites import GEOJSON_MAX_DECIMALS, _page_params, _page_statement
+from app.db.session import SessionLocal
+
+LEGACY_SQL = text("""
+    SELECT
+      id,
+      ST_AsGeoJSON(geom) AS geom_json,
+      name_tr, name_en, category, sub_category,
+      city, district, main_image_url, summary_tr
+    FROM cultural_sites
+    ORDER BY id
+    LIMIT :limit
+""")
+
+
+def legacy_path(db, limit: int) -> bytes:
+    rows = db.execute(LEGACY_SQL, {"limit": limit}).mappings().all()
+    features = []
+    for r in rows:
+        geom = json.loads(r["geom_json"]) if r["geom_json"] else None
+        props = {k: r[k] for k in r.keys() if k != "geom_json"}
+        features.append({"type": "Feature", "geometry": geom, "properties": props})
+    content = jsonable_encoder({"type": "FeatureCollection", "features": features})
+    # FastAPI JSONResponse.render ile aynı ayarlar
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def sql_path(db, limit: int) -> bytes:
+    filters = SiteFilters()
+    params = {**_page_params(filters, limit, None), "precision": GEOJSON_MAX_DECIMALS}
+    return db.execute(_page_statement("geojson", filters.shape(), False, True), params).scalar().encode("utf-8")
+
+
+def measure(fn, db, limit: int, repeat: int) -> dict:
+    fn(db, limit)  # ısınma
+    wall, cpu, size = [], [], 0
+    for _ in range(repeat):
+        w0, c0 = time.perf_counter(), time.process_time()
+        body = fn(db, limit)
+        cpu.append((time.process_time() - c0) * 1000)
+        wall.append((time.perf_counter() - w0) * 1000)
+        size = len(body)
+    return {
+        "wall_ms_median": round(statistics.median(wall), 2),
+        "api_cpu_ms_median": round(statistics.median(cpu), 2),
+        "bytes": size,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--limit", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        results = {
+            "legacy_python": measure(legacy_path, db, args.limit, args.repeat),
+            "sql_json": measure(sql_path, db, args.limit, args.repeat),
+        }
+    finally:
+        db.close()
+
+    print(json.dumps({"limit": args.limit, "repeat": args.repeat, **results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
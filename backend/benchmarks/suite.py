@@ -0,0 +1,229 @@
+"""
+Tekrarlanabilir benchmark seti: sentetik veriyi yükler, API'yi ölçer, JSON yazar.
+
+Adımlar:
+1. (--load) CSV toplu import ile yüklenir, import hızı ölçülür
+   (--reset önce cultural_sites'ı boşaltır; sadece yerel/test veritabanında kullanın)
+2. Ayrı bir uvicorn süreci açılır (sonuç önbelleği kapalı: her istek DB'ye gider)
+3. Her senaryo --repeat kez sırayla çağrılır: list_sites (farklı bbox/filtre/biçim),
+   get_site, search, suggest, nearby, facets
+4. Sonuç benchmarks/results/<zaman>-<commit>.json dosyasına yazılır
+
+İki sonucu karşılaştırmak için:
+    python -m benchmarks.suite --compare eski.json yeni.json
+
+Kullanım (backend klasöründen, DATABASE_URL yerel PostGIS'i göstermeli):
+    python -m benchmarks.generate_dataset --preset 100k
+    python -m benchmarks.suite --csv data/synthetic_100k.csv --load --reset
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from urllib.parse import urlencode
+
+from sqlalchemy import text
+
+from benchmarks.concurrency import start_server
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+# (ad, bbox) — ülke, bölge, şehir, semt ölçekleri
+BBOXES = [
+    ("country", (26.0, 36.0, 45.0, 42.1)),
+    ("region", (26.0, 37.0, 31.0, 41.5)),
+    ("city", (28.80, 40.95, 29.15, 41.10)),
+    ("street", (28.965, 41.000, 28.985, 41.015)),
+]
+
+
+def list_cases() -> list[tuple[str, str]]:
+    cases = []
+    for name, (min_lon, min_lat, max_lon, max_lat) in BBOXES:
+        bbox = {"min_lon": min_lon, "min_lat": min_lat, "max_lon": max_lon, "max_lat": max_lat}
+        cases.append((f"list_sites.bbox_{name}", "/api/sites?" + urlencode(bbox)))
+        cases.append((f"list_sites.bbox_{name}.columnar", "/api/sites?" + urlencode({**bbox, "format": "columnar"})))
+        cases.append((f"list_sites.bbox_{name}.markers", "/api/sites?" + urlencode({
+            **bbox, "fields": "name_tr,category", "precision": 5,
+        })))
+    cases += [
+        ("list_sites.no_filter", "/api/sites"),
+        ("list_sites.city", "/api/sites?" + urlencode({"city": "İstanbul"})),
+        ("list_sites.city_district", "/api/sites?" + urlencode({"city": "İstanbul", "district": "Fatih"})),
+        ("list_sites.category_unesco", "/api/sites?" + urlencode({"category": "Museum", "is_unesco": "true"})),
+        ("list_sites.search", "/api/sites?" + urlencode({"search": "kale"})),
+        ("list_sites.bbox_city.category", "/api/sites?" + urlencode({
+            "min_lon": 28.80, "min_lat": 40.95, "max_lon": 29.15, "max_lat": 41.10, "category": "Religious Site",
+        })),
+        ("clusters.z6", "/api/sites/clusters?zoom=6"),
+        ("density.z5", "/api/sites/density?zoom=5"),
+        ("density.z8.region", "/api/sites/density?" + urlencode({
+            "zoom": 8, **dict(zip(("min_lon", "min_lat", "max_lon", "max_lat"), BBOXES[1][1])),
+        })),
+        ("search.single", "/api/sites/search?" + urlencode({"q": "camii"})),
+        ("search.multi", "/api/sites/search?" + urlencode({"q": "sultan hamamı"})),
+        ("suggest.prefix", "/api/sites/suggest?" + urlencode({"q": "ye"})),
+        ("nearby.k20", "/api/sites/nearby?" + urlencode({"lat": 41.01, "lon": 28.98, "k": 20})),
+        ("nearby.radius", "/api/sites/nearby?" + urlencode({"lat": 39.93, "lon": 32.86, "radius_m": 5000, "k": 50})),
+        ("facets.all", "/api/sites/facets"),
+        ("changes.first_page", "/api/sites/changes?" + urlencode({"limit": 2000})),
+        ("facets.bbox", "/api/sites/facets?" + urlencode(dict(zip(("min_lon", "min_lat", "max_lon", "max_lat"), BBOXES[1][1])))),
+    ]
+    return cases
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def load_dataset(csv_path: str, reset: bool) -> dict:
+    from app.core.config import settings
+    from app.core.dataset import mark_dataset_changed
+    from app.db.session import engine
+    from app.scripts.bulk_import import bulk_import
+
+    if reset:
+        with engine.connect() as conn:
+            conn.execute(text("TRUNCATE cultural_sites"))
+            conn.commit()
+    stats = bulk_import(engine, csv_path)
+    with engine.connect() as conn:
+        mark_dataset_changed(conn, settings.TILE_CACHE_DIR)
+        conn.execute(text("ANALYZE cultural_sites"))
+        conn.commit()
+    return stats
+
+
+def sample_ids(n: int) -> tuple[int, list[str]]:
+    from app.db.session import engine
+
+    with engine.connect() as conn:
+        total = conn.execute(text("SELECT count(*) FROM cultural_sites")).scalar()
+        ids = conn.execute(
+            text("SELECT id::text FROM cultural_sites ORDER BY md5(id::text) LIMIT :n"), {"n": n}
+        ).scalars().all()
+    return total, ids
+
+
+def measure(port: int, paths: list[str], repeat: int) -> dict:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+    latencies, sizes, errors = [], [], 0
+    for i in range(repeat):
+        path = paths[i % len(paths)]
+        started = time.perf_counter()
+        conn.request("GET", path, headers={"Accept-Encoding": "identity"})
+        resp = conn.getresponse()
+        body = resp.read()
+        latencies.append((time.perf_counter() - started) * 1000)
+        sizes.append(len(body))
+        if resp.status >= 400:
+            errors += 1
+    conn.close()
+
+    latencies.sort()
+    return {
+        "n": repeat,
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 2),
+        "mean_ms": round(statistics.fmean(latencies), 2),
+        "min_ms": round(latencies[0], 2),
+        "bytes": int(statistics.median(sizes)),
+        "errors": errors,
+    }
+
+
+def run_suite(args) -> dict:
+    result = {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "repeat": args.repeat,
+        "db_async": args.db_async,
+    }
+    if args.load:
+        print(f"📥 Import: {args.csv}", file=sys.stderr)
+        result["import"] = load_dataset(args.csv, args.reset)
+        result["dataset"] = os.path.basename(args.csv)
+
+    result["rows_in_table"], ids = sample_ids(args.repeat)
+
+    cases = list_cases()
+    if ids:
+        cases.append(("get_site", [f"/api/sites/{i}" for i in ids]))
+
+    # Sonuç önbelleği kapalı: ölçülen şey sorgu + serileştirme
+    proc = start_server(args.db_async, args.port, {"RESULT_CACHE_MAX_ENTRIES": "0", "METRICS_ENABLED": "false"})
+    try:
+        result["cases"] = {}
+        for name, paths in cases:
+            paths = paths if isinstance(paths, list) else [paths]
+            measure(args.port, paths, min(3, args.repeat))  # ısınma
+            result["cases"][name] = stats = measure(args.port, paths, args.repeat)
+            print(f"  {name:40s} p50={stats['p50_ms']:8.2f} ms  p95={stats['p95_ms']:8.2f} ms  {stats['bytes']} B",
+                  file=sys.stderr)
+    finally:
+        proc.terminate()
+        proc.wait()
+    return result
+
+
+def compare(old_path: str, new_path: str) -> None:
+    with open(old_path, encoding="utf-8") as f:
+        old = json.load(f)
+    with open(new_path, encoding="utf-8") as f:
+        new = json.load(f)
+
+    print(f"{old.get('commit')} -> {new.get('commit')}")
+    print(f"{'senaryo':40s} {'eski p50':>10s} {'yeni p50':>10s} {'oran':>7s}")
+    for name, stats in new.get("cases", {}).items():
+        before = old.get("cases", {}).get(name)
+        if before is None:
+            print(f"{name:40s} {'-':>10s} {stats['p50_ms']:10.2f} {'yeni':>7s}")
+            continue
+        ratio = stats["p50_ms"] / before["p50_ms"] if before["p50_ms"] else float("inf")
+        flag = "  ⚠️" if ratio > 1.2 else ""
+        print(f"{name:40s} {before['p50_ms']:10.2f} {stats['p50_ms']:10.2f} {ratio:6.2f}x{flag}")
+    if "import" in old and "import" in new:
+        print(f"{'import satır/sn':40s} {old['import']['rows_per_sec']:10.0f} {new['import']['rows_per_sec']:10.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--csv", default="data/synthetic_10k.csv", help="generate_dataset çıktısı")
+    parser.add_argument("--load", action="store_true", help="Önce CSV'yi import et (import hızı da ölçülür)")
+    parser.add_argument("--reset", action="store_true", help="Import öncesi cultural_sites'ı boşalt")
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--port", type=int, default=8767)
+    parser.add_argument("--sync", dest="db_async", action="store_false", help="DB_ASYNC=false ile ölç")
+    parser.add_argument("--out", default=None, help="Varsayılan: benchmarks/results/<zaman>-<commit>.json")
+    parser.add_argument("--compare", nargs=2, metavar=("ESKI", "YENI"), help="İki sonuç dosyasını karşılaştır")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+    if args.reset and not args.load:
+        parser.error("--reset sadece --load ile kullanılabilir")
+
+    result = run_suite(args)
+
+    out = args.out
+    if out is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        out = os.path.join(RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}-{result['commit']}.json")
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Tur optimizasyonu (app/core/tsp.py) hız ve kalite ölçümü; veritabanı gerekmez.
+
+Türkiye sınırları içinde rastgele noktalar üretilir; her boyut için en yakın
+komşu turu, iyileştirilmiş tur, iyileşme oranı ve süre raporlanır.
+
+Kullanım (backend klasöründen):
+    python -m benchmarks.tsp --sizes 50 200 500 --budget-ms 800
+"""
+import argparse
+import json
+import statistics
+
+import numpy as np
+
+from app.core import tsp
+
+
+def run(sizes: list[int], repeat: int, budget_ms: int, closed: bool, seed: int) -> dict:
+    rng = np.random.default_rng(seed)
+    results = {}
+    for n in sizes:
+        elapsed, gains, passes, timeouts = [], [], [], 0
+        for _ in range(repeat):
+            lat = rng.uniform(36.0, 42.0, n + 1)
+            lon = rng.uniform(26.0, 45.0, n + 1)
+            r = tsp.solve(lat, lon, closed, budget_ms / 1000)
+            elapsed.append(r.elapsed_ms)
+            gains.append(1 - (r.total_m + r.return_m) / r.initial_m)
+            passes.append(r.passes)
+            timeouts += r.timed_out
+        results[n] = {
+            "p50_ms": round(statistics.median(elapsed), 1),
+            "max_ms": round(max(elapsed), 1),
+            "gain_vs_nn": round(statistics.fmean(gains), 4),
+            "passes": round(statistics.fmean(passes), 1),
+            "timed_out": timeouts,
+        }
+        print(f"  n={n:5d}  p50={results[n]['p50_ms']:8.1f} ms  max={results[n]['max_ms']:8.1f} ms  "
+              f"NN'e göre -%{results[n]['gain_vs_nn'] * 100:.1f}  bütçe aşımı={timeouts}/{repeat}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 100, 200, 500])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=int, default=1000)
+    parser.add_argument("--closed", action="store_true", help="Başlangıca dönen tur")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    print(json.dumps(run(args.sizes, args.repeat, args.budget_ms, args.closed, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
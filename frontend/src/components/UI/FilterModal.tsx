@@ -1,14 +1,21 @@
-import { useState, useMemo, useEffect, useRef } from "react";
+import { useState, useEffect, useRef } from "react";
 import { X, Check, Trash2, ChevronDown, MapPin } from "lucide-react";
-import type { CulturalSite } from "../../types/site";
+import { siteService } from "../../services/api";
+import type { FacetCount } from "../../types/site";
 
 interface FilterModalProps {
   onApply: (filters: { city: string; district: string }) => void;
   onClose: () => void;
   currentFilters: { city: string; district: string };
-  availableSites: CulturalSite[]; // Listeyi buradan çekeceğiz
 }
 
+// Facet listesi -> alfabetik seçenekler (boş değerler hariç)
+const facetOptions = (facets: FacetCount[]) =>
+  facets
+    .map((f) => f.value)
+    .filter(Boolean)
+    .sort((a, b) => (a as string).localeCompare(b as string, "tr")) as string[];
+
 // --- İÇ BİLEŞEN: ARAMA YAPILABİLİR SELECT (AUTOCOMPLETE) ---
 const SearchableSelect = ({
   label,
@@ -176,33 +183,36 @@ export default function FilterModal({
   onApply,
   onClose,
   currentFilters,
-  availableSites,
 }: FilterModalProps) {
   const [city, setCity] = useState(currentFilters.city);
   const [district, setDistrict] = useState(currentFilters.district);
+  const [uniqueCities, setUniqueCities] = useState<string[]>([]);
+  const [uniqueDistricts, setUniqueDistricts] = useState<string[]>([]);
 
-  // 1. Haritadaki verilerden BENZERSİZ ŞEHİRLERİ çıkar
-  const uniqueCities = useMemo(() => {
-    const cities = availableSites
-      .map((s) => s.city)
-      .filter(Boolean) as string[];
-    return Array.from(new Set(cities)).sort();
-  }, [availableSites]);
+  // 1. Tüm ŞEHİRLER: sunucudaki facet özetinden (haritadaki 2000 site ile sınırlı değil)
+  useEffect(() => {
+    siteService
+      .getFacets()
+      .then((res) => setUniqueCities(facetOptions(res.facets.city)))
+      .catch((err) => console.error("Facet hatası:", err));
+  }, []);
 
-  // 2. Şehre göre BENZERSİZ İLÇELERİ çıkar
-  const uniqueDistricts = useMemo(() => {
-    let relevantSites = availableSites;
-    // Eğer şehir seçiliyse sadece o şehrin ilçelerini göster
-    if (city) {
-      relevantSites = availableSites.filter(
-        (s) => s.city?.toLowerCase() === city.toLowerCase()
-      );
-    }
-    const districts = relevantSites
-      .map((s) => s.district)
-      .filter(Boolean) as string[];
-    return Array.from(new Set(districts)).sort();
-  }, [availableSites, city]);
+  // 2. Şehir seçiliyse sadece o şehrin İLÇELERİ
+  useEffect(() => {
+    let cancelled = false;
+    const timer = setTimeout(() => {
+      siteService
+        .getFacets(city ? { city } : {})
+        .then((res) => {
+          if (!cancelled) setUniqueDistricts(facetOptions(res.facets.district));
+        })
+        .catch((err) => console.error("Facet hatası:", err));
+    }, 250); // Şehir yazılırken her tuşta istek atma
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [city]);
 
   const handleApply = () => {
     onApply({ city, district });
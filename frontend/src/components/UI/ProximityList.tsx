@@ -1,54 +1,46 @@
-import { useMemo } from "react";
-import type { CulturalSite } from "../../types/site";
+import { useEffect, useState } from "react";
+import type { CulturalSite, NearbySite } from "../../types/site";
+import { siteService } from "../../services/api";
 import { MapPin, Navigation, Radar } from "lucide-react";
 
 interface ProximityListProps {
-  sites: CulturalSite[];
   userLocation: { lat: number; lon: number } | null;
   radius: number;
+  // Haritadaki etkin filtreler: liste, haritada gizlenen siteleri göstermesin
+  filters: { search: string; city: string; district: string };
   onSelect: (site: CulturalSite) => void;
 }
 
-function getDistanceFromLatLonInKm(
-  lat1: number,
-  lon1: number,
-  lat2: number,
-  lon2: number
-) {
-  const R = 6371;
-  const dLat = (lat2 - lat1) * (Math.PI / 180);
-  const dLon = (lon2 - lon1) * (Math.PI / 180);
-  const a =
-    Math.sin(dLat / 2) * Math.sin(dLat / 2) +
-    Math.cos(lat1 * (Math.PI / 180)) *
-      Math.cos(lat2 * (Math.PI / 180)) *
-      Math.sin(dLon / 2) *
-      Math.sin(dLon / 2);
-  const c = 2 * Math.atan2(Math.sqrt(a), Math.sqrt(1 - a));
-  return R * c;
-}
-
 export default function ProximityList({
-  sites,
   userLocation,
   radius,
+  filters,
   onSelect,
 }: ProximityListProps) {
-  const nearbySites = useMemo(() => {
-    if (!userLocation || sites.length === 0) return [];
-    return sites
-      .map((site) => ({
-        ...site,
-        distance: getDistanceFromLatLonInKm(
-          userLocation.lat,
-          userLocation.lon,
-          site.latitude,
-          site.longitude
-        ),
-      }))
-      .filter((site) => site.distance * 1000 <= radius)
-      .sort((a, b) => a.distance - b.distance);
-  }, [sites, userLocation, radius]);
+  // Mesafe hesabı ve sıralama sunucuda (PostGIS KNN) yapılır
+  const [nearbySites, setNearbySites] = useState<NearbySite[]>([]);
+  const { search, city, district } = filters;
+
+  useEffect(() => {
+    if (!userLocation) {
+      setNearbySites([]);
+      return;
+    }
+    let cancelled = false;
+    siteService
+      .getNearbySites(userLocation.lat, userLocation.lon, radius, {
+        search: search || undefined,
+        city: city || undefined,
+        district: district || undefined,
+      })
+      .then((data) => {
+        if (!cancelled) setNearbySites(data);
+      })
+      .catch((error) => console.error("Yakındaki yerler alınamadı:", error));
+    return () => {
+      cancelled = true;
+    };
+  }, [userLocation, radius, search, city, district]);
 
   if (!userLocation) return null;
 
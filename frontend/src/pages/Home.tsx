@@ -306,9 +306,9 @@ export default function Home() {
 
       {isRoaming && (
         <ProximityList
-          sites={sites}
           userLocation={userLocation}
           radius={roamingRadius}
+          filters={{ search, ...filters }}
           onSelect={handleSiteSelect}
         />
       )}
@@ -318,7 +318,6 @@ export default function Home() {
           currentFilters={filters}
           onApply={setFilters}
           onClose={() => setShowFilters(false)}
-          availableSites={sites}
         />
       )}
 
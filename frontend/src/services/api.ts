@@ -1,5 +1,14 @@
 import axios from "axios";
-import type { CulturalSite } from "../types/site";
+import type {
+  CulturalSite,
+  NearbySite,
+  RouteSite,
+  SiteChanges,
+  SiteDensity,
+  SiteFacets,
+  TourPlan,
+} from "../types/site";
+import { COLUMNAR_MEDIA_TYPE, decodeColumnar } from "./columnar";
 
 // ... (siteService kodları AYNI KALSIN) ...
 
@@ -16,6 +25,8 @@ interface SiteParams {
   limit?: number;
   city?: string;
   district?: string;
+  precision?: number; // Koordinat ondalık basamağı
+  fields?: string; // Virgülle ayrılmış properties alanları (ör. "name_tr,category")
 }
 
 interface GeoJSONFeature {
@@ -29,39 +40,167 @@ interface GeoJSONResponse {
   features: GeoJSONFeature[];
 }
 
+// GeoJSON Feature -> CulturalSite
+const featureToSite = (feature: GeoJSONFeature): CulturalSite => {
+  const p = feature.properties; // Kısaltma
+  const coords = feature.geometry?.coordinates;
+
+  // BURADA EŞLEŞTİRME YAPIYORUZ
+  return {
+    id: p.id,
+    name_tr: p.name_tr,
+    category: p.category,
+    sub_category: p.sub_category,
+
+    // Adres Bilgileri
+    city: p.city,
+    district: p.district,
+    neighbourhood: p.neighbourhood,
+
+    // Detay Bilgileri
+    summary_tr: p.summary_tr,
+    main_image_url: p.main_image_url,
+    opening_hours: p.opening_hours,
+    source_name: p.source_name,
+    source_url: p.source_url,
+    is_unesco: p.is_unesco,
+
+    // Koordinat
+    longitude: coords ? coords[0] : 0,
+    latitude: coords ? coords[1] : 0,
+  } as CulturalSite;
+};
+
 export const siteService = {
-  getAllSites: async (params: SiteParams = {}): Promise<CulturalSite[]> => {
+  // compact: sütun bazlı ikili biçim (harita işaretçileri için; özet/görsel alanları içermez)
+  getAllSites: async (
+    params: SiteParams = {},
+    options: { compact?: boolean } = {}
+  ): Promise<CulturalSite[]> => {
+    if (options.compact) {
+      const response = await axios.get<ArrayBuffer>(API_URL, {
+        params,
+        responseType: "arraybuffer",
+        headers: { Accept: COLUMNAR_MEDIA_TYPE },
+      });
+      return decodeColumnar(response.data);
+    }
+
     const response = await axios.get<GeoJSONResponse>(API_URL, { params });
+    return response.data.features.map(featureToSite);
+  },
+
+  // Sunucu tarafı KNN: sadece en yakın k site gelir (distance km cinsinden)
+  // filters: haritadaki liste ile aynı filtreler (arama, şehir, ilçe...)
+  getNearbySites: async (
+    lat: number,
+    lon: number,
+    radiusM: number,
+    filters: SiteParams = {},
+    k = 50
+  ): Promise<NearbySite[]> => {
+    const response = await axios.get<GeoJSONResponse>(`${API_URL}/nearby`, {
+      params: { ...filters, lat, lon, radius_m: radiusM, k },
+    });
+    return response.data.features.map((feature) => ({
+      ...featureToSite(feature),
+      distance: feature.properties.distance_m / 1000,
+    }));
+  },
+
+  // Birden çok siteyi tek istekte getirir (istek sırasıyla; bulunamayanlar atlanır)
+  getSitesByIds: async (
+    ids: string[],
+    options: { fields?: string[]; precision?: number } = {}
+  ): Promise<CulturalSite[]> => {
+    if (ids.length === 0) return [];
+    const response = await axios.post<GeoJSONResponse>(`${API_URL}/batch`, {
+      ids,
+      ...options,
+    });
+    return response.data.features.map(featureToSite);
+  },
+
+  // Rota boyunca siteler (rota sırasıyla). coords: routeService.getRoute'un
+  // döndüğü [lat, lon] noktaları; distance_m/detour_m/route_position_m properties'te
+  getSitesAlongRoute: async (
+    coords: [number, number][],
+    options: {
+      bufferM?: number;
+      category?: string;
+      limit?: number;
+      fields?: string[];
+      precision?: number;
+    } = {}
+  ): Promise<RouteSite[]> => {
+    const { bufferM, ...rest } = options;
+    const response = await axios.post<GeoJSONResponse>(`${API_URL}/along-route`, {
+      route: {
+        type: "LineString",
+        coordinates: coords.map(([lat, lon]) => [lon, lat]),
+      },
+      buffer_m: bufferM,
+      ...rest,
+    });
+    return response.data.features.map((feature) => ({
+      ...featureToSite(feature),
+      distance: feature.properties.distance_m / 1000,
+      detour: feature.properties.detour_m / 1000,
+      routePosition: feature.properties.route_position_m / 1000,
+    }));
+  },
+
+  // Artımlı senkron: since (önceki next_cursor) sonrası eklenen/güncellenen/silinenler.
+  // has_more true iken next_cursor ile tekrar çağrılmalı.
+  getChanges: async (
+    since?: string | null,
+    params: Pick<SiteParams, "fields" | "precision"> & { limit?: number } = {}
+  ): Promise<SiteChanges> => {
+    const response = await axios.get<
+      Omit<SiteChanges, "upserts"> & { upserts: GeoJSONFeature[] }
+    >(`${API_URL}/changes`, {
+      params: { ...params, since: since ?? undefined },
+    });
+    return {
+      ...response.data,
+      upserts: response.data.upserts.map(featureToSite),
+    };
+  },
+
+  // Düşük zoom ısı haritası: altıgen hücre başına adet ve kategori kırılımı
+  getDensity: async (
+    zoom: number,
+    params: Omit<SiteParams, "limit" | "precision" | "fields"> = {}
+  ): Promise<SiteDensity> => {
+    const response = await axios.get<SiteDensity>(`${API_URL}/density`, {
+      params: { ...params, zoom },
+    });
+    return response.data;
+  },
+
+  // Filtre ekranı için şehir/ilçe/kategori/UNESCO sayımları (sunucuda hesaplanır)
+  getFacets: async (params: SiteParams = {}): Promise<SiteFacets> => {
+    const response = await axios.get<SiteFacets>(`${API_URL}/facets`, {
+      params,
+    });
+    return response.data;
+  },
+};
 
-    return response.data.features.map((feature) => {
-      const p = feature.properties; // Kısaltma
-      const coords = feature.geometry?.coordinates;
-
-      // BURADA EŞLEŞTİRME YAPIYORUZ
-      return {
-        id: p.id,
-        name_tr: p.name_tr,
-        category: p.category,
-        sub_category: p.sub_category,
-
-        // Adres Bilgileri
-        city: p.city,
-        district: p.district,
-        neighbourhood: p.neighbourhood,
-
-        // Detay Bilgileri
-        summary_tr: p.summary_tr,
-        main_image_url: p.main_image_url,
-        opening_hours: p.opening_hours,
-        source_name: p.source_name,
-        source_url: p.source_url,
-        is_unesco: p.is_unesco,
-
-        // Koordinat
-        longitude: coords ? coords[0] : 0,
-        latitude: coords ? coords[1] : 0,
-      } as CulturalSite;
+// --- TUR SERVİSİ: çok duraklı ziyaret sırası (kuş uçuşu mesafe) ---
+export const tourService = {
+  optimize: async (
+    start: { lat: number; lon: number },
+    siteIds: string[],
+    options: { returnToStart?: boolean; timeBudgetMs?: number } = {}
+  ): Promise<TourPlan> => {
+    const response = await axios.post<TourPlan>(`${BASE_URL}/api/tours/optimize`, {
+      start,
+      site_ids: siteIds,
+      return_to_start: options.returnToStart ?? false,
+      time_budget_ms: options.timeBudgetMs,
     });
+    return response.data;
   },
 };
 
@@ -0,0 +1,80 @@
+import type { CulturalSite } from "../types/site";
+
+// Backend'deki app/core/columnar.py ile aynı yerleşim (little-endian):
+// "HSC1" | uint32 başlık uzunluğu | başlık JSON | id (16n) | lon f32 | lat f32 |
+// category/city/district kodları (code_width) | is_unesco u8
+export const COLUMNAR_MEDIA_TYPE = "application/vnd.heritage.columnar";
+
+interface ColumnarHeader {
+  count: number;
+  precision: number | null;
+  code_width: 2 | 4;
+  dictionaries: { category: string[]; city: string[]; district: string[] };
+  name_tr: string[];
+  next_cursor: string | null;
+}
+
+const HEX = Array.from({ length: 256 }, (_, i) =>
+  i.toString(16).padStart(2, "0")
+);
+
+const uuidAt = (bytes: Uint8Array, offset: number): string => {
+  let s = "";
+  for (let i = 0; i < 16; i++) {
+    if (i === 4 || i === 6 || i === 8 || i === 10) s += "-";
+    s += HEX[bytes[offset + i]];
+  }
+  return s;
+};
+
+export const decodeColumnar = (buffer: ArrayBuffer): CulturalSite[] => {
+  const view = new DataView(buffer);
+  const magic = new TextDecoder().decode(new Uint8Array(buffer, 0, 4));
+  if (magic !== "HSC1") throw new Error("Geçersiz columnar yanıt");
+
+  const headerLength = view.getUint32(4, true);
+  const header: ColumnarHeader = JSON.parse(
+    new TextDecoder().decode(new Uint8Array(buffer, 8, headerLength))
+  );
+  const n = header.count;
+
+  let offset = 8 + headerLength;
+  const ids = new Uint8Array(buffer, offset, 16 * n);
+  offset += 16 * n;
+  const lon = new Float32Array(buffer, offset, n);
+  offset += 4 * n;
+  const lat = new Float32Array(buffer, offset, n);
+  offset += 4 * n;
+
+  const readCodes = () => {
+    const codes =
+      header.code_width === 2
+        ? new Uint16Array(buffer, offset, n)
+        : new Uint32Array(buffer, offset, n);
+    offset += header.code_width * n;
+    return codes;
+  };
+  const category = readCodes();
+  const city = readCodes();
+  const district = readCodes();
+  const unesco = new Uint8Array(buffer, offset, n);
+
+  const nullCode = header.code_width === 2 ? 0xffff : 0xffffffff;
+  const lookup = (dict: string[], code: number) =>
+    code === nullCode ? undefined : dict[code];
+
+  const sites: CulturalSite[] = new Array(n);
+  for (let i = 0; i < n; i++) {
+    sites[i] = {
+      id: uuidAt(ids, 16 * i),
+      name_tr: header.name_tr[i],
+      category: lookup(header.dictionaries.category, category[i]) ?? "",
+      city: lookup(header.dictionaries.city, city[i]),
+      district: lookup(header.dictionaries.district, district[i]),
+      is_unesco: unesco[i] === 1,
+      longitude: lon[i],
+      latitude: lat[i],
+    };
+  }
+  return sites;
+};
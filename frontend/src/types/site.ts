@@ -18,3 +18,80 @@ export interface CulturalSite {
   latitude: number;
   longitude: number;
 }
+
+// /api/sites/nearby sonucu: mesafe km cinsinden
+export interface NearbySite extends CulturalSite {
+  distance: number;
+}
+
+// /api/sites/along-route sonucu: rotaya mesafe, sapma ve rota üzerindeki konum (km)
+export interface RouteSite extends NearbySite {
+  detour: number;
+  routePosition: number;
+}
+
+// /api/sites/facets sonucu: her filtre alanı için değer başına site sayısı
+export interface FacetCount<T = string> {
+  value: T | null;
+  count: number;
+}
+
+export interface SiteFacets {
+  total: number;
+  source: "aggregate" | "live";
+  facets: {
+    city: FacetCount[];
+    district: FacetCount[];
+    category: FacetCount[];
+    is_unesco: FacetCount<boolean>[];
+  };
+}
+
+// /api/sites/changes sonucu: imleçten bu yana değişenler (artımlı senkron)
+export interface SiteChanges {
+  upserts: CulturalSite[];
+  deleted: string[];
+  next_cursor: string | null;
+  has_more: boolean;
+  reset: boolean; // true ise yerel kopya silinip baştan senkron yapılmalı
+}
+
+// GET /api/sites/density: hücre geometrisi altıgen poligon
+export interface SiteDensity {
+  type: "FeatureCollection";
+  cell_size_m: number;
+  total: number;
+  max_count: number;
+  features: {
+    type: "Feature";
+    geometry: { type: "Polygon"; coordinates: [number, number][][] };
+    properties: {
+      i: number;
+      j: number;
+      count: number;
+      categories: Record<string, number>;
+    };
+  }[];
+}
+
+// POST /api/tours/optimize
+export interface TourStop {
+  id: string;
+  name_tr: string | null;
+  category: string | null;
+  lat: number;
+  lon: number;
+  leg_m: number; // önceki duraktan (ilk durak için başlangıçtan)
+  cumulative_m: number;
+}
+
+export interface TourPlan {
+  stops: TourStop[];
+  total_m: number; // returnToStart ise dönüş dahil
+  return_leg_m: number;
+  missing: string[];
+  initial_m: number;
+  passes: number;
+  elapsed_ms: number;
+  timed_out: boolean;
+}